@@ -1,87 +1,121 @@
 """
 RESTful API para RPG básico - Flask
 Convertido de Laravel/Lumen para Flask
+
+A aplicação é montada por create_app(config_name) a partir das classes de
+config.py. Importar este módulo não cria a app nem registra rotas; `from app
+import app` continua funcionando e cria, no primeiro acesso, a app da
+configuração em FLASK_CONFIG (padrão: development).
 """
 
-from flask import Flask, request, jsonify
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity, get_jwt
-from flask_cors import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime, timedelta
 import os
-import random
-
-# Importar modelos primeiro
-from models import (
-    db,
-    User,
-    Character,
-    Fight,
-    Skill,
-    Ritual,
-    Item,
-    Campaign,
-    CampaignCharacter,
-    Party,
-    PartyMember,
+
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager
+from flask_cors import CORS
+
+from config import config
+from models import db
+from passwords import password_hasher
+from process_pool import process_pool
+from response_cache import response_cache
+from token_blocklist import token_blocklist
+from user_cache import user_cache
+
+jwt = JWTManager()
+
+# (módulo, blueprint, prefixo); os módulos de rotas só são importados em create_app
+BLUEPRINTS = (
+    ('routes', 'auth_bp', '/api/auth'),
+    ('characters_routes', 'characters_bp', '/api/characters'),
+    ('user_character_routes', 'user_character_bp', '/api/me'),
+    ('fights_routes', 'fights_bp', '/api/me/fights'),
+    ('skills_routes', 'skills_bp', '/api/me'),
+    ('rituals_routes', 'rituals_bp', '/api/me'),
+    ('rituals_routes', 'ritual_catalog_bp', '/api/rituals'),
+    ('items_routes', 'items_bp', '/api/me'),
+    ('users_routes', 'users_bp', '/api/users'),
+    ('campaigns_routes', 'campaigns_bp', '/api/v1/campaigns'),
+    ('dice_routes', 'dice_bp', '/api/dice'),
+    ('leaderboard_routes', 'leaderboard_bp', '/api/leaderboard'),
 )
 
-# Inicializar Flask app
-app = Flask(__name__)
-
-# Configurações
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///rpg.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-string')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
-
-# Desabilitar redirecionamento automático de trailing slash
-app.url_map.strict_slashes = False
-
-# Inicializar extensões
-db.init_app(app)
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
-CORS(app, origins=['*'], methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'], allow_headers=['Content-Type', 'Authorization'])
-
-# Importar rotas
-from routes import auth_bp
-from characters_routes import characters_bp
-from user_character_routes import user_character_bp
-from fights_routes import fights_bp
-from skills_routes import skills_bp
-from rituals_routes import rituals_bp
-from items_routes import items_bp
-from users_routes import users_bp
-from campaigns_routes import campaigns_bp
-
-# Registrar blueprints
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-app.register_blueprint(characters_bp, url_prefix='/api/characters')
-app.register_blueprint(user_character_bp, url_prefix='/api/me')
-app.register_blueprint(fights_bp, url_prefix='/api/me/fights')
-app.register_blueprint(skills_bp, url_prefix='/api/me')
-app.register_blueprint(rituals_bp, url_prefix='/api/me')
-app.register_blueprint(items_bp, url_prefix='/api/me')
-app.register_blueprint(users_bp, url_prefix='/api/users')
-app.register_blueprint(campaigns_bp, url_prefix='/api/v1/campaigns')
-
-@app.route('/')
-def index():
-    return jsonify({
-        'message': 'RESTful API para RPG básico',
-        'version': '1.0',
-        'framework': 'Flask'
-    })
-
-
-@app.route('/health')
-def health():
-    return jsonify({'status': 'ok'}), 200
+
+def create_app(config_name=None, **overrides):
+    """
+    Cria a app com a configuração `config_name` ('development', 'production',
+    'testing'; padrão FLASK_CONFIG ou 'default'). overrides substituem chaves
+    da configuração (útil em testes e scripts).
+    """
+    config_name = config_name or os.environ.get('FLASK_CONFIG', 'default')
+    app = Flask(__name__)
+    app.config.from_object(config[config_name])
+    app.config.update(overrides)
+
+    # Desabilitar redirecionamento automático de trailing slash
+    app.url_map.strict_slashes = False
+
+    # Inicializar extensões
+    db.init_app(app)
+    jwt.init_app(app)
+    token_blocklist.init_app(app, jwt)
+    response_cache.init_app(app)
+    password_hasher.init_app(app)
+    process_pool.init_app(app)
+    user_cache.init_app(app)
+    if app.config.get('MIGRATIONS_ENABLED'):
+        # Alembic custa ~0.3s de import e só é usado pelo comando `flask db`
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    CORS(app, origins=['*'], methods=['GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'], allow_headers=['Content-Type', 'Authorization'], expose_headers=['X-Next-Cursor', 'ETag'])
+
+    _register_blueprints(app)
+    _register_core_routes(app)
+    return app
+
+
+def _register_blueprints(app):
+    from importlib import import_module
+
+    for module_name, blueprint_name, url_prefix in BLUEPRINTS:
+        blueprint = getattr(import_module(module_name), blueprint_name)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+
+
+def _register_core_routes(app):
+    @app.route('/')
+    def index():
+        return jsonify({
+            'message': 'RESTful API para RPG básico',
+            'version': '1.0',
+            'framework': 'Flask'
+        })
+
+    @app.route('/health')
+    def health():
+        return jsonify({'status': 'ok'}), 200
+
+    @app.route('/health/cache')
+    def cache_stats():
+        """Contadores de acertos/falhas do cache de respostas deste processo"""
+        return jsonify(response_cache.stats()), 200
+
+    @app.route('/health/user-cache')
+    def user_cache_stats():
+        """Contadores do cache de usuários autenticados deste processo"""
+        return jsonify(user_cache.stats()), 200
+
+
+def __getattr__(name):
+    # Compatibilidade: `from app import app` cria a app padrão sob demanda
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module 'app' has no attribute {name!r}")
+
 
 if __name__ == '__main__':
+    app = create_app('development')
     with app.app_context():
         db.create_all()
     app.run(debug=True, host='0.0.0.0', port=8000)
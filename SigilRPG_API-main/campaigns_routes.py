@@ -1,7 +1,23 @@
 """Rotas para gerenciamento de campanhas, personagens e equipes"""
 
+import random
+from datetime import datetime
+from itertools import combinations
+
 from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+import combat
+import encounter
+import leaderboard
+import skill_checks
+from http_cache import conditional_get
+from pagination import parse_limit, decode_cursor, encode_cursor
+from process_pool import process_pool, ProcessPoolBusy
+from response_cache import response_cache
 
 from models import (
     db,
@@ -10,6 +26,8 @@ from models import (
     CampaignCharacter,
     Party,
     PartyMember,
+    Skill,
+    Fight,
 )
 
 
@@ -40,7 +58,96 @@ def _character_not_found():
     return jsonify({'message': 'character_not_found'}), 404
 
 
+# Namespaces do cache de respostas: a lista só contém dados da campanha; as
+# demais leituras embutem personagens e também expiram quando eles mudam
+CAMPAIGN_LIST_CACHE = 'campaigns'
+CAMPAIGN_DETAIL_CACHE = 'campaign_detail'
+
+
+def invalidate_campaign_cache():
+    """Chamada após o commit, para que nenhuma leitura concorrente recoloque dados antigos"""
+    response_cache.invalidate(CAMPAIGN_LIST_CACHE, CAMPAIGN_DETAIL_CACHE)
+
+
+def _mark_campaign_changed(campaign_id):
+    """
+    Atualiza campaigns.updated_at na mesma transação de uma escrita em
+    vínculos ou equipes, que não têm updated_at próprio (usado pelo ETag).
+    """
+    db.session.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id)
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _campaign_fingerprint(campaign_id):
+    """Versão do detalhe da campanha calculada em uma única consulta"""
+    member_modified = (
+        select(func.max(Character.updated_at))
+        .join(CampaignCharacter, CampaignCharacter.character_id == Character.id)
+        .where(CampaignCharacter.campaign_id == Campaign.id)
+        .scalar_subquery()
+    )
+    member_count = (
+        select(func.count(CampaignCharacter.id))
+        .where(CampaignCharacter.campaign_id == Campaign.id)
+        .scalar_subquery()
+    )
+    party_member_modified = (
+        select(func.max(Character.updated_at))
+        .join(PartyMember, PartyMember.character_id == Character.id)
+        .join(Party, Party.id == PartyMember.party_id)
+        .where(Party.campaign_id == Campaign.id)
+        .scalar_subquery()
+    )
+    party_member_count = (
+        select(func.count(PartyMember.id))
+        .join(Party, Party.id == PartyMember.party_id)
+        .where(Party.campaign_id == Campaign.id)
+        .scalar_subquery()
+    )
+
+    row = (
+        db.session.query(
+            Campaign.updated_at,
+            member_modified,
+            member_count,
+            party_member_modified,
+            party_member_count,
+        )
+        .filter(Campaign.id == campaign_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    # Remover um membro não avança nenhum updated_at: só ETag, sem Last-Modified
+    return ('campaign', campaign_id) + tuple(row), None
+
+
+def _load_campaign_detail(campaign_id):
+    """
+    Carrega a campanha com membros, equipes e personagens já preenchidos.
+
+    Cada nível do grafo é buscado com um único SELECT ... IN, então o número
+    de consultas é fixo independentemente de quantos membros a campanha tem.
+    """
+    return (
+        Campaign.query.options(
+            selectinload(Campaign.memberships).selectinload(CampaignCharacter.character),
+            selectinload(Campaign.parties)
+            .selectinload(Party.members)
+            .selectinload(PartyMember.character),
+        )
+        .filter(Campaign.id == campaign_id)
+        .first()
+    )
+
+
 @campaigns_bp.route('/', methods=['GET'])
+@response_cache.cached(CAMPAIGN_LIST_CACHE)
 def list_campaigns():
     """Lista todas as campanhas"""
     campaigns = Campaign.query.order_by(Campaign.created_at.desc()).all()
@@ -77,6 +184,7 @@ def create_campaign():
 
         db.session.add(campaign)
         db.session.commit()
+        invalidate_campaign_cache()
 
         return jsonify(campaign.to_dict()), 201
 
@@ -86,9 +194,11 @@ def create_campaign():
 
 
 @campaigns_bp.route('/<int:campaign_id>', methods=['GET'])
+@conditional_get(_campaign_fingerprint)
+@response_cache.cached(CAMPAIGN_DETAIL_CACHE)
 def get_campaign(campaign_id):
     """Obtém os detalhes de uma campanha"""
-    campaign = Campaign.query.get(campaign_id)
+    campaign = _load_campaign_detail(campaign_id)
     if not campaign:
         return _campaign_not_found()
 
@@ -130,7 +240,9 @@ def update_campaign(campaign_id):
             campaign.master_name = data['master_name'].strip()
 
         db.session.commit()
+        invalidate_campaign_cache()
 
+        campaign = _load_campaign_detail(campaign_id)
         return jsonify(campaign.to_dict(include_members=True, include_parties=True)), 200
 
     except Exception as exc:
@@ -148,6 +260,7 @@ def delete_campaign(campaign_id):
     try:
         db.session.delete(campaign)
         db.session.commit()
+        invalidate_campaign_cache()
         return jsonify({'message': 'campaign_deleted'}), 200
     except Exception as exc:
         db.session.rollback()
@@ -155,6 +268,7 @@ def delete_campaign(campaign_id):
 
 
 @campaigns_bp.route('/<int:campaign_id>/characters', methods=['GET'])
+@response_cache.cached(CAMPAIGN_DETAIL_CACHE)
 def list_campaign_characters(campaign_id):
     """Lista personagens vinculados a uma campanha"""
     campaign = Campaign.query.get(campaign_id)
@@ -202,7 +316,9 @@ def add_character_to_campaign(campaign_id):
         )
 
         db.session.add(membership)
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
 
         return jsonify(membership.to_dict(include_character=True)), 201
 
@@ -235,7 +351,9 @@ def update_campaign_character(campaign_id, character_id):
         if 'notes' in data:
             membership.notes = data.get('notes')
 
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
 
         return jsonify(membership.to_dict(include_character=True)), 200
 
@@ -257,7 +375,9 @@ def remove_character_from_campaign(campaign_id, character_id):
 
     try:
         db.session.delete(membership)
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
         return jsonify({'message': 'campaign_character_removed'}), 200
     except Exception as exc:
         db.session.rollback()
@@ -265,6 +385,7 @@ def remove_character_from_campaign(campaign_id, character_id):
 
 
 @campaigns_bp.route('/<int:campaign_id>/parties', methods=['GET'])
+@response_cache.cached(CAMPAIGN_DETAIL_CACHE)
 def list_parties(campaign_id):
     """Lista equipes de uma campanha"""
     campaign = Campaign.query.get(campaign_id)
@@ -296,7 +417,9 @@ def create_party(campaign_id):
         )
 
         db.session.add(party)
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
 
         return jsonify(party.to_dict(include_members=True)), 201
 
@@ -320,7 +443,9 @@ def update_party(campaign_id, party_id):
         if 'description' in data:
             party.description = data.get('description')
 
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
 
         return jsonify(party.to_dict(include_members=True)), 200
 
@@ -338,7 +463,9 @@ def delete_party(campaign_id, party_id):
 
     try:
         db.session.delete(party)
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
         return jsonify({'message': 'party_deleted'}), 200
     except Exception as exc:
         db.session.rollback()
@@ -387,7 +514,9 @@ def add_member_to_party(campaign_id, party_id):
         )
 
         db.session.add(party_member)
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
 
         return jsonify(party_member.to_dict(include_character=True)), 201
 
@@ -413,7 +542,9 @@ def update_party_member(campaign_id, party_id, character_id):
         if 'role' in data:
             party_member.role = data.get('role')
 
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
 
         return jsonify(party_member.to_dict(include_character=True)), 200
 
@@ -432,9 +563,324 @@ def remove_party_member(campaign_id, party_id, character_id):
 
     try:
         db.session.delete(party_member)
+        _mark_campaign_changed(campaign_id)
         db.session.commit()
+        invalidate_campaign_cache()
         return jsonify({'message': 'party_member_removed'}), 200
     except Exception as exc:
         db.session.rollback()
         return jsonify({'message': 'error_removing_party_member', 'error': str(exc)}), 500
 
+
+
+def _load_fighters(character_ids):
+    """{id: (personagem, combat.Fighter)} com personagens e perícias em duas consultas"""
+    characters = Character.query.filter(Character.id.in_(character_ids)).all()
+    skills = {character.id: [] for character in characters}
+    for skill in Skill.query.filter(Skill.character_id.in_(list(skills))).all():
+        skills[skill.character_id].append(skill)
+    return {
+        character.id: (character, combat.fighter_from_character(character, skills[character.id]))
+        for character in characters
+    }
+
+
+def _pool_busy():
+    """Pool de processos ocupado por outra simulação: o cliente deve tentar de novo"""
+    response = jsonify({'message': 'simulation_busy'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+def _int_param(data, key, default, minimum, maximum):
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not minimum <= value <= maximum:
+        raise ValueError(key)
+    return value
+
+
+@campaigns_bp.route('/<int:campaign_id>/parties/<int:party_id>/simulate', methods=['POST'])
+@jwt_required()
+def simulate_encounter(campaign_id, party_id):
+    """
+    Estima por Monte Carlo o encontro da equipe contra os oponentes.
+
+    Corpo: opponent_ids (obrigatório, até encounter.MAX_OPPONENTS), simulations (padrão 10000, até 10^6),
+    workers (blocos no pool de processos para execuções grandes) e seed (para
+    repetir o resultado). Responde 503 se o pool de processos estiver ocupado.
+    """
+    if not encounter.available():
+        return jsonify({'message': 'numpy_not_installed'}), 503
+
+    party = Party.query.filter_by(id=party_id, campaign_id=campaign_id).first()
+    if not party:
+        return jsonify({'message': 'party_not_found'}), 404
+
+    data = request.get_json() or {}
+    opponent_ids = data.get('opponent_ids')
+    if not isinstance(opponent_ids, list) or not opponent_ids \
+            or not all(isinstance(value, int) and not isinstance(value, bool) for value in opponent_ids):
+        return jsonify({'message': 'opponent_ids_required'}), 400
+    if len(opponent_ids) > encounter.MAX_OPPONENTS:
+        return jsonify({'message': 'too_many_opponents', 'max': encounter.MAX_OPPONENTS}), 400
+
+    try:
+        simulations = _int_param(
+            data, 'simulations', encounter.DEFAULT_SIMULATIONS,
+            encounter.MIN_SIMULATIONS, encounter.MAX_SIMULATIONS
+        )
+        workers = min(_int_param(data, 'workers', 1, 1, 64), process_pool.workers)
+        seed = data.get('seed')
+        if seed is not None:
+            seed = _int_param(data, 'seed', None, 0, 2 ** 63 - 1)
+    except ValueError as exc:
+        return jsonify({'message': f'invalid_{exc}'}), 400
+
+    member_ids = [
+        character_id for (character_id,) in
+        db.session.query(PartyMember.character_id)
+        .filter(PartyMember.party_id == party.id)
+        .order_by(PartyMember.id)
+        .all()
+    ]
+    if not member_ids:
+        return jsonify({'message': 'party_has_no_members'}), 400
+
+    fighters = _load_fighters(set(member_ids) | set(opponent_ids))
+    if any(opponent_id not in fighters for opponent_id in opponent_ids):
+        return _character_not_found()
+
+    try:
+        result = encounter.estimate(
+            [fighters[character_id][1] for character_id in member_ids],
+            [fighters[character_id][1] for character_id in opponent_ids],
+            simulations=simulations,
+            workers=workers,
+            seed=seed,
+        )
+    except ProcessPoolBusy:
+        return _pool_busy()
+    except Exception as exc:
+        return jsonify({'message': 'error_simulating_encounter', 'error': str(exc)}), 500
+
+    hp_loss = result.pop('expected_hp_loss')
+    result['party'] = [
+        {
+            'character_id': character_id,
+            'name': fighters[character_id][0].name,
+            'pv': fighters[character_id][1].pv,
+            'expected_hp_loss': loss,
+        }
+        for character_id, loss in zip(member_ids, hp_loss)
+    ]
+    result['opponent_ids'] = opponent_ids
+    return jsonify(result), 200
+
+
+def _run_skill_check(campaign_id, party_id=None):
+    data = request.get_json(silent=True) or {}
+    skill = data.get('skill')
+    if not isinstance(skill, str) or not skill.strip():
+        return jsonify({'message': 'skill_required'}), 400
+
+    attribute = data.get('attribute')
+    if attribute is not None:
+        attribute = str(attribute).upper()
+        if attribute not in skill_checks.ATTRIBUTE_COLUMNS:
+            return jsonify({'message': 'invalid_attribute'}), 400
+
+    try:
+        dc = data.get('dc')
+        if dc is not None:
+            dc = _int_param(data, 'dc', None, -1000, 1000)
+        seed = data.get('seed')
+        if seed is not None:
+            seed = _int_param(data, 'seed', None, 0, 2 ** 63 - 1)
+    except ValueError as exc:
+        return jsonify({'message': f'invalid_{exc}'}), 400
+
+    members = skill_checks.load_members(
+        skill, campaign_id, party_id,
+        include_inactive=_parse_bool(data.get('include_inactive'), False),
+    )
+    if not members:
+        return jsonify({'message': 'no_members'}), 400
+
+    try:
+        attribute, results = skill_checks.resolve_checks(members, attribute=attribute, dc=dc, seed=seed)
+    except ValueError as exc:
+        return jsonify({'message': str(exc)}), 400
+
+    response = {
+        'campaign_id': campaign_id,
+        'skill': skill.strip(),
+        'attribute': attribute,
+        'dc': dc,
+        'seed': seed,
+        'results': results,
+    }
+    if party_id is not None:
+        response['party_id'] = party_id
+    if dc is not None:
+        response['successes'] = sum(result['success'] for result in results)
+    return jsonify(response), 200
+
+
+@campaigns_bp.route('/<int:campaign_id>/checks', methods=['POST'])
+def campaign_skill_check(campaign_id):
+    """
+    Teste de perícia para todos os personagens ativos da campanha.
+
+    Corpo: skill (obrigatório), dc, attribute (para quem não tem a perícia),
+    seed e include_inactive. Cada resultado traz a rolagem e, com dc, a
+    probabilidade exata de sucesso.
+    """
+    if not db.session.query(Campaign.id).filter_by(id=campaign_id).first():
+        return _campaign_not_found()
+    return _run_skill_check(campaign_id)
+
+
+@campaigns_bp.route('/<int:campaign_id>/parties/<int:party_id>/checks', methods=['POST'])
+def party_skill_check(campaign_id, party_id):
+    """Teste de perícia para todos os membros da equipe (mesmo corpo do teste da campanha)"""
+    if not db.session.query(Party.id).filter_by(id=party_id, campaign_id=campaign_id).first():
+        return jsonify({'message': 'party_not_found'}), 404
+    return _run_skill_check(campaign_id, party_id)
+
+
+# A partir de quantas lutas o torneio é resolvido em vários processos
+TOURNAMENT_PARALLEL_MIN_FIGHTS = 2000
+# Pontuação da classificação: vitória, empate, derrota
+TOURNAMENT_POINTS = {'won': 3, 'draw': 1, 'lost': 0}
+
+
+def _standings(characters, fights):
+    table = {
+        character.id: {
+            'character_id': character.id,
+            'name': character.name,
+            'fights': 0, 'won': 0, 'draw': 0, 'lost': 0, 'points': 0, 'experience': 0,
+        }
+        for character in characters
+    }
+    mirrored = {'won': 'lost', 'lost': 'won', 'draw': 'draw'}
+    for fight in fights:
+        for character_id, status in (
+            (fight['character_id'], fight['status']),
+            (fight['opponent_id'], mirrored[fight['status']]),
+        ):
+            row = table[character_id]
+            row['fights'] += 1
+            row[status] += 1
+            row['points'] += TOURNAMENT_POINTS[status]
+        table[fight['character_id']]['experience'] += fight['experience']
+
+    return sorted(table.values(), key=lambda row: (-row['points'], -row['won'], row['name'], row['character_id']))
+
+
+@campaigns_bp.route('/<int:campaign_id>/tournament', methods=['POST'])
+@jwt_required()
+def run_tournament(campaign_id):
+    """
+    Torneio todos-contra-todos entre os personagens da campanha.
+
+    Cada par luta uma vez pelo motor de combate, e todas as lutas são gravadas
+    em um único INSERT em lote na mesma transação. Corpo opcional: seed
+    (torneio reproduzível), include_inactive e workers (padrão 1; blocos no
+    pool de processos para torneios grandes, 503 se o pool estiver ocupado).
+    """
+    campaign = Campaign.query.get(campaign_id)
+    if not campaign:
+        return _campaign_not_found()
+
+    data = request.get_json(silent=True) or {}
+    try:
+        workers = min(_int_param(data, 'workers', 1, 1, 64), process_pool.workers)
+        seed = data.get('seed')
+        if seed is not None:
+            seed = _int_param(data, 'seed', None, 0, 2 ** 63 - 1)
+    except ValueError as exc:
+        return jsonify({'message': f'invalid_{exc}'}), 400
+
+    query = db.session.query(CampaignCharacter.character_id).filter(
+        CampaignCharacter.campaign_id == campaign_id
+    )
+    if not _parse_bool(data.get('include_inactive'), False):
+        query = query.filter(CampaignCharacter.is_active.is_(True))
+    member_ids = sorted(character_id for (character_id,) in query.all())
+
+    if len(member_ids) < 2:
+        return jsonify({'message': 'not_enough_characters'}), 400
+
+    fighters = _load_fighters(member_ids)
+    pairings = list(combinations(member_ids, 2))
+    seeds = random.Random(seed) if seed is not None else random.SystemRandom()
+    matches = [
+        (fighters[first][1], fighters[second][1], seeds.getrandbits(31))
+        for first, second in pairings
+    ]
+
+    try:
+        results = combat.resolve_many(
+            matches, workers if len(matches) >= TOURNAMENT_PARALLEL_MIN_FIGHTS else 1
+        )
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                'character_id': first,
+                'opponent_id': second,
+                'status': result.status,
+                'experience': result.experience,
+                'seed': match[2],
+                'rounds': result.rounds,
+                'combat_log': combat.dump_log(match[0], match[1], result),
+                'created_at': now,
+                'updated_at': now,
+            }
+            for (first, second), match, result in zip(pairings, matches, results)
+        ]
+        # Antes do commit, enquanto os personagens ainda estão carregados
+        standings = _standings([character for character, _ in fighters.values()], rows)
+
+        db.session.execute(insert(Fight), rows)
+        leaderboard.record_fights((row['character_id'], row['experience']) for row in rows)
+        db.session.commit()
+
+    except ProcessPoolBusy:
+        db.session.rollback()
+        return _pool_busy()
+    except Exception as exc:
+        db.session.rollback()
+        return jsonify({'message': 'error_running_tournament', 'error': str(exc)}), 500
+
+    return jsonify({
+        'campaign_id': campaign_id,
+        'fights': len(rows),
+        'standings': standings,
+    }), 201
+
+
+@campaigns_bp.route('/<int:campaign_id>/leaderboard', methods=['GET'])
+def campaign_leaderboard(campaign_id):
+    """
+    Ranking de experiência dos personagens da campanha (limit, cursor e
+    include_inactive); o cursor da próxima página vem em X-Next-Cursor.
+    """
+    if not db.session.query(Campaign.id).filter_by(id=campaign_id).first():
+        return _campaign_not_found()
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        after = decode_cursor(request.args.get('cursor'))
+        entries, next_cursor = leaderboard.page(
+            limit, after, campaign_id=campaign_id,
+            include_inactive=_parse_bool(request.args.get('include_inactive'), False),
+        )
+    except (ValueError, TypeError, KeyError):
+        return jsonify({'message': 'invalid_pagination'}), 400
+
+    response = jsonify({'campaign_id': campaign_id, 'entries': entries})
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = encode_cursor(next_cursor)
+    return response, 200
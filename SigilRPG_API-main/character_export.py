@@ -0,0 +1,80 @@
+"""
+Exportação em streaming (NDJSON) dos personagens com habilidades, rituais e itens
+
+Os personagens são lidos com yield_per em lotes ordenados por id; para cada
+lote, os filhos são buscados com uma consulta IN por tabela. Tudo é lido como
+linhas (Row), sem instâncias ORM na sessão, então a memória fica limitada ao
+tamanho do lote independentemente do tamanho da tabela.
+"""
+
+import json
+from collections import defaultdict
+
+from sqlalchemy import select
+
+import ritual_catalog
+from models import db, SERIALIZERS, Character, Skill, Ritual, Item, merge_ritual_template
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+
+# Chave no registro exportado -> modelo filho
+CHILDREN = (
+    ('skills', Skill),
+    ('rituals', Ritual),
+    ('items', Item),
+)
+
+
+def _children_by_character(model, character_ids):
+    table = model.__table__
+    rows = db.session.execute(
+        select(table)
+        .where(table.c.character_id.in_(character_ids))
+        .order_by(table.c.character_id, table.c.id)
+    )
+    grouped = defaultdict(list)
+    for data in SERIALIZERS[model].rows(rows):
+        grouped[data['character_id']].append(data)
+    return grouped
+
+
+def iter_character_records(after_id=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Gera um dict por personagem (em ordem de id) com as listas skills,
+    rituals e items. after_id retoma a exportação depois do último id visto.
+    """
+    table = Character.__table__
+    query = select(table).order_by(table.c.id)
+    if after_id is not None:
+        query = query.where(table.c.id > after_id)
+
+    result = db.session.execute(query.execution_options(yield_per=batch_size))
+    serialize = SERIALIZERS[Character].rows
+
+    for batch in result.partitions():
+        characters = serialize(batch)
+        character_ids = [character['id'] for character in characters]
+        children = {
+            key: _children_by_character(model, character_ids) for key, model in CHILDREN
+        }
+
+        templates = ritual_catalog.get_templates(
+            ritual['template_id']
+            for rituals in children['rituals'].values()
+            for ritual in rituals
+        )
+        for rituals in children['rituals'].values():
+            for ritual in rituals:
+                merge_ritual_template(ritual, templates.get(ritual['template_id']))
+
+        for character in characters:
+            for key, _ in CHILDREN:
+                character[key] = children[key].get(character['id'], [])
+            yield character
+
+
+def iter_ndjson(after_id=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Gera as linhas NDJSON (uma por personagem, terminadas em \\n)"""
+    for record in iter_character_records(after_id, batch_size):
+        yield json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
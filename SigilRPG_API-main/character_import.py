@@ -0,0 +1,255 @@
+"""
+Importação em lote de personagens a partir de NDJSON
+
+Cada linha é um personagem no formato de criação (o mesmo da exportação),
+com listas opcionais skills, rituals e items. As linhas são validadas com as
+mesmas regras de create_user_character e inseridas em blocos: um INSERT em
+lote por tabela e um commit por bloco. Linhas inválidas são reportadas e
+puladas; se um bloco falhar no banco, suas linhas são reinseridas uma a uma
+para identificar a culpada sem perder as demais.
+"""
+
+import json
+from datetime import datetime
+
+from sqlalchemy import insert
+
+import ritual_catalog
+from models import db, Character, Skill, Ritual, Item
+from character_validation import validate_character_data, character_fields
+
+DEFAULT_CHUNK_SIZE = 200
+MAX_CHUNK_SIZE = 2000
+
+
+class _RowError(Exception):
+    def __init__(self, field, message):
+        super().__init__(message)
+        self.field = field
+        self.message = message
+
+
+def _safe_int(value, default=None):
+    """Converte um valor para int de forma segura"""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _safe_float(value, default=None):
+    """Converte um valor para float de forma segura"""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _clean_text(value):
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _text(entry, field, default):
+    """Campo de texto opcional; outros tipos são erro da linha, não do import"""
+    value = entry.get(field)
+    if value is None or value == '':
+        return default
+    if not isinstance(value, str):
+        raise _RowError(field, 'Deve ser um texto')
+    return value
+
+
+def _required_name(entry, default=None):
+    name = entry.get('name') or default
+    if not isinstance(name, str) or not name.strip():
+        raise _RowError('name', 'Nome é obrigatório')
+    return name.strip()
+
+
+def _skill_values(entry, templates):
+    """Mesmos padrões de create_skill"""
+    return {
+        'name': _required_name(entry),
+        'attribute': _text(entry, 'attribute', 'AGI'),
+        'bonus_dice': _safe_int(entry.get('bonus_dice'), 0),
+        'training': _safe_int(entry.get('training'), 0),
+        'others': _safe_int(entry.get('others'), 0),
+        'description': _clean_text(entry.get('description')),
+    }
+
+
+def _ritual_values(entry, templates):
+    """Mesmos padrões de create_ritual, incluindo a referência ao catálogo"""
+    template = None
+    if entry.get('template_id') is not None:
+        template = templates.get(_safe_int(entry.get('template_id')))
+        if not template:
+            raise _RowError('template_id', 'Ritual do catálogo não encontrado')
+
+    return {
+        'template_id': template['id'] if template else None,
+        'name': _required_name(entry, template['name'] if template else None),
+        'circle': _safe_int(entry.get('circle'), template['circle'] if template else 1),
+        'cost': _safe_int(entry.get('cost'), template['cost'] if template else 0),
+        **{field: _clean_text(entry.get(field)) for field in Ritual.TEMPLATE_FIELDS},
+    }
+
+
+def _item_values(entry, templates):
+    """Mesmos padrões de create_item"""
+    return {
+        'name': _required_name(entry),
+        'category': _text(entry, 'category', 'equipamento').strip(),
+        'weight': _safe_float(entry.get('weight'), 0.0),
+        'description': _clean_text(entry.get('description')),
+        'quantity': _safe_int(entry.get('quantity'), 1),
+    }
+
+
+# Chave no registro -> (modelo, normalizador)
+CHILDREN = {
+    'skills': (Skill, _skill_values),
+    'rituals': (Ritual, _ritual_values),
+    'items': (Item, _item_values),
+}
+
+
+def parse_row(data, user_id, templates):
+    """
+    Valida um registro e retorna (valores do personagem, {chave: [valores dos
+    filhos]}, erros). Quando há erros os valores são None.
+    """
+    if not isinstance(data, dict):
+        return None, None, {'data': ['Registro deve ser um objeto JSON']}
+
+    errors = validate_character_data(data)
+    children = {}
+
+    for key, (_, normalize) in CHILDREN.items():
+        entries = data.get(key) or []
+        if not isinstance(entries, list):
+            errors[key] = ['Deve ser uma lista']
+            continue
+
+        children[key] = []
+        for index, entry in enumerate(entries):
+            try:
+                if not isinstance(entry, dict):
+                    raise _RowError(None, 'Deve ser um objeto')
+                children[key].append(normalize(entry, templates))
+            except _RowError as e:
+                field = f'{key}.{index}' if e.field is None else f'{key}.{index}.{e.field}'
+                errors[field] = [e.message]
+
+    if errors:
+        return None, None, errors
+    return character_fields(data, user_id), children, None
+
+
+def _insert_chunk(rows, now):
+    """Insere (valores, filhos) em lote, um INSERT por tabela; retorna os ids"""
+    character_ids = db.session.execute(
+        insert(Character).returning(Character.id, sort_by_parameter_order=True),
+        [{**values, 'created_at': now, 'updated_at': now} for values, _ in rows],
+    ).scalars().all()
+
+    for key, (model, _) in CHILDREN.items():
+        mappings = [
+            {**child, 'character_id': character_id, 'created_at': now, 'updated_at': now}
+            for character_id, (_, children) in zip(character_ids, rows)
+            for child in children[key]
+        ]
+        if mappings:
+            db.session.execute(insert(model), mappings)
+
+    db.session.commit()
+    return character_ids
+
+
+def _store(pending, report):
+    """Grava as linhas válidas de um bloco, isolando as rejeitadas pelo banco"""
+    if not pending:
+        return
+    now = datetime.utcnow()
+    try:
+        report['character_ids'].extend(_insert_chunk([row for _, row in pending], now))
+    except Exception:
+        db.session.rollback()
+        for line_number, row in pending:
+            try:
+                report['character_ids'].extend(_insert_chunk([row], now))
+            except Exception as e:
+                db.session.rollback()
+                report['errors'].append({'line': line_number, 'errors': {'database': [str(e)]}})
+
+
+def _records(lines):
+    """
+    Gera (número da linha, registro, erros de decodificação) ignorando linhas
+    vazias
+    """
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                continue
+            record, errors = json.loads(line), None
+        except UnicodeDecodeError:
+            record, errors = None, {'encoding': ['Linha deve estar em UTF-8']}
+        except (ValueError, RecursionError):
+            record, errors = None, {'json': ['JSON inválido']}
+        yield line_number, record, errors
+
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _template_ids(chunk):
+    for _, data, _ in chunk:
+        rituals = data.get('rituals') if isinstance(data, dict) else None
+        for entry in rituals if isinstance(rituals, list) else []:
+            if isinstance(entry, dict):
+                yield _safe_int(entry.get('template_id'))
+
+
+def import_characters(lines, user_id, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Importa personagens de um iterável de linhas NDJSON (str ou bytes) para
+    o usuário user_id. Retorna {'imported', 'failed', 'character_ids',
+    'errors'}, com os erros identificados pelo número da linha.
+    """
+    report = {'character_ids': [], 'errors': []}
+
+    for chunk in _chunks(_records(lines), chunk_size):
+        # Rituais do catálogo referenciados no bloco, buscados de uma vez
+        templates = ritual_catalog.get_templates(_template_ids(chunk))
+        pending = []
+        for line_number, data, errors in chunk:
+            if errors is None:
+                try:
+                    values, children, errors = parse_row(data, user_id, templates)
+                except Exception:
+                    # Um registro inesperado não interrompe o restante da importação
+                    errors = {'data': ['Registro inválido']}
+            if errors:
+                report['errors'].append({'line': line_number, 'errors': errors})
+            else:
+                pending.append((line_number, (values, children)))
+        _store(pending, report)
+
+    report['imported'] = len(report['character_ids'])
+    report['failed'] = len(report['errors'])
+    return report
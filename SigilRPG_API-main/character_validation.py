@@ -0,0 +1,75 @@
+"""
+Regras de criação de personagens compartilhadas pela rota de criação e pela
+importação em lote
+"""
+
+from models import max_pv, max_pe, max_ps
+
+
+def _safe_int(value, default=None):
+    """Converte um valor para int de forma segura, retornando default se falhar"""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def validate_character_data(data):
+    """Regras de validação de criação de personagem; retorna {campo: [mensagens]}"""
+    name = data.get('name')
+    age = data.get('age')
+    skilled_in = data.get('skilled_in')
+    
+    errors = {}
+    
+    if not isinstance(name, str) or len(name.strip()) == 0:
+        errors['name'] = ['Nome é obrigatório']
+    elif len(name) > 255:
+        errors['name'] = ['Nome deve ter no máximo 255 caracteres']
+    
+    if not age:
+        errors['age'] = ['Idade é obrigatória']
+    elif not isinstance(age, int) or age < 1 or age > 200:
+        errors['age'] = ['Idade deve ser um número entre 1 e 200']
+    
+    if not isinstance(skilled_in, str) or len(skilled_in.strip()) == 0:
+        errors['skilled_in'] = ['Habilidade é obrigatória']
+    elif len(skilled_in) > 255:
+        errors['skilled_in'] = ['Habilidade deve ter no máximo 255 caracteres']
+    
+    return errors
+
+
+def character_fields(data, user_id):
+    """
+    Valores das colunas de um personagem já validado, com os campos opcionais,
+    os padrões e os valores de combate iniciais (iguais aos máximos)
+    """
+    fields = {
+        'name': data['name'].strip(),
+        'age': data['age'],
+        'skilled_in': data['skilled_in'].strip(),
+        'user_id': user_id,
+        'player_name': data.get('player_name'),
+        'origin': data.get('origin'),
+        'character_class': data.get('character_class'),
+        'nex': _safe_int(data.get('nex'), 5),  # Valor padrão de 5 se não fornecido
+        'avatar_url': data.get('avatar_url'),
+        'agilidade': _safe_int(data.get('agilidade'), 1),
+        'intelecto': _safe_int(data.get('intelecto'), 1),
+        'vigor': _safe_int(data.get('vigor'), 1),
+        'presenca': _safe_int(data.get('presenca'), 1),
+        'forca': _safe_int(data.get('forca'), 1),
+        'gender': data.get('gender'),
+        'appearance': data.get('appearance'),
+        'personality': data.get('personality'),
+        'background': data.get('background'),
+        'objective': data.get('objective'),
+    }
+    # Inicializar valores de combate com os máximos calculados
+    fields['current_pv'] = max_pv(fields['vigor'], fields['forca'])
+    fields['current_pe'] = max_pe(fields['intelecto'], fields['presenca'])
+    fields['current_ps'] = max_ps(fields['intelecto'], fields['presenca'])
+    return fields
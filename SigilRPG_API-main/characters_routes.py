@@ -2,22 +2,117 @@
 Rotas para personagens do sistema
 """
 
-from flask import Blueprint, request, jsonify
-from models import db, Character
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
+from models import db, Character, SERIALIZERS
+from character_export import iter_ndjson, DEFAULT_BATCH_SIZE, MAX_BATCH_SIZE
+from pagination import parse_limit, decode_cursor, encode_cursor, keyset_page
+from http_cache import conditional_get
+from campaigns_routes import invalidate_campaign_cache
+from ownership import is_admin
 
 characters_bp = Blueprint('characters', __name__)
 
+def _int_filters(args, keys):
+    """Filtros inteiros opcionais; levanta ValueError(nome) se algum não for inteiro"""
+    values = {}
+    for key in keys:
+        value = args.get(key)
+        if value is None or value == '':
+            values[key] = None
+            continue
+        try:
+            values[key] = int(value)
+        except ValueError:
+            raise ValueError(key)
+    return values
+
 @characters_bp.route('/', methods=['GET'])
 def list_characters():
-    """Lista todos os personagens do sistema"""
+    """
+    Lista os personagens do sistema, paginados por cursor.
+
+    Parâmetros de query: limit, cursor, user_id, character_class, origin,
+    nex_min, nex_max e fields (lista separada por vírgulas com os campos
+    desejados em cada personagem). O corpo continua sendo um array; o cursor
+    da próxima página vem no cabeçalho X-Next-Cursor (ausente na última página).
+    user_id, nex_min e nex_max não inteiros respondem 400 (invalid_filters).
+    """
     try:
-        characters = Character.query.all()
-        
-        return jsonify([character.to_dict() for character in characters]), 200
+        args = request.args
+
+        try:
+            limit = parse_limit(args.get('limit'))
+            cursor = decode_cursor(args.get('cursor'))
+            after_id = int(cursor['id']) if cursor else None
+        except (ValueError, TypeError, KeyError):
+            return jsonify({'message': 'invalid_pagination'}), 400
+
+        serializer = SERIALIZERS[Character]
+        if args.get('fields'):
+            try:
+                serializer = serializer.only(
+                    field.strip() for field in args['fields'].split(',') if field.strip()
+                )
+            except ValueError as e:
+                return jsonify({'message': 'invalid_fields', 'error': str(e)}), 400
+
+        try:
+            filters = _int_filters(args, ('user_id', 'nex_min', 'nex_max'))
+        except ValueError as e:
+            return jsonify({'message': 'invalid_filters', 'error': str(e)}), 400
+
+        query = Character.query
+
+        user_id = filters['user_id']
+        if user_id is not None:
+            query = query.filter(Character.user_id == user_id)
+        if args.get('character_class'):
+            query = query.filter(Character.character_class == args['character_class'])
+        if args.get('origin'):
+            query = query.filter(Character.origin == args['origin'])
+        nex_min = filters['nex_min']
+        if nex_min is not None:
+            query = query.filter(Character.nex >= nex_min)
+        nex_max = filters['nex_max']
+        if nex_max is not None:
+            query = query.filter(Character.nex <= nex_max)
+
+        characters, last_id = keyset_page(query, Character.id, after_id, limit)
+
+        response = jsonify(serializer.many(characters))
+        if last_id is not None:
+            response.headers['X-Next-Cursor'] = encode_cursor({'id': last_id})
+        return response, 200
         
     except Exception as e:
         return jsonify({'message': 'error_retrieving_characters'}), 500
 
+@characters_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_characters():
+    """
+    Exporta todos os personagens com habilidades, rituais e itens em NDJSON
+    (apenas admin), em streaming.
+
+    Parâmetros de query: after_id (retoma depois do último id recebido) e
+    batch_size (personagens lidos por lote).
+    """
+    if not is_admin():
+        return jsonify({'message': 'forbidden'}), 403
+
+    try:
+        after_id = request.args.get('after_id')
+        after_id = int(after_id) if after_id else None
+        batch_size = parse_limit(request.args.get('batch_size'), DEFAULT_BATCH_SIZE, MAX_BATCH_SIZE)
+    except ValueError:
+        return jsonify({'message': 'invalid_pagination'}), 400
+
+    return Response(
+        stream_with_context(iter_ndjson(after_id, batch_size)),
+        mimetype='application/x-ndjson'
+    )
+
 @characters_bp.route('/', methods=['POST'])
 def create_character():
     """Cria um novo personagem"""
@@ -71,7 +166,14 @@ def create_character():
             'error_type': type(e).__name__
         }), 500
 
+def _character_fingerprint(character_id):
+    row = db.session.query(Character.updated_at).filter(Character.id == character_id).first()
+    if row is None:
+        return None
+    return ('character', character_id, row.updated_at), row.updated_at
+
 @characters_bp.route('/<int:character_id>', methods=['GET'])
+@conditional_get(_character_fingerprint)
 def show_character(character_id):
     """Mostra detalhes de um personagem específico"""
     try:
@@ -138,6 +240,7 @@ def update_character(character_id):
             character.origin = data['origin']
         
         db.session.commit()
+        invalidate_campaign_cache()
         
         return jsonify(character.to_dict()), 200
         
@@ -0,0 +1,181 @@
+"""
+Motor de combate determinístico
+
+Uma luta é resolvida rodada a rodada a partir de um retrato (Fighter) de cada
+personagem e de uma semente. Com a mesma semente e os mesmos retratos o
+resultado é sempre o mesmo, então a luta pode ser reproduzida a partir do que
+fica gravado em Fight (seed + combat_log).
+
+Regras (inspiradas nos testes do sistema: N d20 e fica com o maior):
+- Iniciativa: AGI d20 + AGI; quem vence ataca primeiro em todas as rodadas
+- Ataque: dados do atributo da perícia de ataque (FOR ou AGI) + bonus_dice,
+  somando training + others; acerta se o total for >= defesa do alvo
+- Defesa: 10 + AGI
+- Dano: 1d6 + FOR (mínimo 1); 20 natural dobra o dano; enquanto houver PE,
+  cada acerto gasta 2 PE para somar mais 1d6
+- Quem chegar a 0 PV perde; após MAX_ROUNDS rodadas a luta empata
+"""
+
+import json
+import random
+from collections import namedtuple
+
+from process_pool import process_pool
+
+ENGINE_VERSION = 1
+MAX_ROUNDS = 20
+EFFORT_COST = 2
+# Lutas por tarefa enviada a cada processo em resolve_many
+PARALLEL_CHUNK_SIZE = 1000
+
+ATTACK_ATTRIBUTES = ('FOR', 'AGI')
+
+Fighter = namedtuple('Fighter', [
+    'pv', 'pe', 'agilidade', 'attack_dice', 'attack_bonus', 'defense', 'damage_bonus',
+])
+
+# Resultado do ponto de vista do primeiro lutador
+Result = namedtuple('Result', ['status', 'rounds', 'experience', 'log'])
+
+
+def fighter_from_character(character, skills=()):
+    """Retrato de combate de um personagem com as suas habilidades"""
+    attributes = {'FOR': character.forca or 0, 'AGI': character.agilidade or 0}
+
+    # Melhor perícia de ataque; sem nenhuma, usa o maior atributo sem bônus
+    attack_dice, attack_bonus = max(attributes.values()), 0
+    best = None
+    for skill in skills:
+        attribute = (skill.attribute or '').upper()
+        if attribute not in ATTACK_ATTRIBUTES:
+            continue
+        bonus = (skill.training or 0) + (skill.others or 0)
+        dice = attributes[attribute] + (skill.bonus_dice or 0)
+        if best is None or (bonus, dice) > best:
+            best = (bonus, dice)
+    if best is not None:
+        attack_bonus, attack_dice = best
+
+    pv = character.current_pv if character.current_pv is not None else character.calculate_max_pv()
+    pe = character.current_pe if character.current_pe is not None else character.calculate_max_pe()
+    return Fighter(
+        pv=pv,
+        pe=max(pe, 0),
+        agilidade=attributes['AGI'],
+        attack_dice=attack_dice,
+        attack_bonus=attack_bonus,
+        defense=10 + attributes['AGI'],
+        damage_bonus=attributes['FOR'],
+    )
+
+
+def new_seed():
+    """Semente aleatória de 31 bits (cabe em uma coluna INTEGER)"""
+    return random.SystemRandom().getrandbits(31)
+
+
+def _d20_test(r, dice):
+    """Rola `dice` d20 e fica com o maior; com 0 ou menos rola 2 e fica com o menor"""
+    if dice <= 0:
+        return min(int(r() * 20) + 1, int(r() * 20) + 1)
+    best = 0
+    for _ in range(dice):
+        value = int(r() * 20) + 1
+        if value > best:
+            best = value
+    return best
+
+
+def resolve(first, second, seed):
+    """
+    Resolve a luta entre dois Fighter. O log tem uma entrada por ataque:
+    [rodada, atacante (0 ou 1), d20, total do ataque, dano, PV do alvo depois].
+    """
+    r = random.Random(seed).random
+    fighters = (first, second)
+    pv = [first.pv, second.pv]
+    pe = [first.pe, second.pe]
+    log = []
+
+    initiative = [_d20_test(r, fighter.agilidade) + fighter.agilidade for fighter in fighters]
+    order = (0, 1) if initiative[0] >= initiative[1] else (1, 0)
+
+    rounds = 0
+    winner = None
+    if pv[0] <= 0 or pv[1] <= 0:
+        winner = 1 if pv[0] <= 0 else 0
+
+    while winner is None and rounds < MAX_ROUNDS:
+        rounds += 1
+        for attacker in order:
+            defender = 1 - attacker
+            fighter = fighters[attacker]
+
+            natural = _d20_test(r, fighter.attack_dice)
+            total = natural + fighter.attack_bonus
+            damage = 0
+            if total >= fighters[defender].defense:
+                damage = int(r() * 6) + 1 + fighter.damage_bonus
+                if pe[attacker] >= EFFORT_COST:
+                    pe[attacker] -= EFFORT_COST
+                    damage += int(r() * 6) + 1
+                if natural == 20:
+                    damage *= 2
+                damage = max(damage, 1)
+                pv[defender] -= damage
+
+            log.append([rounds, attacker, natural, total, damage, pv[defender]])
+            if pv[defender] <= 0:
+                winner = attacker
+                break
+
+    if winner is None:
+        status = 'draw'
+        experience = 20 + int(r() * 21)
+    elif winner == 0:
+        status = 'won'
+        experience = 50 + int(r() * 51)
+    else:
+        status = 'lost'
+        experience = 10 + int(r() * 21)
+
+    return Result(status, rounds, experience, log)
+
+
+def _resolve_chunk(matches):
+    return [resolve(first, second, seed) for first, second, seed in matches]
+
+
+def resolve_many(matches, workers=1):
+    """
+    Resolve uma lista de (Fighter, Fighter, seed) mantendo a ordem. Com
+    workers > 1 as lutas são divididas em blocos no pool de processos
+    compartilhado (process_pool); o resultado é o mesmo, já que cada luta
+    depende só dos seus retratos e da semente. Levanta ProcessPoolBusy se o
+    pool estiver ocupado.
+    """
+    if workers <= 1 or len(matches) <= PARALLEL_CHUNK_SIZE:
+        return _resolve_chunk(matches)
+
+    chunks = [
+        matches[start:start + PARALLEL_CHUNK_SIZE]
+        for start in range(0, len(matches), PARALLEL_CHUNK_SIZE)
+    ]
+    return [result for chunk in process_pool.map(_resolve_chunk, chunks) for result in chunk]
+
+
+def dump_log(first, second, result):
+    """Log compacto gravado em Fight.combat_log (inclui os retratos para replay)"""
+    return json.dumps(
+        {'v': ENGINE_VERSION, 'fighters': [list(first), list(second)], 'rounds': result.log},
+        separators=(',', ':'),
+    )
+
+
+def replay(seed, combat_log):
+    """Refaz uma luta gravada; retorna (Result, retratos)"""
+    data = json.loads(combat_log)
+    if data.get('v') != ENGINE_VERSION:
+        raise ValueError(f"Versão do motor de combate incompatível: {data.get('v')}")
+    fighters = [Fighter(*values) for values in data['fighters']]
+    return resolve(fighters[0], fighters[1], seed), fighters
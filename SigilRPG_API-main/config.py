@@ -9,27 +9,67 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class Config:
-    """Configuração base"""
+    """Configuração base (usada por app.create_app)"""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-change-this-in-production')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-string-change-this-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = 86400  # 24 horas em segundos
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 512))
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH')
+    # Política de hash de senhas (formato do Werkzeug); hashes antigos são refeitos no login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    # Verificações em andamento por processo (no máximo SERVER_THREADS - 1 no servidor de produção)
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 4))
+    # Cache por processo dos usuários autenticados (0 desativa)
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 4096))
+    # Segundos entre as sincronizações da lista de tokens revogados com o banco
+    TOKEN_BLOCKLIST_REFRESH = float(os.environ.get('TOKEN_BLOCKLIST_REFRESH', 5))
+    # Pool de processos das simulações (padrão: um processo por núcleo; ver ProductionConfig) e requisições simultâneas nele
+    PROCESS_POOL_WORKERS = int(os.environ.get('PROCESS_POOL_WORKERS', 0)) or None
+    PROCESS_POOL_MAX_JOBS = int(os.environ.get('PROCESS_POOL_MAX_JOBS', 1))
+    # Flask-Migrate (comando `flask db`): importado só quando habilitado
+    MIGRATIONS_ENABLED = False
 
 class DevelopmentConfig(Config):
     """Configuração para desenvolvimento"""
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///rpg.db')
+    MIGRATIONS_ENABLED = True
 
 class ProductionConfig(Config):
     """Configuração para produção"""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///rpg.db')
+    # Vários processos: cache compartilhado para que a invalidação valha em todos
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'sqlite')
+    # Servidor de produção (gunicorn.conf.py): processos x threads por processo
+    SERVER_BIND = os.environ.get('SERVER_BIND', '0.0.0.0:8000')
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', os.cpu_count() or 1))
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))
+    # Pool de simulações de cada processo: os núcleos divididos entre os
+    # SERVER_WORKERS, para não rodar SERVER_WORKERS x núcleos processos filhos
+    PROCESS_POOL_WORKERS = int(os.environ.get('PROCESS_POOL_WORKERS', 0)) \
+        or max(1, (os.cpu_count() or 1) // max(1, SERVER_WORKERS))
+    SERVER_KEEPALIVE = int(os.environ.get('SERVER_KEEPALIVE', 5))
+    # Fila de conexões aguardando accept e conexões simultâneas por processo
+    SERVER_BACKLOG = int(os.environ.get('SERVER_BACKLOG', 256))
+    SERVER_MAX_CONNECTIONS = int(os.environ.get('SERVER_MAX_CONNECTIONS', 100))
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 30))
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30))
 
 class TestingConfig(Config):
     """Configuração para testes"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    # Cache em memória (o padrão) para que os testes exercitem a invalidação
+    RESPONSE_CACHE_BACKEND = 'memory'
+    # Custo mínimo: os testes criam muitos usuários
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
 
 # Configuração padrão
 config = {
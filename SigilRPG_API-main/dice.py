@@ -0,0 +1,275 @@
+"""
+Motor de expressões de dados
+
+Notação: termos somados ou subtraídos, cada um sendo uma constante ou NdS com
+seleção opcional khK / klK (mantém os K maiores / menores). Ex.: 3d20kh1+5,
+2d6+1d4-1, d20, 4d6kh3.
+
+As expressões compiladas e as distribuições exatas ficam em cache (LRU) na
+memória do processo. Distribuições são calculadas como contagens inteiras de
+resultados (sem erro de ponto flutuante) por convolução dos polinômios de
+cada termo; termos com seleção usam programação dinâmica por valor de face.
+"""
+
+import random
+import re
+from collections import namedtuple
+from functools import lru_cache
+from math import comb, sqrt
+
+MAX_DICE = 100
+MAX_SIDES = 1000
+MAX_TERMS = 20
+# Maior quantidade de totais possíveis aceita para distribuições exatas
+MAX_DISTRIBUTION_SUPPORT = 20000
+# Limite aproximado de operações da convolução (mantém o pior caso abaixo de ~1s)
+MAX_DISTRIBUTION_WORK = 5_000_000
+
+# sign: +1/-1; count == 0 indica constante (valor em sides)
+Term = namedtuple('Term', ['sign', 'count', 'sides', 'keep', 'keep_count'])
+
+_TOKEN = re.compile(r'\s*([+-])?\s*(?:(\d*)d(\d+)(?:(kh|kl)(\d+))?|(\d+))\s*', re.IGNORECASE)
+
+
+class DiceError(ValueError):
+    """Expressão inválida ou fora dos limites"""
+
+
+class DiceExpression:
+    """Expressão compilada; use compile_expression() para obter a versão em cache"""
+
+    def __init__(self, terms):
+        self.terms = tuple(terms)
+        self.notation = ''.join(
+            ('' if index == 0 and term.sign > 0 else '+' if term.sign > 0 else '-') + _term_notation(term)
+            for index, term in enumerate(self.terms)
+        )
+
+    def roll(self, rng=random):
+        """Rola a expressão; retorna o total e os dados de cada termo"""
+        total = 0
+        parts = []
+        for term in self.terms:
+            if term.count == 0:
+                total += term.sign * term.sides
+                parts.append({'notation': _term_notation(term), 'subtotal': term.sign * term.sides})
+                continue
+
+            rolls = [rng.randint(1, term.sides) for _ in range(term.count)]
+            kept = _kept(rolls, term)
+            subtotal = term.sign * sum(kept)
+            total += subtotal
+            parts.append({
+                'notation': _term_notation(term),
+                'rolls': rolls,
+                'kept': kept,
+                'subtotal': subtotal,
+            })
+        return {'total': total, 'terms': parts}
+
+    @property
+    def dice_count(self):
+        """Dados rolados por rolagem da expressão (constantes não contam)"""
+        return sum(term.count for term in self.terms)
+
+    @property
+    def bounds(self):
+        low = high = 0
+        for term in self.terms:
+            if term.count == 0:
+                low += term.sign * term.sides
+                high += term.sign * term.sides
+                continue
+            kept = term.keep_count if term.keep else term.count
+            if term.sign > 0:
+                low, high = low + kept, high + kept * term.sides
+            else:
+                low, high = low - kept * term.sides, high - kept
+        return low, high
+
+
+def _term_notation(term):
+    if term.count == 0:
+        return str(term.sides)
+    notation = f'{term.count}d{term.sides}'
+    if term.keep:
+        notation += f'{term.keep}{term.keep_count}'
+    return notation
+
+
+def _kept(rolls, term):
+    if not term.keep:
+        return rolls
+    ordered = sorted(rolls, reverse=term.keep == 'kh')
+    return ordered[:term.keep_count]
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression):
+    """Analisa a notação e retorna um DiceExpression (em cache por texto)"""
+    if not isinstance(expression, str) or not expression.strip():
+        raise DiceError('Expressão vazia')
+
+    terms = []
+    position = 0
+    text = expression.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise DiceError(f'Trecho inválido na posição {position}: {text[position:]!r}')
+        sign_text, count_text, sides_text, keep, keep_text, constant = match.groups()
+        if terms and not sign_text:
+            raise DiceError(f'Operador esperado na posição {position}')
+        sign = -1 if sign_text == '-' else 1
+
+        if constant is not None:
+            terms.append(Term(sign, 0, int(constant), None, 0))
+        else:
+            count = int(count_text) if count_text else 1
+            sides = int(sides_text)
+            keep_count = int(keep_text) if keep_text else 0
+            if not 1 <= count <= MAX_DICE:
+                raise DiceError(f'Quantidade de dados deve estar entre 1 e {MAX_DICE}')
+            if not 2 <= sides <= MAX_SIDES:
+                raise DiceError(f'Número de faces deve estar entre 2 e {MAX_SIDES}')
+            if keep and not 1 <= keep_count <= count:
+                raise DiceError('Quantidade mantida deve estar entre 1 e a quantidade de dados')
+            keep = keep.lower() if keep else None
+            if keep and keep_count == count:
+                keep = None  # manter todos é o mesmo que não selecionar
+            terms.append(Term(sign, count, sides, keep, keep_count if keep else 0))
+
+        if len(terms) > MAX_TERMS:
+            raise DiceError(f'No máximo {MAX_TERMS} termos')
+        position = match.end()
+
+    return DiceExpression(terms)
+
+
+def _convolve(first, second):
+    """Produto de dois polinômios (listas de contagens por total)"""
+    result = [0] * (len(first) + len(second) - 1)
+    for i, a in enumerate(first):
+        if a:
+            for j, b in enumerate(second):
+                result[i + j] += a * b
+    return result
+
+
+@lru_cache(maxsize=256)
+def _sum_counts(count, sides):
+    """Contagens da soma de count dados de sides faces (índice 0 = total count)"""
+    die = (1,) * sides
+    result = [1]
+    power = list(die)
+    # Exponenciação por quadrados
+    while count:
+        if count & 1:
+            result = _convolve(result, power)
+        count >>= 1
+        if count:
+            power = _convolve(power, power)
+    return tuple(result)
+
+
+@lru_cache(maxsize=256)
+def _keep_counts(count, sides, keep, keep_count):
+    """
+    Contagens da soma dos keep_count dados mantidos (índice 0 = soma mínima).
+
+    Percorre os valores de face do mais favorável ao menos favorável; o
+    estado é (dados já atribuídos, soma mantida) e a quantidade c de dados
+    com a face atual entra com peso C(restantes, c).
+    """
+    faces = range(sides, 0, -1) if keep == 'kh' else range(1, sides + 1)
+    states = {(0, 0): 1}
+    for face in faces:
+        next_states = {}
+        for (assigned, kept_sum), ways in states.items():
+            remaining = count - assigned
+            for c in range(remaining + 1):
+                kept_now = min(c, max(keep_count - assigned, 0))
+                key = (assigned + c, kept_sum + kept_now * face)
+                next_states[key] = next_states.get(key, 0) + ways * comb(remaining, c)
+        states = next_states
+
+    low = keep_count
+    result = [0] * (keep_count * sides - low + 1)
+    for (assigned, kept_sum), ways in states.items():
+        if assigned == count:
+            result[kept_sum - low] += ways
+    return tuple(result)
+
+
+def _estimated_work(terms):
+    """Estimativa do número de multiplicações para calcular a distribuição"""
+    work = 0
+    support = 1
+    for term in terms:
+        if term.count == 0:
+            continue
+        if term.keep:
+            # faces x estados (dados atribuídos x soma mantida) x escolhas
+            work += term.sides * (term.count + 1) ** 2 * (term.keep_count * term.sides) // 2
+            width = term.keep_count * (term.sides - 1) + 1
+        else:
+            width = term.count * (term.sides - 1) + 1
+            work += width * width // 2
+        work += support * width
+        support += width - 1
+    return work
+
+
+def _term_counts(term):
+    """(menor total, contagens, total de resultados) de um termo"""
+    if term.count == 0:
+        return term.sign * term.sides, (1,), 1
+    if term.keep:
+        counts = _keep_counts(term.count, term.sides, term.keep, term.keep_count)
+        low = term.keep_count
+    else:
+        counts = _sum_counts(term.count, term.sides)
+        low = term.count
+    outcomes = term.sides ** term.count
+    if term.sign < 0:
+        return -(low + len(counts) - 1), tuple(reversed(counts)), outcomes
+    return low, counts, outcomes
+
+
+@lru_cache(maxsize=512)
+def distribution(expression):
+    """
+    Distribuição exata de uma expressão: dict com min, max, mean, stddev e
+    outcomes (lista de [total, probabilidade]). Em cache por notação normalizada.
+    """
+    compiled = compile_expression(expression)
+    if compiled.notation != expression:
+        return distribution(compiled.notation)
+
+    low, high = compiled.bounds
+    if high - low + 1 > MAX_DISTRIBUTION_SUPPORT or _estimated_work(compiled.terms) > MAX_DISTRIBUTION_WORK:
+        raise DiceError('Expressão grande demais para calcular a distribuição exata')
+
+    offset, counts, outcomes = 0, [1], 1
+    for term in compiled.terms:
+        term_low, term_counts, term_outcomes = _term_counts(term)
+        offset += term_low
+        counts = _convolve(counts, term_counts)
+        outcomes *= term_outcomes
+
+    probabilities = tuple((offset + index, ways / outcomes) for index, ways in enumerate(counts) if ways)
+    mean = sum(total * p for total, p in probabilities)
+    variance = sum((total - mean) ** 2 * p for total, p in probabilities)
+    return {
+        'expression': compiled.notation,
+        'min': low,
+        'max': high,
+        'mean': mean,
+        'stddev': sqrt(variance),
+        'outcomes': probabilities,
+    }
+
+
+def success_probability(expression, dc):
+    """P(total >= dc) pela distribuição exata"""
+    return sum(p for total, p in distribution(expression)['outcomes'] if total >= dc)
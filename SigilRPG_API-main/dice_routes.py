@@ -0,0 +1,99 @@
+"""
+Rotas de rolagem de dados
+"""
+
+import random
+
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+import dice
+
+dice_bp = Blueprint('dice', __name__)
+
+MAX_EXPRESSIONS = 50
+MAX_TIMES = 100
+# Dados rolados por requisição (todas as expressões x times): limita CPU e tamanho da resposta
+MAX_TOTAL_DICE = 10_000
+
+_system_random = random.SystemRandom()
+
+
+@dice_bp.route('/roll', methods=['POST'])
+@jwt_required(optional=True)
+def roll_dice():
+    """
+    Rola uma ou várias expressões.
+    Body: {"expression": "3d20kh1+5"} ou {"expressions": [...]}, "times" (rolagens
+    por expressão, padrão 1) e "seed" opcional para resultados reproduzíveis.
+    No total, no máximo MAX_TOTAL_DICE dados por requisição.
+    """
+    data = request.get_json(silent=True) or {}
+    expressions = data.get('expressions')
+    if expressions is None:
+        expressions = [data.get('expression')]
+    if not isinstance(expressions, list) or not expressions:
+        return jsonify({'message': 'invalid_expression'}), 400
+    if len(expressions) > MAX_EXPRESSIONS:
+        return jsonify({'message': 'too_many_expressions', 'max': MAX_EXPRESSIONS}), 400
+
+    times = data.get('times', 1)
+    if isinstance(times, bool) or not isinstance(times, int) or not 1 <= times <= MAX_TIMES:
+        return jsonify({'message': 'invalid_times', 'max': MAX_TIMES}), 400
+
+    seed = data.get('seed')
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+        return jsonify({'message': 'invalid_seed'}), 400
+
+    try:
+        compiled = [dice.compile_expression(expression) for expression in expressions]
+    except dice.DiceError as e:
+        return jsonify({'message': 'invalid_expression', 'error_detail': str(e)}), 400
+
+    if sum(expression.dice_count for expression in compiled) * times > MAX_TOTAL_DICE:
+        return jsonify({'message': 'too_many_dice', 'max': MAX_TOTAL_DICE}), 400
+
+    rng = random.Random(seed) if seed is not None else _system_random
+    results = [
+        {
+            'expression': expression.notation,
+            'rolls': [expression.roll(rng) for _ in range(times)],
+        }
+        for expression in compiled
+    ]
+
+    current_app.logger.info(
+        'dice roll user=%s expressions=%s totals=%s',
+        get_jwt_identity(),
+        [result['expression'] for result in results],
+        [[roll['total'] for roll in result['rolls']] for result in results],
+    )
+
+    return jsonify({
+        'message': 'dice_rolled',
+        'data': {'seed': seed, 'results': results},
+    }), 200
+
+
+@dice_bp.route('/distribution', methods=['GET'])
+def dice_distribution():
+    """
+    Distribuição exata de uma expressão (?expression=2d6+1d4-1).
+    Com ?dc=N inclui a probabilidade de o total ser >= N.
+    """
+    expression = request.args.get('expression', '')
+    try:
+        result = dict(dice.distribution(expression.strip()))
+    except dice.DiceError as e:
+        return jsonify({'message': 'invalid_expression', 'error_detail': str(e)}), 400
+
+    dc = request.args.get('dc')
+    if dc is not None:
+        try:
+            dc = int(dc)
+        except ValueError:
+            return jsonify({'message': 'invalid_dc'}), 400
+        result['dc'] = dc
+        result['success_probability'] = dice.success_probability(result['expression'], dc)
+
+    return jsonify({'message': 'dice_distribution', 'data': result}), 200
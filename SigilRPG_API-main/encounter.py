@@ -0,0 +1,210 @@
+"""
+Estimativa de Monte Carlo do equilíbrio de um encontro (equipe x oponentes)
+
+Usa as mesmas regras de combat.py, mas em vez de um laço Python por luta
+todas as N simulações avançam juntas em arrays NumPy: cada "vez" de cada
+rodada rola os dados das N simulações de uma só vez. Em equipe, cada
+combatente ataca o primeiro inimigo ainda de pé (foco de ataque).
+
+Execuções grandes rodam no pool de processos compartilhado (process_pool),
+divididas em blocos; cada bloco devolve somas (contagem, soma, soma dos quadrados) que são
+combinadas para calcular médias e intervalos de confiança de 95%.
+"""
+
+import math
+
+# NumPy é opcional e custa ~50ms de import: carregado no primeiro uso
+np = None
+
+from combat import MAX_ROUNDS, EFFORT_COST
+from process_pool import process_pool
+
+MIN_SIMULATIONS = 1
+MAX_SIMULATIONS = 1_000_000
+DEFAULT_SIMULATIONS = 10_000
+# Oponentes por encontro: o custo de cada simulação cresce com o tamanho da luta
+MAX_OPPONENTS = 20
+# A partir daqui a execução vai para o pool de processos (limitado por requisições simultâneas)
+PARALLEL_THRESHOLD = 100_000
+# Simulações por iteração interna (limita a memória dos arrays)
+BLOCK_SIZE = 50_000
+
+Z_95 = 1.959963984540054
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # dependência opcional: sem ela o estimador fica indisponível
+            return None
+        np = numpy
+    return np
+
+
+def available():
+    return _load_numpy() is not None
+
+
+def _roll_tests(rng, dice):
+    """
+    Teste de d20 vetorizado: para cada simulação rola dice[i] d20 e fica com
+    o maior; com dice <= 0 rola 2 e fica com o menor
+    """
+    n = dice.shape[0]
+    width = max(int(dice.max()), 2)
+    rolls = rng.integers(1, 21, size=(n, width))
+    columns = np.arange(width)
+    best = np.where(columns < dice[:, None], rolls, 0).max(axis=1)
+    worst = rolls[:, :2].min(axis=1)
+    return np.where(dice <= 0, worst, best)
+
+
+def _simulate_block(stats, n, rng):
+    """Roda n encontros; retorna (resultados, rodadas, PV perdido por membro da equipe)"""
+    side = stats['side']
+    combatants = side.shape[0]
+    party = side == 0
+    rows = np.arange(n)
+
+    pv = np.tile(stats['pv'], (n, 1))
+    pe = np.tile(stats['pe'], (n, 1))
+
+    # Ordem de iniciativa de cada simulação (maior primeiro)
+    initiative = np.stack(
+        [_roll_tests(rng, np.full(n, agi)) + agi for agi in stats['agilidade']], axis=1
+    )
+    order = np.argsort(-initiative, axis=1, kind='stable')
+
+    rounds = np.zeros(n, dtype=np.int64)
+    party_alive = (pv[:, party] > 0).any(axis=1)
+    opponents_alive = (pv[:, ~party] > 0).any(axis=1)
+    ongoing = party_alive & opponents_alive
+
+    for _ in range(MAX_ROUNDS):
+        if not ongoing.any():
+            break
+        rounds += ongoing
+        for slot in range(combatants):
+            actor = order[:, slot]
+            alive = pv > 0
+            enemies = (side[None, :] != side[actor][:, None]) & alive
+            active = ongoing & alive[rows, actor] & enemies.any(axis=1)
+            target = enemies.argmax(axis=1)
+
+            natural = _roll_tests(rng, stats['attack_dice'][actor])
+            total = natural + stats['attack_bonus'][actor]
+            hit = active & (total >= stats['defense'][target])
+
+            damage = rng.integers(1, 7, size=n) + stats['damage_bonus'][actor]
+            effort = hit & (pe[rows, actor] >= EFFORT_COST)
+            pe[rows, actor] -= EFFORT_COST * effort
+            damage += effort * rng.integers(1, 7, size=n)
+            damage = np.where(natural == 20, damage * 2, damage)
+            damage = np.maximum(damage, 1) * hit
+            pv[rows, target] -= damage
+
+        party_alive = (pv[:, party] > 0).any(axis=1)
+        opponents_alive = (pv[:, ~party] > 0).any(axis=1)
+        ongoing = party_alive & opponents_alive
+
+    won = party_alive & ~opponents_alive
+    lost = ~party_alive
+    hp_loss = stats['pv'][party][None, :] - np.maximum(pv[:, party], 0)
+    return won, lost, rounds, hp_loss
+
+
+def _simulate_chunk(stats, simulations, seed):
+    """Roda um bloco de simulações e devolve apenas somas (leve para enviar entre processos)"""
+    _load_numpy()
+    rng = np.random.default_rng(seed)
+    totals = {'n': 0, 'won': 0, 'lost': 0, 'rounds': 0.0, 'rounds_sq': 0.0,
+              'hp_loss': 0.0, 'hp_loss_sq': 0.0}
+
+    remaining = simulations
+    while remaining > 0:
+        n = min(remaining, BLOCK_SIZE)
+        won, lost, rounds, hp_loss = _simulate_block(stats, n, rng)
+        totals['n'] += n
+        totals['won'] += int(won.sum())
+        totals['lost'] += int(lost.sum())
+        totals['rounds'] += float(rounds.sum())
+        totals['rounds_sq'] += float((rounds.astype(np.float64) ** 2).sum())
+        totals['hp_loss'] = totals['hp_loss'] + hp_loss.sum(axis=0)
+        totals['hp_loss_sq'] = totals['hp_loss_sq'] + (hp_loss.astype(np.float64) ** 2).sum(axis=0)
+        remaining -= n
+
+    return totals
+
+
+def _merge(chunks):
+    merged = chunks[0]
+    for chunk in chunks[1:]:
+        for key, value in chunk.items():
+            merged[key] = merged[key] + value
+    return merged
+
+
+def _proportion(count, n):
+    p = count / n
+    margin = Z_95 * math.sqrt(p * (1 - p) / n)
+    return {'value': round(p, 4), 'ci95': [round(max(p - margin, 0.0), 4), round(min(p + margin, 1.0), 4)]}
+
+
+def _mean(total, total_sq, n):
+    mean = total / n
+    variance = max(total_sq / n - mean * mean, 0.0)
+    margin = Z_95 * math.sqrt(variance / n)
+    return {'value': round(mean, 3), 'ci95': [round(mean - margin, 3), round(mean + margin, 3)]}
+
+
+def _stats_arrays(party, opponents):
+    fighters = list(party) + list(opponents)
+    return {
+        'side': np.array([0] * len(party) + [1] * len(opponents)),
+        **{
+            field: np.array([getattr(fighter, field) for fighter in fighters], dtype=np.int64)
+            for field in ('pv', 'pe', 'agilidade', 'attack_dice', 'attack_bonus', 'defense', 'damage_bonus')
+        },
+    }
+
+
+def estimate(party, opponents, simulations=DEFAULT_SIMULATIONS, workers=1, seed=None):
+    """
+    Estima o encontro entre a equipe e os oponentes (listas de combat.Fighter).
+
+    Retorna a probabilidade de vitória/derrota/empate, as rodadas esperadas e
+    o PV perdido esperado por membro da equipe, com intervalos de 95%.
+    Com simulações suficientes, roda no pool compartilhado dividido em
+    `workers` blocos (até o tamanho do pool); levanta ProcessPoolBusy se o
+    pool estiver ocupado.
+    """
+    if _load_numpy() is None:
+        raise RuntimeError('numpy_not_installed')
+
+    stats = _stats_arrays(party, opponents)
+    parallel = simulations >= PARALLEL_THRESHOLD
+    workers = min(max(1, workers), process_pool.workers) if parallel else 1
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    sizes = [simulations // workers + (1 if index < simulations % workers else 0) for index in range(workers)]
+
+    if parallel:
+        totals = _merge(process_pool.map(_simulate_chunk, [stats] * workers, sizes, seeds))
+    else:
+        totals = _simulate_chunk(stats, simulations, seeds[0])
+
+    n = totals['n']
+    hp_loss = [
+        _mean(float(total), float(total_sq), n)
+        for total, total_sq in zip(totals['hp_loss'], totals['hp_loss_sq'])
+    ]
+    return {
+        'simulations': n,
+        'workers': workers,
+        'win_probability': _proportion(totals['won'], n),
+        'loss_probability': _proportion(totals['lost'], n),
+        'draw_probability': _proportion(n - totals['won'] - totals['lost'], n),
+        'expected_rounds': _mean(totals['rounds'], totals['rounds_sq'], n),
+        'expected_hp_loss': hp_loss,
+    }
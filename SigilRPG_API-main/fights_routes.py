@@ -2,51 +2,189 @@
 Rotas para lutas
 """
 
+from datetime import datetime, timezone
+
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User, Character, Fight
-import random
+from sqlalchemy import and_, case, func, select
+from models import db, Character, Fight, Skill, SERIALIZERS
+from pagination import parse_limit, decode_cursor, encode_cursor, keyset_page
+from user_cache import user_cache
+import combat
+import leaderboard
+
+FIGHT_STATUSES = ('won', 'lost', 'draw')
 
 fights_bp = Blueprint('fights', __name__)
 
+def _parse_datetime(value):
+    """Data ISO 8601 dos filtros since/until; None se ausente"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError('invalid_date')
+    # created_at é gravado em UTC sem fuso
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _time_range(args):
+    """Condições de intervalo sobre Fight.created_at a partir de since/until"""
+    since = _parse_datetime(args.get('since'))
+    until = _parse_datetime(args.get('until'))
+    conditions = []
+    if since is not None:
+        conditions.append(Fight.created_at >= since)
+    if until is not None:
+        conditions.append(Fight.created_at < until)
+    return conditions
+
+
 @fights_bp.route('/', methods=['GET'])
 @jwt_required()
 def list_user_fights():
-    """Lista as lutas do personagem do usuário autenticado"""
+    """
+    Histórico de lutas de todos os personagens do usuário, da mais recente
+    para a mais antiga, paginado por cursor.
+
+    Parâmetros de query: limit, cursor, character_id, status, since e until
+    (datas ISO 8601 sobre created_at; until é exclusivo). O cursor da próxima
+    página vem no cabeçalho X-Next-Cursor (ausente na última página).
+    """
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
+        if not user_cache.exists(user_id):
             return jsonify({'message': 'user_not_found'}), 404
         
-        character = Character.query.filter_by(user_id=user_id).first()
+        args = request.args
+        try:
+            limit = parse_limit(args.get('limit'))
+            cursor = decode_cursor(args.get('cursor'))
+            before_id = int(cursor['id']) if cursor else None
+        except (ValueError, TypeError, KeyError):
+            return jsonify({'message': 'invalid_pagination'}), 400
         
-        if not character:
+        try:
+            conditions = _time_range(args)
+        except ValueError:
+            return jsonify({'message': 'invalid_date'}), 400
+        
+        status = args.get('status')
+        if status is not None and status not in FIGHT_STATUSES:
+            return jsonify({'message': 'invalid_status'}), 400
+        
+        character_id = args.get('character_id')
+        if character_id:
+            try:
+                character_id = int(character_id)
+            except ValueError:
+                return jsonify({'message': 'invalid_character_id'}), 400
+        else:
+            character_id = None
+        
+        if not db.session.query(Character.id).filter_by(user_id=user_id).first():
             return jsonify({
                 'message': 'character_not_exist',
                 'error_detail': 'Luta pertence a personagens, então primeiro crie um personagem'
             }), 400
         
-        fights = Fight.query.filter_by(character_id=character.id).all()
+        query = (
+            Fight.query.join(Character, Fight.character_id == Character.id)
+            .filter(Character.user_id == user_id, *conditions)
+        )
+        if status is not None:
+            query = query.filter(Fight.status == status)
+        if character_id is not None:
+            query = query.filter(Fight.character_id == character_id)
         
-        return jsonify({
+        fights, last_id = keyset_page(query, Fight.id, before_id, limit, descending=True)
+        
+        response = jsonify({
             'message': 'fights_list',
-            'data': [fight.to_dict() for fight in fights]
-        }), 200
+            'data': SERIALIZERS[Fight].many(fights)
+        })
+        if last_id is not None:
+            response.headers['X-Next-Cursor'] = encode_cursor({'id': last_id})
+        return response, 200
         
     except Exception as e:
         return jsonify({'message': 'error_retrieving_fights'}), 500
 
+@fights_bp.route('/stats', methods=['GET'])
+@jwt_required()
+def fight_stats():
+    """
+    Vitórias, derrotas, empates e experiência total/média por personagem do
+    usuário, calculadas no banco com um único GROUP BY. Aceita since e until.
+    """
+    try:
+        user_id = get_jwt_identity()
+        
+        try:
+            conditions = _time_range(request.args)
+        except ValueError:
+            return jsonify({'message': 'invalid_date'}), 400
+        
+        def _count(status):
+            return func.coalesce(func.sum(case((Fight.status == status, 1), else_=0)), 0)
+        
+        # LEFT JOIN: personagens sem lutas no período aparecem zerados
+        rows = db.session.execute(
+            select(
+                Character.id,
+                Character.name,
+                func.count(Fight.id).label('fights'),
+                _count('won').label('won'),
+                _count('lost').label('lost'),
+                _count('draw').label('draw'),
+                func.coalesce(func.sum(Fight.experience), 0).label('total_experience'),
+                func.avg(Fight.experience).label('average_experience'),
+            )
+            .outerjoin(Fight, and_(Fight.character_id == Character.id, *conditions))
+            .where(Character.user_id == user_id)
+            .group_by(Character.id, Character.name)
+            .order_by(Character.id)
+        ).all()
+        
+        characters = [
+            {
+                'character_id': row.id,
+                'name': row.name,
+                'fights': row.fights,
+                'won': row.won,
+                'lost': row.lost,
+                'draw': row.draw,
+                'total_experience': row.total_experience,
+                'average_experience': round(float(row.average_experience), 2)
+                if row.average_experience is not None else None,
+            }
+            for row in rows
+        ]
+        
+        totals = {key: sum(row[key] for row in characters)
+                  for key in ('fights', 'won', 'lost', 'draw', 'total_experience')}
+        totals['average_experience'] = (
+            round(totals['total_experience'] / totals['fights'], 2) if totals['fights'] else None
+        )
+        
+        return jsonify({
+            'message': 'fight_stats',
+            'data': {'characters': characters, 'totals': totals}
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': 'error_retrieving_fight_stats'}), 500
+
 @fights_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_fight():
     """Cria uma nova luta para o personagem do usuário"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
+        if not user_cache.exists(user_id):
             return jsonify({'message': 'user_not_found'}), 404
         
         character = Character.query.filter_by(user_id=user_id).first()
@@ -77,28 +215,29 @@ def create_fight():
         if opponent.id == character.id:
             return jsonify({'message': 'cannot_fight_yourself'}), 400
         
-        # Simular resultado da luta
-        # Em um jogo real, isso seria baseado em estatísticas dos personagens
-        fight_outcomes = ['won', 'lost', 'draw']
-        status = random.choice(fight_outcomes)
+        # Resolver a luta pelos atributos, PV/PE e perícias dos dois personagens
+        skills = {character.id: [], opponent.id: []}
+        for skill in Skill.query.filter(Skill.character_id.in_(list(skills))).all():
+            skills[skill.character_id].append(skill)
         
-        # Calcular experiência baseada no resultado
-        if status == 'won':
-            experience = random.randint(50, 100)
-        elif status == 'lost':
-            experience = random.randint(10, 30)
-        else:  # draw
-            experience = random.randint(20, 40)
+        first = combat.fighter_from_character(character, skills[character.id])
+        second = combat.fighter_from_character(opponent, skills[opponent.id])
+        seed = combat.new_seed()
+        result = combat.resolve(first, second, seed)
         
         # Criar luta
         fight = Fight(
             character_id=character.id,
             opponent_id=opponent.id,
-            status=status,
-            experience=experience
+            status=result.status,
+            experience=result.experience,
+            seed=seed,
+            rounds=result.rounds,
+            combat_log=combat.dump_log(first, second, result)
         )
         
         db.session.add(fight)
+        leaderboard.record_fights([(character.id, fight.experience)])
         db.session.commit()
         
         return jsonify({
@@ -109,3 +248,42 @@ def create_fight():
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'error_creating_fight'}), 500
+
+@fights_bp.route('/<int:fight_id>/replay', methods=['GET'])
+@jwt_required()
+def replay_fight(fight_id):
+    """Refaz uma luta a partir da semente gravada e retorna o log rodada a rodada"""
+    try:
+        user_id = get_jwt_identity()
+        
+        fight = (
+            Fight.query.join(Character, Fight.character_id == Character.id)
+            .filter(Fight.id == fight_id, Character.user_id == user_id)
+            .first()
+        )
+        
+        if not fight:
+            return jsonify({'message': 'fight_not_found'}), 404
+        
+        if fight.seed is None or not fight.combat_log:
+            return jsonify({'message': 'fight_not_replayable'}), 409
+        
+        try:
+            result, fighters = combat.replay(fight.seed, fight.combat_log)
+        except ValueError as e:
+            return jsonify({'message': 'fight_not_replayable', 'error': str(e)}), 409
+        
+        recorded = (fight.status, fight.experience, fight.rounds)
+        
+        return jsonify({
+            'message': 'fight_replay',
+            'data': {
+                **fight.to_dict(),
+                'fighters': [fighter._asdict() for fighter in fighters],
+                'log': result.log,
+                'matches': (result.status, result.experience, result.rounds) == recorded
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': 'error_retrieving_fight', 'error': str(e)}), 500
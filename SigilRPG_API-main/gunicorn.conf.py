@@ -0,0 +1,38 @@
+"""
+Configuração do gunicorn para produção: gunicorn -c gunicorn.conf.py wsgi:app
+
+Os valores vêm de ProductionConfig (config.py) e podem ser ajustados pelas
+variáveis de ambiente SERVER_*:
+- SERVER_WORKERS processos (padrão: um por núcleo) com SERVER_THREADS
+  threads cada (worker gthread). Os processos distribuem o código Python
+  entre os núcleos; as threads cobrem a espera por banco e rede.
+- SERVER_KEEPALIVE: segundos que uma conexão ociosa fica aberta entre
+  requisições.
+- SERVER_BACKLOG: conexões na fila do socket. SERVER_MAX_CONNECTIONS:
+  conexões simultâneas por processo. Acima desses limites, os clientes
+  esperam (ou são recusados) em vez de acumular requisições nos workers.
+- kill -HUP <pid do master>: recarrega o código e a configuração sem perder
+  requisições. Workers novos sobem e os antigos terminam as requisições em
+  andamento (até SERVER_GRACEFUL_TIMEOUT segundos).
+"""
+
+import os
+import sys
+
+api_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, api_path)
+
+from config import ProductionConfig as settings
+
+chdir = api_path
+bind = settings.SERVER_BIND
+workers = settings.SERVER_WORKERS
+worker_class = 'gthread'
+threads = settings.SERVER_THREADS
+keepalive = settings.SERVER_KEEPALIVE
+backlog = settings.SERVER_BACKLOG
+worker_connections = settings.SERVER_MAX_CONNECTIONS
+timeout = settings.SERVER_TIMEOUT
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+# Sem preload: cada worker cria a própria app e conexões depois do fork, e o HUP recarrega o código
+preload_app = False
@@ -0,0 +1,84 @@
+"""
+GET condicional (ETag / Last-Modified) baseado nas colunas updated_at
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, request
+from sqlalchemy import func
+
+from models import db
+
+
+def make_etag(*parts):
+    """Gera um ETag forte a partir das partes da impressão digital"""
+    raw = '|'.join(
+        '' if part is None else part.isoformat() if isinstance(part, datetime) else str(part)
+        for part in parts
+    )
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _as_http_date(value):
+    """updated_at é gravado em UTC sem fuso; HTTP usa resolução de segundos"""
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def _is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return _as_http_date(last_modified) <= request.if_modified_since
+    return False
+
+
+def conditional_get(fingerprint):
+    """
+    Decorator de GET condicional.
+
+    fingerprint(**view_args) retorna (partes, last_modified) a partir de uma
+    consulta barata (ou None quando o recurso não existe, deixando a view
+    responder). last_modified é None para coleções: remover um item não
+    avança nenhum updated_at, então só o ETag (que inclui a contagem) as
+    valida e a resposta não leva Last-Modified. Se o cliente já tem a versão atual a resposta é 304 sem
+    chamar a view, ou seja, sem carregar nem serializar nada. Deve ser o
+    decorator mais interno, abaixo das verificações de autenticação/posse.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            result = fingerprint(**kwargs)
+            if result is None:
+                return view(*args, **kwargs)
+
+            parts, last_modified = result
+            etag = make_etag(*parts)
+
+            if _is_not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = _as_http_date(last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def collection_fingerprint(model, *filters):
+    """
+    (max(updated_at), count, max(id)) das linhas filtradas, em uma consulta;
+    sem Last-Modified (ver conditional_get)
+    """
+    last_modified, count, max_id = db.session.query(
+        func.max(model.updated_at), func.count(model.id), func.max(model.id)
+    ).filter(*filters).one()
+    return (model.__tablename__, last_modified, count, max_id), None
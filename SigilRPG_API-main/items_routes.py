@@ -2,9 +2,15 @@
 Rotas para itens de personagem
 """
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User, Character, Item
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, g
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.orm import aliased
+from models import db, Item, CampaignCharacter
+from ownership import owned_character
+from http_cache import conditional_get, collection_fingerprint
 
 items_bp = Blueprint('items', __name__)
 
@@ -42,23 +48,11 @@ def _safe_float(value, default=None):
 
 @items_bp.route('/<int:character_id>/items', methods=['GET'])
 @jwt_required()
+@owned_character()
+@conditional_get(lambda character_id: collection_fingerprint(Item, Item.character_id == character_id))
 def list_items(character_id):
     """Lista todos os itens de um personagem"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
         items = Item.query.filter_by(character_id=character_id).all()
         
         return jsonify({
@@ -71,25 +65,11 @@ def list_items(character_id):
 
 @items_bp.route('/<int:character_id>/items/<int:item_id>', methods=['GET'])
 @jwt_required()
+@owned_character(Item, 'item_id', 'item_not_found')
 def show_item(character_id, item_id):
     """Mostra um item específico"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        item = Item.query.filter_by(
-            id=item_id,
-            character_id=character_id
-        ).first()
-        
-        if not item:
-            return jsonify({'message': 'item_not_found'}), 404
+        item = g.child
         
         return jsonify({
             'message': 'item',
@@ -101,23 +81,10 @@ def show_item(character_id, item_id):
 
 @items_bp.route('/<int:character_id>/items', methods=['POST'])
 @jwt_required()
+@owned_character()
 def create_item(character_id):
     """Cria um novo item"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
         data = request.get_json()
         
         if not data or not data.get('name'):
@@ -146,25 +113,11 @@ def create_item(character_id):
 
 @items_bp.route('/<int:character_id>/items/<int:item_id>', methods=['PATCH'])
 @jwt_required()
+@owned_character(Item, 'item_id', 'item_not_found')
 def update_item(character_id, item_id):
     """Atualiza um item"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        item = Item.query.filter_by(
-            id=item_id,
-            character_id=character_id
-        ).first()
-        
-        if not item:
-            return jsonify({'message': 'item_not_found'}), 404
+        item = g.child
         
         data = request.get_json()
         
@@ -195,25 +148,11 @@ def update_item(character_id, item_id):
 
 @items_bp.route('/<int:character_id>/items/<int:item_id>', methods=['DELETE'])
 @jwt_required()
+@owned_character(Item, 'item_id', 'item_not_found')
 def delete_item(character_id, item_id):
     """Deleta um item"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        item = Item.query.filter_by(
-            id=item_id,
-            character_id=character_id
-        ).first()
-        
-        if not item:
-            return jsonify({'message': 'item_not_found'}), 404
+        item = g.child
         
         db.session.delete(item)
         db.session.commit()
@@ -224,3 +163,175 @@ def delete_item(character_id, item_id):
         db.session.rollback()
         return jsonify({'message': 'error_deleting_item', 'error': str(e)}), 500
 
+class _OperationError(Exception):
+    """Falha em uma operação do lote; desfaz a transação inteira"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+def _quantity_update(item_id, character_id, delta, now):
+    """UPDATE atômico de quantidade que não deixa o estoque ficar negativo"""
+    result = db.session.execute(
+        update(Item)
+        .where(
+            Item.id == item_id,
+            Item.character_id == character_id,
+            Item.quantity + delta >= 0,
+        )
+        .values(quantity=Item.quantity + delta, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+def _op_add(character_id, op, now):
+    if not isinstance(op.get('name'), str) or not op['name'].strip():
+        raise _OperationError('invalid_data')
+    quantity = _safe_int(op.get('quantity'), 1)
+    if quantity is None or quantity < 0:
+        raise _OperationError('invalid_quantity')
+    description = op.get('description')
+    db.session.execute(
+        insert(Item).values(
+            character_id=character_id,
+            name=op['name'].strip(),
+            category=(op.get('category') or 'equipamento').strip(),
+            weight=_safe_float(op.get('weight'), 0.0),
+            description=description.strip() if description else None,
+            quantity=quantity,
+            created_at=now,
+            updated_at=now,
+        )
+    )
+
+def _op_adjust(character_id, op, now):
+    item_id = _safe_int(op.get('item_id'))
+    delta = _safe_int(op.get('delta'))
+    if item_id is None or delta is None:
+        raise _OperationError('invalid_data')
+    if not _quantity_update(item_id, character_id, delta, now):
+        raise _OperationError('item_not_found_or_insufficient_quantity', 409)
+
+def _op_delete(character_id, op, now):
+    item_id = _safe_int(op.get('item_id'))
+    if item_id is None:
+        raise _OperationError('invalid_data')
+    result = db.session.execute(
+        delete(Item)
+        .where(Item.id == item_id, Item.character_id == character_id)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        raise _OperationError('item_not_found', 404)
+
+def _shares_campaign(character_id, other_id):
+    """Verifica se os dois personagens participam de alguma campanha em comum"""
+    other = aliased(CampaignCharacter)
+    return db.session.execute(
+        select(CampaignCharacter.id)
+        .join(other, other.campaign_id == CampaignCharacter.campaign_id)
+        .where(CampaignCharacter.character_id == character_id, other.character_id == other_id)
+        .limit(1)
+    ).first() is not None
+
+def _op_transfer(character_id, op, now):
+    item_id = _safe_int(op.get('item_id'))
+    target_id = _safe_int(op.get('to_character_id'))
+    quantity = _safe_int(op.get('quantity'))
+    if item_id is None or target_id is None or quantity is None or quantity < 1:
+        raise _OperationError('invalid_data')
+    if target_id == character_id:
+        raise _OperationError('cannot_transfer_to_self')
+    if not _shares_campaign(character_id, target_id):
+        raise _OperationError('character_not_in_same_campaign', 409)
+
+    source = db.session.execute(
+        select(Item.name, Item.category, Item.weight, Item.description)
+        .where(Item.id == item_id, Item.character_id == character_id)
+    ).first()
+    if source is None:
+        raise _OperationError('item_not_found', 404)
+    if not _quantity_update(item_id, character_id, -quantity, now):
+        raise _OperationError('insufficient_quantity', 409)
+
+    # Empilha no item equivalente do destino ou cria um novo
+    target_item = (
+        select(func.min(Item.id))
+        .where(
+            Item.character_id == target_id,
+            Item.name == source.name,
+            Item.category == source.category,
+        )
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(Item)
+        .where(Item.id == target_item)
+        .values(quantity=Item.quantity + quantity, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        db.session.execute(
+            insert(Item).values(
+                character_id=target_id,
+                name=source.name,
+                category=source.category,
+                weight=source.weight,
+                description=source.description,
+                quantity=quantity,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+
+_INVENTORY_OPERATIONS = {
+    'add': _op_add,
+    'adjust': _op_adjust,
+    'delete': _op_delete,
+    'transfer': _op_transfer,
+}
+
+@items_bp.route('/<int:character_id>/items/batch', methods=['POST'])
+@jwt_required()
+@owned_character()
+def batch_items(character_id):
+    """
+    Executa uma lista de operações de inventário em uma única transação.
+
+    Operações: add, adjust (delta de quantidade), delete e transfer (N
+    unidades para outro personagem da mesma campanha). Quantidades são
+    alteradas com UPDATE ... SET quantity = quantity + ? sem carregar os
+    itens; se qualquer operação falhar, nada é aplicado.
+    """
+    data = request.get_json()
+    operations = data.get('operations') if isinstance(data, dict) else None
+
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'message': 'invalid_data', 'error': 'operations must be a non-empty list'}), 400
+
+    now = datetime.utcnow()
+    index = None
+
+    try:
+        for index, op in enumerate(operations):
+            handler = _INVENTORY_OPERATIONS.get(op.get('op')) if isinstance(op, dict) else None
+            if handler is None:
+                raise _OperationError('invalid_operation')
+            handler(character_id, op, now)
+
+        db.session.commit()
+
+    except _OperationError as e:
+        db.session.rollback()
+        return jsonify({'message': e.message, 'operation_index': index}), e.status
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'error_processing_items', 'error': str(e), 'operation_index': index}), 500
+
+    items = Item.query.filter_by(character_id=character_id).order_by(Item.id).all()
+
+    return jsonify({
+        'message': 'items_updated',
+        'data': [item.to_dict() for item in items]
+    }), 200
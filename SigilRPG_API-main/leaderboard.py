@@ -0,0 +1,159 @@
+"""
+Ranking de experiência a partir da tabela materializada character_experience
+
+As rotas que gravam lutas chamam record_fights antes do commit, então os
+totais mudam na mesma transação que as lutas. rebuild recalcula a tabela
+inteira a partir de fights (backfill ou correção).
+
+A leitura é paginada por cursor em (total_experience, character_id), ambos
+decrescentes, percorrendo o índice ix_character_experience_total: cada
+página custa O(tamanho da página), independente do tamanho de fights.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import and_, bindparam, delete, func, insert, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, Character, CharacterExperience, CampaignCharacter, Fight
+
+_UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def _deltas(fights):
+    totals = defaultdict(lambda: [0, 0])
+    for character_id, experience in fights:
+        totals[character_id][0] += experience or 0
+        totals[character_id][1] += 1
+    return totals
+
+
+def record_fights(fights):
+    """
+    Soma lutas novas aos totais, na sessão atual (sem commit).
+    fights: iterável de (character_id, experience).
+    """
+    totals = _deltas(fights)
+    if not totals:
+        return
+
+    now = datetime.utcnow()
+    rows = [
+        {'character_id': character_id, 'total_experience': experience, 'fights': count, 'updated_at': now}
+        for character_id, (experience, count) in totals.items()
+    ]
+    table = CharacterExperience.__table__
+    dialect_insert = _UPSERT_DIALECTS.get(db.session.get_bind().dialect.name)
+
+    if dialect_insert is not None:
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.character_id],
+            set_={
+                'total_experience': table.c.total_experience + statement.excluded.total_experience,
+                'fights': table.c.fights + statement.excluded.fights,
+                'updated_at': statement.excluded.updated_at,
+            },
+        )
+        db.session.execute(statement, rows)
+        return
+
+    # Outros bancos: atualiza quem já tem linha e insere o restante
+    existing = set(db.session.scalars(
+        select(table.c.character_id).where(table.c.character_id.in_(list(totals)))
+    ))
+    updates = [
+        {'b_id': row['character_id'], 'b_total': row['total_experience'],
+         'b_fights': row['fights'], 'b_now': now}
+        for row in rows if row['character_id'] in existing
+    ]
+    if updates:
+        db.session.execute(
+            update(table)
+            .where(table.c.character_id == bindparam('b_id'))
+            .values(total_experience=table.c.total_experience + bindparam('b_total'),
+                    fights=table.c.fights + bindparam('b_fights'),
+                    updated_at=bindparam('b_now')),
+            updates,
+        )
+    missing = [row for row in rows if row['character_id'] not in existing]
+    if missing:
+        db.session.execute(insert(table), missing)
+
+
+def rebuild():
+    """Recalcula todos os totais a partir de fights (sem commit); retorna quantos personagens"""
+    table = CharacterExperience.__table__
+    db.session.execute(delete(table))
+    aggregate = (
+        select(
+            Fight.character_id,
+            func.coalesce(func.sum(Fight.experience), 0),
+            func.count(Fight.id),
+            literal(datetime.utcnow(), CharacterExperience.updated_at.type),
+        )
+        .join(Character, Character.id == Fight.character_id)
+        .group_by(Fight.character_id)
+    )
+    db.session.execute(
+        insert(table).from_select(['character_id', 'total_experience', 'fights', 'updated_at'], aggregate)
+    )
+    return db.session.scalar(select(func.count()).select_from(table))
+
+
+def page(limit, after=None, campaign_id=None, include_inactive=False):
+    """
+    Uma página do ranking: (entradas, cursor da próxima página ou None).
+
+    after é o cursor decodificado da página anterior: {'total', 'id', 'rank'}.
+    Com campaign_id, só entram os personagens da campanha.
+    """
+    query = (
+        select(
+            CharacterExperience.character_id,
+            CharacterExperience.total_experience,
+            CharacterExperience.fights,
+            Character.name,
+            Character.user_id,
+        )
+        .join(Character, Character.id == CharacterExperience.character_id)
+    )
+    if campaign_id is not None:
+        query = query.join(
+            CampaignCharacter,
+            and_(CampaignCharacter.character_id == CharacterExperience.character_id,
+                 CampaignCharacter.campaign_id == campaign_id),
+        )
+        if not include_inactive:
+            query = query.where(CampaignCharacter.is_active.is_(True))
+
+    rank = 0
+    if after is not None:
+        total, character_id, rank = int(after['total']), int(after['id']), int(after['rank'])
+        query = query.where(or_(
+            CharacterExperience.total_experience < total,
+            and_(CharacterExperience.total_experience == total,
+                 CharacterExperience.character_id < character_id),
+        ))
+
+    query = query.order_by(
+        CharacterExperience.total_experience.desc(), CharacterExperience.character_id.desc()
+    ).limit(limit + 1)
+    rows = db.session.execute(query).all()
+
+    entries = [
+        {
+            'rank': rank + position,
+            'character_id': row.character_id,
+            'name': row.name,
+            'user_id': row.user_id,
+            'total_experience': row.total_experience,
+            'fights': row.fights,
+        }
+        for position, row in enumerate(rows[:limit], start=1)
+    ]
+    if len(rows) > limit:
+        last = entries[-1]
+        return entries, {'total': last['total_experience'], 'id': last['character_id'], 'rank': last['rank']}
+    return entries, None
@@ -0,0 +1,29 @@
+"""
+Rotas do ranking global de experiência
+"""
+
+from flask import Blueprint, request, jsonify
+
+import leaderboard
+from pagination import parse_limit, decode_cursor, encode_cursor
+
+leaderboard_bp = Blueprint('leaderboard', __name__)
+
+
+@leaderboard_bp.route('/', methods=['GET'])
+def global_leaderboard():
+    """
+    Ranking global por experiência total, paginado por cursor (limit, cursor).
+    O cursor da próxima página vem no cabeçalho X-Next-Cursor.
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        after = decode_cursor(request.args.get('cursor'))
+        entries, next_cursor = leaderboard.page(limit, after)
+    except (ValueError, TypeError, KeyError):
+        return jsonify({'message': 'invalid_pagination'}), 400
+
+    response = jsonify({'message': 'leaderboard', 'data': entries})
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = encode_cursor(next_cursor)
+    return response, 200
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Script de migração para o replay de lutas (fights.seed, fights.rounds, fights.combat_log)
+
+Lutas antigas ficam com as colunas NULL e não podem ser reproduzidas.
+"""
+import sqlite3
+import os
+import sys
+
+COLUMNS = [
+    ('seed', 'INTEGER'),
+    ('rounds', 'INTEGER'),
+    ('combat_log', 'TEXT'),
+]
+
+
+def _default_db_path():
+    db_path = os.path.join(os.path.dirname(__file__), 'instance', 'rpg.db')
+    if not os.path.exists(db_path):
+        db_path = os.path.join(os.path.dirname(__file__), 'rpg.db')
+    return db_path
+
+
+def migrate_database(db_path=None):
+    """Adiciona as colunas de replay à tabela fights"""
+    db_path = db_path or _default_db_path()
+
+    if not os.path.exists(db_path):
+        print(f"[ERRO] Banco de dados nao encontrado em: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(fights)")
+        existing = [column[1] for column in cursor.fetchall()]
+
+        changes_made = False
+        for name, column_type in COLUMNS:
+            if name not in existing:
+                print(f"[+] Adicionando coluna {name}...")
+                cursor.execute(f"ALTER TABLE fights ADD COLUMN {name} {column_type}")
+                changes_made = True
+
+        conn.commit()
+        conn.close()
+
+        if changes_made:
+            print("[OK] Migracao concluida com sucesso!")
+        else:
+            print("[OK] Todas as colunas ja existem")
+        return True
+
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate_database(sys.argv[1] if len(sys.argv) > 1 else None)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Script de migração para criar os índices de chaves estrangeiras e de busca
+declarados em models.py
+"""
+import sqlite3
+import os
+import sys
+
+# (nome do índice, tabela, colunas) - mantenha em sincronia com models.py
+INDEXES = [
+    ('ix_characters_user_id', 'characters', ('user_id',)),
+    ('ix_skills_character_id_id', 'skills', ('character_id', 'id')),
+    ('ix_rituals_character_id_id', 'rituals', ('character_id', 'id')),
+    ('ix_items_character_id_id', 'items', ('character_id', 'id')),
+    ('ix_fights_character_id', 'fights', ('character_id',)),
+    ('ix_fights_opponent_id', 'fights', ('opponent_id',)),
+    ('ix_parties_campaign_id', 'parties', ('campaign_id',)),
+    ('ix_campaign_characters_character_id', 'campaign_characters', ('character_id',)),
+    ('ix_party_members_character_id', 'party_members', ('character_id',)),
+]
+
+
+def _default_db_path():
+    db_path = os.path.join(os.path.dirname(__file__), 'instance', 'rpg.db')
+    if not os.path.exists(db_path):
+        db_path = os.path.join(os.path.dirname(__file__), 'rpg.db')
+    return db_path
+
+
+def apply_indexes(conn):
+    """Cria os índices que ainda não existem; retorna quantos foram criados"""
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    created = 0
+    for name, table, columns in INDEXES:
+        if table not in tables:
+            print(f"[!] Tabela {table} nao existe, pulando {name}")
+            continue
+        if name in existing:
+            continue
+        print(f"[+] Criando indice {name}...")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+        created += 1
+
+    # Atualiza as estatísticas usadas pelo planejador de consultas
+    cursor.execute("ANALYZE")
+    conn.commit()
+    return created
+
+
+def migrate_database(db_path=None):
+    """Adiciona os índices ao banco SQLite da API"""
+    db_path = db_path or _default_db_path()
+
+    if not os.path.exists(db_path):
+        print(f"[ERRO] Banco de dados nao encontrado em: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        created = apply_indexes(conn)
+        conn.close()
+
+        if created:
+            print(f"[OK] {created} indices criados")
+        else:
+            print("[OK] Todos os indices ja existem")
+        print("[OK] Migracao concluida com sucesso!")
+        return True
+
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate_database(sys.argv[1] if len(sys.argv) > 1 else None)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Script de migração para o ranking de experiência (tabela character_experience)
+
+Cria a tabela materializada e o índice do ranking e preenche os totais a
+partir das lutas existentes. Para recalcular depois, use
+scripts/utils/rebuild_leaderboard.py.
+"""
+import sqlite3
+import os
+import sys
+from datetime import datetime
+
+
+def _default_db_path():
+    db_path = os.path.join(os.path.dirname(__file__), 'instance', 'rpg.db')
+    if not os.path.exists(db_path):
+        db_path = os.path.join(os.path.dirname(__file__), 'rpg.db')
+    return db_path
+
+
+def migrate_database(db_path=None):
+    """Cria character_experience e faz o backfill a partir de fights"""
+    db_path = db_path or _default_db_path()
+
+    if not os.path.exists(db_path):
+        print(f"[ERRO] Banco de dados nao encontrado em: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS character_experience (
+                character_id INTEGER NOT NULL PRIMARY KEY REFERENCES characters (id),
+                total_experience INTEGER NOT NULL,
+                fights INTEGER NOT NULL,
+                updated_at DATETIME
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_character_experience_total "
+            "ON character_experience (total_experience, character_id)"
+        )
+
+        cursor.execute("DELETE FROM character_experience")
+        cursor.execute("""
+            INSERT INTO character_experience (character_id, total_experience, fights, updated_at)
+            SELECT fights.character_id, COALESCE(SUM(fights.experience), 0), COUNT(fights.id), ?
+            FROM fights JOIN characters ON characters.id = fights.character_id
+            GROUP BY fights.character_id
+        """, (datetime.utcnow().isoformat(sep=' '),))
+        filled = cursor.rowcount
+
+        conn.commit()
+        conn.close()
+
+        print(f"[OK] Totais de {filled} personagens calculados")
+        print("[OK] Migracao concluida com sucesso!")
+        return True
+
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate_database(sys.argv[1] if len(sys.argv) > 1 else None)
+    sys.exit(0 if success else 1)
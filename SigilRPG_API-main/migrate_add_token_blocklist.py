@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Script de migração para a revogação de tokens (tabela revoked_tokens)
+
+Cria a tabela consultada pelo logout (DELETE /api/auth/) e pelo
+token_in_blocklist_loader, com índice em expires_at para a limpeza.
+"""
+import sqlite3
+import os
+import sys
+
+
+def _default_db_path():
+    db_path = os.path.join(os.path.dirname(__file__), 'instance', 'rpg.db')
+    if not os.path.exists(db_path):
+        db_path = os.path.join(os.path.dirname(__file__), 'rpg.db')
+    return db_path
+
+
+def _create_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            jti VARCHAR(64) NOT NULL UNIQUE,
+            user_id INTEGER,
+            expires_at DATETIME NOT NULL,
+            revoked_at DATETIME
+        )
+    """)
+
+
+def migrate_database(db_path=None):
+    """Cria revoked_tokens e os índices"""
+    db_path = db_path or _default_db_path()
+
+    if not os.path.exists(db_path):
+        print(f"[ERRO] Banco de dados nao encontrado em: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        # Tabela criada antes do AUTOINCREMENT: recriada para que ids apagados não voltem
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'revoked_tokens'")
+        row = cursor.fetchone()
+        if row is not None and 'AUTOINCREMENT' not in row[0].upper():
+            print("Recriando revoked_tokens com AUTOINCREMENT...")
+            cursor.execute("DROP INDEX IF EXISTS ix_revoked_tokens_expires_at")
+            cursor.execute("ALTER TABLE revoked_tokens RENAME TO revoked_tokens_old")
+            _create_table(cursor)
+            cursor.execute("""
+                INSERT INTO revoked_tokens (id, jti, user_id, expires_at, revoked_at)
+                SELECT id, jti, user_id, expires_at, revoked_at FROM revoked_tokens_old
+            """)
+            cursor.execute("DROP TABLE revoked_tokens_old")
+        else:
+            _create_table(cursor)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)"
+        )
+
+        conn.commit()
+        conn.close()
+
+        print("[OK] Migracao concluida com sucesso!")
+        return True
+
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate_database(sys.argv[1] if len(sys.argv) > 1 else None)
+    sys.exit(0 if success else 1)
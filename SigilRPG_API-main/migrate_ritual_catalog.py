@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Script de migração para o catálogo compartilhado de rituais (ritual_templates)
+
+Cria a tabela do catálogo, adiciona rituals.template_id e move os rituais
+repetidos entre personagens para o catálogo, deixando nas linhas dos
+personagens apenas a referência.
+"""
+import sqlite3
+import os
+import sys
+from datetime import datetime
+
+TEXT_FIELDS = ['execution_time', 'range', 'duration', 'resistance_test', 'description', 'effect']
+KEY_FIELDS = ['name', 'circle', 'cost'] + TEXT_FIELDS
+
+
+def _default_db_path():
+    db_path = os.path.join(os.path.dirname(__file__), 'instance', 'rpg.db')
+    if not os.path.exists(db_path):
+        db_path = os.path.join(os.path.dirname(__file__), 'rpg.db')
+    return db_path
+
+
+def _quoted(fields):
+    # "range" é palavra reservada em alguns bancos; aspas em todas por consistência
+    return ', '.join(f'"{field}"' for field in fields)
+
+
+def migrate_database(db_path=None):
+    """Cria o catálogo e deduplica os rituais existentes"""
+    db_path = db_path or _default_db_path()
+
+    if not os.path.exists(db_path):
+        print(f"[ERRO] Banco de dados nao encontrado em: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ritual_templates (
+                id INTEGER NOT NULL PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                circle INTEGER NOT NULL,
+                cost INTEGER NOT NULL,
+                execution_time VARCHAR(255),
+                "range" VARCHAR(255),
+                duration VARCHAR(255),
+                resistance_test VARCHAR(255),
+                description TEXT,
+                effect TEXT,
+                created_at DATETIME,
+                updated_at DATETIME
+            )
+        """)
+
+        cursor.execute("PRAGMA table_info(rituals)")
+        columns = [column[1] for column in cursor.fetchall()]
+        if 'template_id' not in columns:
+            print("[+] Adicionando coluna template_id...")
+            cursor.execute(
+                "ALTER TABLE rituals ADD COLUMN template_id INTEGER REFERENCES ritual_templates (id)"
+            )
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_rituals_template_id ON rituals (template_id)")
+
+        # Grupos de rituais idênticos presentes em mais de um personagem
+        cursor.execute(f"""
+            SELECT {_quoted(KEY_FIELDS)}, COUNT(*)
+            FROM rituals
+            WHERE template_id IS NULL
+            GROUP BY {_quoted(KEY_FIELDS)}
+            HAVING COUNT(*) > 1
+        """)
+        groups = cursor.fetchall()
+
+        now = datetime.utcnow().isoformat(sep=' ')
+        cleared = ', '.join(f'"{field}" = NULL' for field in TEXT_FIELDS)
+        # IS compara NULL com NULL como igual no SQLite
+        where = ' AND '.join(f'"{field}" IS ?' for field in KEY_FIELDS)
+        moved = 0
+        for group in groups:
+            values = group[:len(KEY_FIELDS)]
+            cursor.execute(
+                f"INSERT INTO ritual_templates ({_quoted(KEY_FIELDS)}, created_at, updated_at) "
+                f"VALUES ({', '.join('?' for _ in KEY_FIELDS)}, ?, ?)",
+                (*values, now, now),
+            )
+            template_id = cursor.lastrowid
+
+            cursor.execute(
+                f"UPDATE rituals SET template_id = ?, {cleared} WHERE template_id IS NULL AND {where}",
+                (template_id, *values),
+            )
+            moved += cursor.rowcount
+
+        conn.commit()
+        conn.close()
+
+        print(f"[OK] {len(groups)} rituais adicionados ao catalogo, {moved} rituais de personagens referenciando-os")
+        print("[OK] Migracao concluida com sucesso! (rode VACUUM para recuperar o espaco em disco)")
+        return True
+
+    except Exception as e:
+        print(f"[ERRO] Erro na migracao: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = migrate_database(sys.argv[1] if len(sys.argv) > 1 else None)
+    sys.exit(0 if success else 1)
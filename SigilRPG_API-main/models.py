@@ -4,11 +4,29 @@ Modelos SQLAlchemy para a API RPG
 
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+
+from passwords import password_hasher
+from serializers import Serializer
 
 # Criar instância do SQLAlchemy
 db = SQLAlchemy()
 
+
+def max_pv(vigor, forca):
+    """PV máximo: 10 + 5*VIG + 2*FOR"""
+    return 10 + (vigor * 5) + (forca * 2)
+
+
+def max_pe(intelecto, presenca):
+    """PE máximo: 6 + 4*INT + 2*PRE"""
+    return 6 + (intelecto * 4) + (presenca * 2)
+
+
+def max_ps(intelecto, presenca):
+    """PS máximo: 8 + 3*INT + 3*PRE"""
+    return 8 + (intelecto * 3) + (presenca * 3)
+
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -25,21 +43,27 @@ class User(db.Model):
     
     def set_password(self, password):
         """Define a senha do usuário"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verifica se a senha está correta"""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
     
     def to_dict(self):
         """Converte o usuário para dicionário"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return SERIALIZERS[User](self)
+
+class RevokedToken(db.Model):
+    """JTI de token revogado no logout; a linha pode ser removida após expires_at"""
+    __tablename__ = 'revoked_tokens'
+    # id nunca é reutilizado (nem após a limpeza): os workers sincronizam por id > último visto
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Character(db.Model):
     __tablename__ = 'characters'
@@ -73,7 +97,7 @@ class Character(db.Model):
     current_pe = db.Column(db.Integer, nullable=True)  # Pontos de Esforço atuais
     current_ps = db.Column(db.Integer, nullable=True)  # Pontos de Sanidade atuais
     
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -94,18 +118,24 @@ class Character(db.Model):
         lazy=True,
         cascade='all, delete-orphan'
     )
+    experience_total = db.relationship(
+        'CharacterExperience',
+        uselist=False,
+        lazy=True,
+        cascade='all, delete-orphan'
+    )
     
     def calculate_max_pv(self):
         """Calcula o PV máximo baseado nos atributos: 10 + 5*VIG + 2*FOR"""
-        return 10 + (self.vigor * 5) + (self.forca * 2)
+        return max_pv(self.vigor, self.forca)
     
     def calculate_max_pe(self):
         """Calcula o PE máximo baseado nos atributos: 6 + 4*INT + 2*PRE"""
-        return 6 + (self.intelecto * 4) + (self.presenca * 2)
+        return max_pe(self.intelecto, self.presenca)
     
     def calculate_max_ps(self):
         """Calcula o PS máximo baseado nos atributos: 8 + 3*INT + 3*PRE"""
-        return 8 + (self.intelecto * 3) + (self.presenca * 3)
+        return max_ps(self.intelecto, self.presenca)
     
     def initialize_combat_stats(self):
         """Inicializa os valores atuais de combate com os valores máximos"""
@@ -118,36 +148,7 @@ class Character(db.Model):
     
     def to_dict(self, include_relationships=False):
         """Converte o personagem para dicionário"""
-        data = {
-            'id': self.id,
-            'name': self.name,
-            'player_name': self.player_name,
-            'age': self.age,
-            'skilled_in': self.skilled_in,
-            'character_class': self.character_class,
-            'nex': self.nex,
-            'avatar_url': self.avatar_url,
-            'agilidade': self.agilidade,
-            'intelecto': self.intelecto,
-            'vigor': self.vigor,
-            'presenca': self.presenca,
-            'forca': self.forca,
-            'gender': self.gender,
-            'appearance': self.appearance,
-            'personality': self.personality,
-            'background': self.background,
-            'objective': self.objective,
-            'origin': self.origin,
-            'user_id': self.user_id,
-            'current_pv': self.current_pv,
-            'current_pe': self.current_pe,
-            'current_ps': self.current_ps,
-            'max_pv': self.calculate_max_pv(),
-            'max_pe': self.calculate_max_pe(),
-            'max_ps': self.calculate_max_ps(),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        data = SERIALIZERS[Character](self)
 
         if include_relationships:
             data['campaigns'] = [
@@ -165,10 +166,14 @@ class Fight(db.Model):
     __tablename__ = 'fights'
     
     id = db.Column(db.Integer, primary_key=True)
-    opponent_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False)
-    character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False)
+    opponent_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False, index=True)
+    character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False, index=True)
     status = db.Column(db.Enum('won', 'lost', 'draw', name='fight_status'), nullable=False)
     experience = db.Column(db.Integer, nullable=False)
+    # Replay do motor de combate (combat.py): semente, rodadas e log compacto
+    seed = db.Column(db.Integer, nullable=True)
+    rounds = db.Column(db.Integer, nullable=True)
+    combat_log = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -177,18 +182,35 @@ class Fight(db.Model):
     
     def to_dict(self):
         """Converte a luta para dicionário"""
-        return {
-            'id': self.id,
-            'opponent_id': self.opponent_id,
-            'character_id': self.character_id,
-            'status': self.status,
-            'experience': self.experience,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return SERIALIZERS[Fight](self)
+
+class CharacterExperience(db.Model):
+    """
+    Totais de experiência por personagem, materializados para o ranking.
+    Atualizados por leaderboard.record_fights na mesma transação que grava
+    as lutas; leaderboard.rebuild recalcula tudo a partir de fights.
+    """
+    __tablename__ = 'character_experience'
+    __table_args__ = (
+        # Ranking: ORDER BY total_experience DESC, character_id DESC percorre o índice
+        db.Index('ix_character_experience_total', 'total_experience', 'character_id'),
+    )
+    
+    character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), primary_key=True)
+    total_experience = db.Column(db.Integer, nullable=False, default=0)
+    fights = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Converte os totais para dicionário"""
+        return SERIALIZERS[CharacterExperience](self)
 
 class Skill(db.Model):
     __tablename__ = 'skills'
+    __table_args__ = (
+        # As rotas /api/me/<id>/skills|items|rituals filtram por (character_id, id)
+        db.Index('ix_skills_character_id_id', 'character_id', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False)
@@ -203,24 +225,43 @@ class Skill(db.Model):
     
     def to_dict(self):
         """Converte a habilidade para dicionário"""
-        return {
-            'id': self.id,
-            'character_id': self.character_id,
-            'name': self.name,
-            'attribute': self.attribute,
-            'bonus_dice': self.bonus_dice,
-            'training': self.training,
-            'others': self.others,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return SERIALIZERS[Skill](self)
+
+class RitualTemplate(db.Model):
+    """Ritual do catálogo compartilhado; os rituais dos personagens o referenciam"""
+    __tablename__ = 'ritual_templates'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), nullable=False)
+    circle = db.Column(db.Integer, nullable=False)
+    cost = db.Column(db.Integer, nullable=False)
+    execution_time = db.Column(db.String(255), nullable=True)
+    range = db.Column(db.String(255), nullable=True)
+    duration = db.Column(db.String(255), nullable=True)
+    resistance_test = db.Column(db.String(255), nullable=True)
+    description = db.Column(db.Text, nullable=True)
+    effect = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Converte o ritual do catálogo para dicionário"""
+        return SERIALIZERS[RitualTemplate](self)
 
 class Ritual(db.Model):
     __tablename__ = 'rituals'
+    __table_args__ = (
+        db.Index('ix_rituals_character_id_id', 'character_id', 'id'),
+    )
+    
+    # Campos de texto herdados do catálogo quando o valor do personagem é NULL
+    TEMPLATE_FIELDS = (
+        'execution_time', 'range', 'duration', 'resistance_test', 'description', 'effect'
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False)
+    template_id = db.Column(db.Integer, db.ForeignKey('ritual_templates.id'), nullable=True, index=True)
     name = db.Column(db.String(255), nullable=False)
     circle = db.Column(db.Integer, nullable=False)  # Círculo do ritual (1-10)
     cost = db.Column(db.Integer, nullable=False)  # Custo em PE
@@ -233,26 +274,33 @@ class Ritual(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        """Converte o ritual para dicionário"""
-        return {
-            'id': self.id,
-            'character_id': self.character_id,
-            'name': self.name,
-            'circle': self.circle,
-            'cost': self.cost,
-            'execution_time': self.execution_time,
-            'range': self.range,
-            'duration': self.duration,
-            'resistance_test': self.resistance_test,
-            'description': self.description,
-            'effect': self.effect,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    template = db.relationship('RitualTemplate', lazy=True)
+    
+    def to_dict(self, template=None):
+        """
+        Converte o ritual para dicionário.
+
+        template é o dicionário do catálogo (ver ritual_catalog.get_templates);
+        se omitido, o relacionamento é carregado quando houver template_id.
+        """
+        if template is None and self.template_id is not None and self.template:
+            template = self.template.to_dict()
+        
+        return merge_ritual_template(SERIALIZERS[Ritual](self), template)
+
+def merge_ritual_template(data, template):
+    """Preenche os campos de texto NULL do ritual serializado com os do catálogo"""
+    if template:
+        for field in Ritual.TEMPLATE_FIELDS:
+            if data[field] is None:
+                data[field] = template[field]
+    return data
 
 class Item(db.Model):
     __tablename__ = 'items'
+    __table_args__ = (
+        db.Index('ix_items_character_id_id', 'character_id', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False)
@@ -266,17 +314,7 @@ class Item(db.Model):
     
     def to_dict(self):
         """Converte o item para dicionário"""
-        return {
-            'id': self.id,
-            'character_id': self.character_id,
-            'name': self.name,
-            'category': self.category,
-            'weight': self.weight,
-            'description': self.description,
-            'quantity': self.quantity,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return SERIALIZERS[Item](self)
 
 
 class Campaign(db.Model):
@@ -310,21 +348,7 @@ class Campaign(db.Model):
     )
 
     def to_dict(self, include_members=False, include_parties=False):
-        data = {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description or '',
-            'system': self.system or 'Sigil RPG',
-            'max_players': self.max_players,
-            'is_active': bool(self.is_active),
-            'is_public': bool(self.is_public),
-            'setting': self.setting or '',
-            'rules': self.rules or '',
-            'notes': self.notes or '',
-            'master_name': self.master_name,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        data = SERIALIZERS[Campaign](self)
 
         if include_members:
             data['members'] = [
@@ -346,7 +370,7 @@ class CampaignCharacter(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     campaign_id = db.Column(db.Integer, db.ForeignKey('campaigns.id'), nullable=False)
-    character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False)
+    character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False, index=True)
     role = db.Column(db.String(100), nullable=True)
     is_active = db.Column(db.Boolean, default=True)
     notes = db.Column(db.Text, nullable=True)
@@ -365,15 +389,7 @@ class CampaignCharacter(db.Model):
         include_character=False,
         include_parties=False
     ):
-        data = {
-            'id': self.id,
-            'campaign_id': self.campaign_id,
-            'character_id': self.character_id,
-            'role': self.role,
-            'is_active': bool(self.is_active),
-            'notes': self.notes,
-            'joined_at': self.joined_at.isoformat() if self.joined_at else None
-        }
+        data = SERIALIZERS[CampaignCharacter](self)
 
         if include_campaign and self.campaign:
             data['campaign'] = self.campaign.to_dict()
@@ -388,7 +404,7 @@ class Party(db.Model):
     __tablename__ = 'parties'
 
     id = db.Column(db.Integer, primary_key=True)
-    campaign_id = db.Column(db.Integer, db.ForeignKey('campaigns.id'), nullable=False)
+    campaign_id = db.Column(db.Integer, db.ForeignKey('campaigns.id'), nullable=False, index=True)
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -402,14 +418,7 @@ class Party(db.Model):
     )
 
     def to_dict(self, include_members=False):
-        data = {
-            'id': self.id,
-            'campaign_id': self.campaign_id,
-            'name': self.name,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        data = SERIALIZERS[Party](self)
 
         if include_members:
             data['members'] = [
@@ -425,7 +434,7 @@ class PartyMember(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     party_id = db.Column(db.Integer, db.ForeignKey('parties.id'), nullable=False)
-    character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False)
+    character_id = db.Column(db.Integer, db.ForeignKey('characters.id'), nullable=False, index=True)
     role = db.Column(db.String(100), nullable=True)
     joined_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -442,13 +451,7 @@ class PartyMember(db.Model):
         include_character=False,
         include_campaign=False
     ):
-        data = {
-            'id': self.id,
-            'party_id': self.party_id,
-            'character_id': self.character_id,
-            'role': self.role,
-            'joined_at': self.joined_at.isoformat() if self.joined_at else None
-        }
+        data = SERIALIZERS[PartyMember](self)
 
         if include_party and self.party:
             data['party'] = self.party.to_dict(include_members=False)
@@ -459,4 +462,44 @@ class PartyMember(db.Model):
         if include_campaign and self.party and self.party.campaign:
             data['campaign'] = self.party.campaign.to_dict()
 
-        return data
\ No newline at end of file
+        return data
+
+# Serializadores compilados uma única vez a partir das colunas de cada modelo;
+# a ordem e o formato dos campos são os mesmos dos to_dict escritos à mão
+SERIALIZERS = {
+    User: Serializer(User, exclude=('password_hash', 'remember_token')),
+    Character: Serializer(
+        Character,
+        fields=(
+            'id', 'name', 'player_name', 'age', 'skilled_in', 'character_class', 'nex',
+            'avatar_url', 'agilidade', 'intelecto', 'vigor', 'presenca', 'forca', 'gender',
+            'appearance', 'personality', 'background', 'objective', 'origin', 'user_id',
+            'current_pv', 'current_pe', 'current_ps', 'max_pv', 'max_pe', 'max_ps',
+            'created_at', 'updated_at',
+        ),
+        computed={
+            'max_pv': (max_pv, ('vigor', 'forca')),
+            'max_pe': (max_pe, ('intelecto', 'presenca')),
+            'max_ps': (max_ps, ('intelecto', 'presenca')),
+        },
+    ),
+    Fight: Serializer(Fight, exclude=('combat_log',)),
+    CharacterExperience: Serializer(CharacterExperience),
+    Skill: Serializer(Skill),
+    RitualTemplate: Serializer(RitualTemplate),
+    Ritual: Serializer(Ritual),
+    Item: Serializer(Item),
+    Campaign: Serializer(
+        Campaign,
+        formats={
+            'description': "{v} or ''",
+            'system': "{v} or 'Sigil RPG'",
+            'setting': "{v} or ''",
+            'rules': "{v} or ''",
+            'notes': "{v} or ''",
+        },
+    ),
+    CampaignCharacter: Serializer(CampaignCharacter),
+    Party: Serializer(Party),
+    PartyMember: Serializer(PartyMember),
+}
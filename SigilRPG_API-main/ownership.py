@@ -0,0 +1,88 @@
+"""
+Resolução de posse usuário -> personagem -> recurso filho para as rotas /api/me
+"""
+
+from functools import wraps
+
+from flask import g, jsonify
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import and_
+
+from models import db, User, Character
+
+# Regra de admin simples: o usuário id=1
+ADMIN_USER_ID = '1'
+
+
+def is_admin():
+    """O usuário do JWT atual é o admin (exige jwt_required)"""
+    return str(get_jwt_identity()) == ADMIN_USER_ID
+
+
+def resolve_ownership(user_id, character_id, child_model=None, child_id=None):
+    """
+    Busca usuário, personagem e (opcionalmente) o recurso filho em uma consulta.
+
+    Usa LEFT JOINs a partir do usuário para que a ausência de cada nível possa
+    ser identificada: retorna (user, character, child), com None em cada nível
+    que não existe ou não pertence ao nível anterior.
+    """
+    entities = [User, Character]
+    if child_model is not None:
+        entities.append(child_model)
+
+    query = db.session.query(*entities).outerjoin(
+        Character,
+        and_(Character.id == character_id, Character.user_id == User.id),
+    )
+    if child_model is not None:
+        query = query.outerjoin(
+            child_model,
+            and_(child_model.id == child_id, child_model.character_id == Character.id),
+        )
+
+    row = query.filter(User.id == user_id).first()
+    if row is None:
+        return None, None, None
+    if child_model is None:
+        return row[0], row[1], None
+    return row[0], row[1], row[2]
+
+
+def owned_character(child_model=None, child_arg=None, child_not_found=None, error_detail=None):
+    """
+    Decorator para rotas com <character_id> (e opcionalmente o id do filho).
+
+    Resolve a posse com resolve_ownership e guarda o resultado em
+    g.current_user, g.character e g.child para o restante da requisição.
+    Deve ser aplicado abaixo de @jwt_required().
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = int(get_jwt_identity())
+            character_id = kwargs['character_id']
+            child_id = kwargs.get(child_arg) if child_arg else None
+
+            user, character, child = resolve_ownership(
+                user_id, character_id, child_model, child_id
+            )
+
+            if user is None:
+                return jsonify({'message': 'user_not_found'}), 404
+            if character is None:
+                body = {'message': 'character_not_found'}
+                if error_detail:
+                    body['error_detail'] = error_detail
+                return jsonify(body), 404
+            if child_model is not None and child is None:
+                return jsonify({'message': child_not_found}), 404
+
+            g.current_user = user
+            g.character = character
+            g.child = child
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,60 @@
+"""
+Utilitários de paginação por cursor (keyset) para as rotas da API
+"""
+
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Converte o parâmetro limit, limitando-o ao intervalo [1, maximum]"""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (ValueError, TypeError):
+        raise ValueError('invalid_limit')
+    if limit < 1:
+        raise ValueError('invalid_limit')
+    return min(limit, maximum)
+
+
+def encode_cursor(values):
+    """Codifica a posição da última linha como um cursor opaco"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decodifica um cursor gerado por encode_cursor; levanta ValueError se inválido"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError('invalid_cursor')
+    if not isinstance(values, dict):
+        raise ValueError('invalid_cursor')
+    return values
+
+
+def keyset_page(query, column, after, limit, descending=False):
+    """
+    Retorna (linhas, último valor) de uma página ordenada por `column`.
+
+    Busca limit + 1 linhas para saber se existe próxima página sem COUNT(*);
+    o último valor é None quando a página atual é a última.
+    """
+    if after is not None:
+        query = query.filter(column < after if descending else column > after)
+    query = query.order_by(column.desc() if descending else column.asc())
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, getattr(rows[-1], column.key)
+    return rows, None
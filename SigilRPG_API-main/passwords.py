@@ -0,0 +1,110 @@
+"""
+Política de hash de senhas e pool limitado de verificação
+
+O algoritmo e o custo vêm de PASSWORD_HASH_METHOD (formato do Werkzeug, ex.:
+pbkdf2:sha256:600000 ou scrypt:32768:8:1). Hashes gravados com outra política
+são refeitos no próximo login bem-sucedido (needs_rehash), tanto para subir
+quanto para baixar o custo.
+
+Hash e verificação rodam em um pool de PASSWORD_HASH_WORKERS threads (o
+hashlib libera o GIL durante o PBKDF2/scrypt), com no máximo
+PASSWORD_HASH_MAX_PENDING pedidos em andamento. Cada pedido prende uma
+thread de requisição até terminar, então o limite também fica abaixo das
+threads por processo do servidor (SERVER_THREADS - 1): uma rajada de logins
+recebe 503 e sempre sobra thread para as demais rotas.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING = 4
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Fila de verificação cheia"""
+
+
+def canonical_method(method):
+    """Completa os parâmetros omitidos para comparar com o prefixo dos hashes gravados"""
+    parts = method.split(':')
+    if parts[0] == 'pbkdf2':
+        digest = parts[1] if len(parts) > 1 else 'sha256'
+        iterations = parts[2] if len(parts) > 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{digest}:{int(iterations)}'
+    if parts[0] == 'scrypt':
+        defaults = ['32768', '8', '1']
+        n, r, p = parts[1:4] + defaults[len(parts) - 1:]
+        return f'scrypt:{int(n)}:{int(r)}:{int(p)}'
+    raise ValueError(f'Método de hash desconhecido: {method}')
+
+
+class PasswordHasher:
+    """
+    Hash/verificação de senhas conforme a política da app.
+
+    Configuração (app.config): PASSWORD_HASH_METHOD, PASSWORD_HASH_WORKERS e
+    PASSWORD_HASH_MAX_PENDING (limitado por SERVER_THREADS - 1, se definido).
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_METHOD
+        self.workers = DEFAULT_WORKERS
+        self.max_pending = DEFAULT_MAX_PENDING
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = canonical_method(app.config.get('PASSWORD_HASH_METHOD') or DEFAULT_METHOD)
+        self.workers = max(1, int(app.config.get('PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)))
+        max_pending = int(app.config.get('PASSWORD_HASH_MAX_PENDING', DEFAULT_MAX_PENDING))
+        request_threads = app.config.get('SERVER_THREADS')
+        if request_threads:
+            max_pending = min(max_pending, int(request_threads) - 1)
+        self.max_pending = max(1, max_pending)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self.shutdown()
+        app.extensions['password_hasher'] = self
+
+    def _pool(self):
+        # Criado sob demanda e recriado após fork (threads não sobrevivem ao fork)
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy('password_hash_queue_full')
+        try:
+            return self._pool().submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True se o hash gravado não usa a política atual"""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,79 @@
+"""
+Pool de processos compartilhado para o trabalho de CPU das rotas (simulação
+de encontros e torneios)
+
+Cada processo da API tem um único ProcessPoolExecutor com
+PROCESS_POOL_WORKERS processos (padrão: um por núcleo). Ele é criado no
+primeiro uso e recriado após fork. Os processos filhos saem de um forkserver
+(spawn onde não houver), nunca de um fork do worker multithread.
+
+No máximo PROCESS_POOL_MAX_JOBS requisições usam o pool ao mesmo tempo. As
+demais recebem ProcessPoolBusy na hora (as rotas respondem 503), em vez de
+enfileirar trabalho até estourar o timeout do servidor.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_MAX_JOBS = 1
+
+
+class ProcessPoolBusy(RuntimeError):
+    """Todas as vagas do pool estão ocupadas"""
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class ProcessPool:
+    """
+    Configuração (app.config): PROCESS_POOL_WORKERS e PROCESS_POOL_MAX_JOBS.
+    """
+
+    def __init__(self, app=None):
+        self.workers = os.cpu_count() or 1
+        self.max_jobs = DEFAULT_MAX_JOBS
+        self._slots = threading.BoundedSemaphore(self.max_jobs)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        workers = max(1, int(app.config.get('PROCESS_POOL_WORKERS') or os.cpu_count() or 1))
+        max_jobs = max(1, int(app.config.get('PROCESS_POOL_MAX_JOBS', DEFAULT_MAX_JOBS)))
+        if (workers, max_jobs) != (self.workers, self.max_jobs):
+            self.workers, self.max_jobs = workers, max_jobs
+            self._slots = threading.BoundedSemaphore(max_jobs)
+            self.shutdown()
+        app.extensions['process_pool'] = self
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_context())
+                self._pid = os.getpid()
+            return self._executor
+
+    def map(self, function, *iterables):
+        """Como Executor.map, mas devolve a lista; ProcessPoolBusy se não houver vaga"""
+        if not self._slots.acquire(blocking=False):
+            raise ProcessPoolBusy('process_pool_busy')
+        try:
+            return list(self._pool().map(function, *iterables))
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+process_pool = ProcessPool()
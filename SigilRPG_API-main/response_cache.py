@@ -0,0 +1,221 @@
+"""
+Cache de respostas GET com invalidação explícita
+
+Backends:
+- memory: LRU limitado em processo (um cache por worker)
+- sqlite: arquivo SQLite local compartilhado pelos workers da máquina, para
+  que a invalidação feita por um worker valha para todos
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+
+class MemoryBackend:
+    """LRU em memória com TTL"""
+
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def size(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """Cache em um arquivo SQLite local; LRU aproximado por último acesso"""
+
+    def __init__(self, path, max_entries=512, ttl=60):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS response_cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS ix_response_cache_accessed_at '
+                'ON response_cache (accessed_at)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            'SELECT value FROM response_cache WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE response_cache SET accessed_at = ? WHERE key = ?', (now, key))
+        return row[0]
+
+    def set(self, key, value):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            'INSERT OR REPLACE INTO response_cache (key, value, expires_at, accessed_at) '
+            'VALUES (?, ?, ?, ?)',
+            (key, value, now + self.ttl, now),
+        )
+        conn.execute(
+            'DELETE FROM response_cache WHERE key IN ('
+            'SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,),
+        )
+
+    def delete_prefix(self, prefix):
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        self._connect().execute(
+            "DELETE FROM response_cache WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',)
+        )
+
+    def size(self):
+        return self._connect().execute('SELECT COUNT(*) FROM response_cache').fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Cache de respostas JSON por namespace.
+
+    Configuração (app.config): RESPONSE_CACHE_BACKEND ('memory', 'sqlite' ou
+    'none'), RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES e
+    RESPONSE_CACHE_PATH (arquivo do backend sqlite).
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        name = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+        max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 512)
+
+        if name == 'memory':
+            self.backend = MemoryBackend(max_entries=max_entries, ttl=ttl)
+        elif name == 'sqlite':
+            path = app.config.get('RESPONSE_CACHE_PATH') or os.path.join(
+                app.instance_path, 'response_cache.db'
+            )
+            self.backend = SQLiteBackend(path, max_entries=max_entries, ttl=ttl)
+        elif name == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f'Backend de cache desconhecido: {name}')
+
+        app.extensions['response_cache'] = self
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def cached(self, namespace):
+        """Decorator: guarda o corpo das respostas 200 sob namespace + URL completa"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return view(*args, **kwargs)
+
+                key = f'{namespace}:{request.full_path}'
+                body = self.backend.get(key)
+                if body is not None:
+                    self._count(True)
+                    return current_app.response_class(body, mimetype='application/json')
+
+                self._count(False)
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and response.mimetype == 'application/json':
+                    self.backend.set(key, response.get_data())
+                return response
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *namespaces):
+        """Remove todas as entradas dos namespaces informados"""
+        if self.backend is None:
+            return
+        for namespace in namespaces:
+            self.backend.delete_prefix(f'{namespace}:')
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        if self.backend is not None:
+            self.backend.delete_prefix('')
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else None,
+            'entries': self.backend.size() if self.backend else 0,
+            'pid': os.getpid(),
+        }
+
+
+response_cache = ResponseCache()
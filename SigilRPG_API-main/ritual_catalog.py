@@ -0,0 +1,78 @@
+"""
+Cache em processo do catálogo compartilhado de rituais
+
+Cada entrada guarda o updated_at do ritual. Quem já leu do banco uma versão
+do catálogo (o fingerprint do GET condicional) passa esse updated_at em
+get_templates e as entradas mais antigas são buscadas de novo; assim um
+worker não serve o corpo antigo sob o ETag novo quando outro worker editou o
+catálogo. Sem esse limite vale só o TTL.
+"""
+
+import threading
+import time
+
+from models import RitualTemplate
+
+# Tempo máximo que uma entrada fica em memória; outros workers que alterarem o
+# catálogo são vistos depois desse intervalo
+CACHE_TTL_SECONDS = 300
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _is_fresh(entry, now, min_updated_at):
+    expires_at, updated_at, _ = entry
+    if expires_at <= now:
+        return False
+    return min_updated_at is None or (updated_at is not None and updated_at >= min_updated_at)
+
+
+def get_templates(template_ids, min_updated_at=None):
+    """
+    Retorna {id: dict do catálogo} para os ids pedidos.
+
+    Ids ausentes, expirados ou com updated_at anterior a min_updated_at são
+    buscados juntos em uma consulta; ids inexistentes no banco simplesmente
+    não aparecem no resultado.
+    """
+    template_ids = {template_id for template_id in template_ids if template_id is not None}
+    if not template_ids:
+        return {}
+
+    now = time.monotonic()
+    found = {}
+    missing = []
+
+    with _lock:
+        for template_id in template_ids:
+            entry = _cache.get(template_id)
+            if entry and _is_fresh(entry, now, min_updated_at):
+                found[template_id] = entry[2]
+            else:
+                missing.append(template_id)
+
+    if missing:
+        templates = RitualTemplate.query.filter(RitualTemplate.id.in_(missing)).all()
+        expires_at = now + CACHE_TTL_SECONDS
+        with _lock:
+            for template in templates:
+                data = template.to_dict()
+                _cache[template.id] = (expires_at, template.updated_at, data)
+                found[template.id] = data
+
+    return found
+
+
+def get_template(template_id):
+    """Retorna o dict de um ritual do catálogo ou None"""
+    return get_templates([template_id]).get(template_id)
+
+
+def invalidate(template_id=None):
+    """Remove um ritual (ou o catálogo inteiro) do cache"""
+    with _lock:
+        if template_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(template_id, None)
@@ -2,11 +2,21 @@
 Rotas para rituais de personagem
 """
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User, Character, Ritual
+from flask import Blueprint, request, jsonify, g
+from flask_jwt_extended import jwt_required
+from models import db, Ritual, RitualTemplate
+from sqlalchemy import func
+from ownership import owned_character, is_admin
+from http_cache import conditional_get
+import ritual_catalog
 
 rituals_bp = Blueprint('rituals', __name__)
+ritual_catalog_bp = Blueprint('ritual_catalog', __name__)
+
+_TEXT_FIELDS = ('execution_time', 'range', 'duration', 'resistance_test', 'description', 'effect')
+
+def _clean_text(value):
+    return value.strip() if value else None
 
 def _safe_int(value, default=None):
     """Converte um valor para int de forma segura"""
@@ -24,30 +34,41 @@ def _safe_int(value, default=None):
     except (ValueError, TypeError):
         return default
 
+def _rituals_fingerprint(character_id):
+    """
+    Inclui o catálogo: editar um ritual compartilhado muda a lista de quem o
+    usa. Coleção: só ETag, sem Last-Modified. O updated_at mais recente do
+    catálogo fica em g para a view não servir entradas mais antigas do cache
+    """
+    last_modified, count, max_id, template_modified = (
+        db.session.query(
+            func.max(Ritual.updated_at),
+            func.count(Ritual.id),
+            func.max(Ritual.id),
+            func.max(RitualTemplate.updated_at),
+        )
+        .outerjoin(RitualTemplate, RitualTemplate.id == Ritual.template_id)
+        .filter(Ritual.character_id == character_id)
+        .one()
+    )
+    g.template_modified = template_modified
+    return ('rituals', last_modified, count, max_id, template_modified), None
+
 @rituals_bp.route('/<int:character_id>/rituals', methods=['GET'])
 @jwt_required()
+@owned_character()
+@conditional_get(_rituals_fingerprint)
 def list_rituals(character_id):
     """Lista todos os rituais de um personagem"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
         rituals = Ritual.query.filter_by(character_id=character_id).all()
+        templates = ritual_catalog.get_templates(
+            (ritual.template_id for ritual in rituals), g.get('template_modified')
+        )
         
         return jsonify({
             'message': 'rituals',
-            'data': [ritual.to_dict() for ritual in rituals]
+            'data': [ritual.to_dict(templates.get(ritual.template_id)) for ritual in rituals]
         }), 200
         
     except Exception as e:
@@ -55,29 +76,15 @@ def list_rituals(character_id):
 
 @rituals_bp.route('/<int:character_id>/rituals/<int:ritual_id>', methods=['GET'])
 @jwt_required()
+@owned_character(Ritual, 'ritual_id', 'ritual_not_found')
 def show_ritual(character_id, ritual_id):
     """Mostra um ritual específico"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        ritual = Ritual.query.filter_by(
-            id=ritual_id,
-            character_id=character_id
-        ).first()
-        
-        if not ritual:
-            return jsonify({'message': 'ritual_not_found'}), 404
+        ritual = g.child
         
         return jsonify({
             'message': 'ritual',
-            'data': ritual.to_dict()
+            'data': ritual.to_dict(ritual_catalog.get_template(ritual.template_id))
         }), 200
         
     except Exception as e:
@@ -85,39 +92,38 @@ def show_ritual(character_id, ritual_id):
 
 @rituals_bp.route('/<int:character_id>/rituals', methods=['POST'])
 @jwt_required()
+@owned_character()
 def create_ritual(character_id):
-    """Cria um novo ritual"""
+    """
+    Cria um novo ritual.
+
+    Com template_id o ritual referencia o catálogo: nome, círculo e custo vêm
+    do catálogo (se não enviados) e os campos de texto enviados são gravados
+    como sobrescritas específicas do personagem.
+    """
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
+        data = request.get_json()
         
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
+        if not data:
+            return jsonify({'message': 'invalid_data'}), 400
         
-        data = request.get_json()
+        template = None
+        if data.get('template_id') is not None:
+            template = ritual_catalog.get_template(_safe_int(data.get('template_id')))
+            if not template:
+                return jsonify({'message': 'ritual_template_not_found'}), 404
         
-        if not data or not data.get('name'):
+        name = data.get('name') or (template['name'] if template else None)
+        if not name:
             return jsonify({'message': 'invalid_data'}), 400
         
         ritual = Ritual(
             character_id=character_id,
-            name=data['name'].strip(),
-            circle=_safe_int(data.get('circle'), 1),
-            cost=_safe_int(data.get('cost'), 0),
-            execution_time=data.get('execution_time', '').strip() if data.get('execution_time') else None,
-            range=data.get('range', '').strip() if data.get('range') else None,
-            duration=data.get('duration', '').strip() if data.get('duration') else None,
-            resistance_test=data.get('resistance_test', '').strip() if data.get('resistance_test') else None,
-            description=data.get('description', '').strip() if data.get('description') else None,
-            effect=data.get('effect', '').strip() if data.get('effect') else None
+            template_id=template['id'] if template else None,
+            name=name.strip(),
+            circle=_safe_int(data.get('circle'), template['circle'] if template else 1),
+            cost=_safe_int(data.get('cost'), template['cost'] if template else 0),
+            **{field: _clean_text(data.get(field)) for field in _TEXT_FIELDS}
         )
         
         db.session.add(ritual)
@@ -125,7 +131,7 @@ def create_ritual(character_id):
         
         return jsonify({
             'message': 'ritual_created',
-            'data': ritual.to_dict()
+            'data': ritual.to_dict(ritual_catalog.get_template(ritual.template_id))
         }), 201
         
     except Exception as e:
@@ -134,25 +140,11 @@ def create_ritual(character_id):
 
 @rituals_bp.route('/<int:character_id>/rituals/<int:ritual_id>', methods=['PATCH'])
 @jwt_required()
+@owned_character(Ritual, 'ritual_id', 'ritual_not_found')
 def update_ritual(character_id, ritual_id):
     """Atualiza um ritual"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        ritual = Ritual.query.filter_by(
-            id=ritual_id,
-            character_id=character_id
-        ).first()
-        
-        if not ritual:
-            return jsonify({'message': 'ritual_not_found'}), 404
+        ritual = g.child
         
         data = request.get_json()
         
@@ -182,7 +174,7 @@ def update_ritual(character_id, ritual_id):
         
         return jsonify({
             'message': 'ritual_updated',
-            'data': ritual.to_dict()
+            'data': ritual.to_dict(ritual_catalog.get_template(ritual.template_id))
         }), 200
         
     except Exception as e:
@@ -191,25 +183,11 @@ def update_ritual(character_id, ritual_id):
 
 @rituals_bp.route('/<int:character_id>/rituals/<int:ritual_id>', methods=['DELETE'])
 @jwt_required()
+@owned_character(Ritual, 'ritual_id', 'ritual_not_found')
 def delete_ritual(character_id, ritual_id):
     """Deleta um ritual"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        ritual = Ritual.query.filter_by(
-            id=ritual_id,
-            character_id=character_id
-        ).first()
-        
-        if not ritual:
-            return jsonify({'message': 'ritual_not_found'}), 404
+        ritual = g.child
         
         db.session.delete(ritual)
         db.session.commit()
@@ -220,3 +198,103 @@ def delete_ritual(character_id, ritual_id):
         db.session.rollback()
         return jsonify({'message': 'error_deleting_ritual', 'error': str(e)}), 500
 
+@ritual_catalog_bp.route('/', methods=['GET'])
+@jwt_required()
+def list_ritual_templates():
+    """Lista o catálogo compartilhado de rituais"""
+    try:
+        templates = RitualTemplate.query.order_by(RitualTemplate.circle, RitualTemplate.name).all()
+        
+        return jsonify({
+            'message': 'ritual_templates',
+            'data': [template.to_dict() for template in templates]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': 'error_retrieving_ritual_templates', 'error': str(e)}), 500
+
+@ritual_catalog_bp.route('/<int:template_id>', methods=['GET'])
+@jwt_required()
+def show_ritual_template(template_id):
+    """Mostra um ritual do catálogo"""
+    template = ritual_catalog.get_template(template_id)
+    
+    if not template:
+        return jsonify({'message': 'ritual_template_not_found'}), 404
+    
+    return jsonify({
+        'message': 'ritual_template',
+        'data': template
+    }), 200
+
+@ritual_catalog_bp.route('/', methods=['POST'])
+@jwt_required()
+def create_ritual_template():
+    """Adiciona um ritual ao catálogo (apenas admin)"""
+    if not is_admin():
+        return jsonify({'message': 'forbidden'}), 403
+    
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('name'):
+            return jsonify({'message': 'invalid_data'}), 400
+        
+        template = RitualTemplate(
+            name=data['name'].strip(),
+            circle=_safe_int(data.get('circle'), 1),
+            cost=_safe_int(data.get('cost'), 0),
+            **{field: _clean_text(data.get(field)) for field in _TEXT_FIELDS}
+        )
+        
+        db.session.add(template)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'ritual_template_created',
+            'data': template.to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'error_creating_ritual_template', 'error': str(e)}), 500
+
+@ritual_catalog_bp.route('/<int:template_id>', methods=['PATCH'])
+@jwt_required()
+def update_ritual_template(template_id):
+    """Atualiza um ritual do catálogo (apenas admin); afeta todos que o referenciam"""
+    if not is_admin():
+        return jsonify({'message': 'forbidden'}), 403
+    
+    try:
+        template = db.session.get(RitualTemplate, template_id)
+        
+        if not template:
+            return jsonify({'message': 'ritual_template_not_found'}), 404
+        
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'message': 'invalid_data'}), 400
+        
+        if data.get('name'):
+            template.name = data['name'].strip()
+        if 'circle' in data:
+            template.circle = _safe_int(data['circle'], template.circle)
+        if 'cost' in data:
+            template.cost = _safe_int(data['cost'], template.cost)
+        for field in _TEXT_FIELDS:
+            if field in data:
+                setattr(template, field, _clean_text(data[field]))
+        
+        db.session.commit()
+        ritual_catalog.invalidate(template_id)
+        
+        return jsonify({
+            'message': 'ritual_template_updated',
+            'data': template.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'error_updating_ritual_template', 'error': str(e)}), 500
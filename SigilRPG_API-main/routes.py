@@ -4,12 +4,25 @@ Rotas de autenticação
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
-from werkzeug.security import check_password_hash
 from models import db, User
+from passwords import password_hasher, PasswordHasherBusy
+from token_blocklist import token_blocklist
 import re
 
 auth_bp = Blueprint('auth', __name__)
 
+def _safe_user_id(identity):
+    try:
+        return int(identity)
+    except (TypeError, ValueError):
+        return None
+
+def _login_busy():
+    """Fila de verificação de senhas cheia: o cliente deve tentar de novo em instantes"""
+    response = jsonify({'message': 'too_many_login_attempts'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """Autentica um usuário e retorna um token JWT"""
@@ -37,6 +50,15 @@ def login():
         if not user or not user.check_password(password):
             return jsonify({'message': 'invalid_credentials'}), 401
         
+        # Hash gravado com outra política: refaz com a atual (a senha só é conhecida aqui)
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except Exception:
+                # O login não depende da atualização; tenta de novo no próximo
+                db.session.rollback()
+        
         # Criar token
         access_token = create_access_token(identity=str(user.id))
         
@@ -47,6 +69,8 @@ def login():
             }
         }), 200
         
+    except PasswordHasherBusy:
+        return _login_busy()
     except Exception as e:
         return jsonify({'message': 'could_not_create_token'}), 500
 
@@ -135,6 +159,9 @@ def register():
             }
         }), 201
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return _login_busy()
     except Exception as e:
         db.session.rollback()
         print(f"Erro ao registrar usuário: {str(e)}")
@@ -143,11 +170,13 @@ def register():
 @auth_bp.route('/', methods=['DELETE'])
 @jwt_required()
 def invalidate_token():
-    """Invalida o token JWT atual"""
+    """Invalida o token JWT atual (o JTI entra na lista de revogados)"""
     try:
-        # Em uma implementação mais robusta, você adicionaria o token a uma blacklist
-        # Por simplicidade, apenas retornamos sucesso
+        claims = get_jwt()
+        token_blocklist.revoke(claims['jti'], _safe_user_id(get_jwt_identity()), claims.get('exp'))
+        
         return jsonify({'message': 'token_invalidated'}), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({'message': 'error_invalidating_token'}), 500
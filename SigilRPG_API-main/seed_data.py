@@ -2,7 +2,8 @@
 Script para popular o banco de dados com dados iniciais
 """
 
-from app import app, db
+from app import create_app
+from models import db
 from models import (
     User,
     Character,
@@ -13,10 +14,12 @@ from models import (
     PartyMember,
 )
 from werkzeug.security import generate_password_hash
+import leaderboard
 
 def create_sample_data():
     """Cria dados de exemplo para testar a API"""
     
+    app = create_app()
     with app.app_context():
         # Limpar dados existentes
         db.drop_all()
@@ -131,6 +134,8 @@ def create_sample_data():
             )
             db.session.add(fight)
         
+        db.session.flush()
+        leaderboard.rebuild()
         db.session.commit()
         
         # Criar campanhas de exemplo
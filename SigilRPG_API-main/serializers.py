@@ -0,0 +1,136 @@
+"""
+Serializadores compilados a partir dos metadados das colunas dos modelos
+
+Cada serializador é gerado uma única vez como uma função Python com um dict
+literal (sem laços nem getattr por campo). O caminho rápido lê direto do
+__dict__ da instância; se algum atributo não estiver carregado (objeto
+expirado após commit), cai no caminho com acesso normal aos atributos.
+"""
+
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import Boolean, DateTime
+
+# Subconjuntos compilados guardados por serializador (LRU): ?fields= vem do cliente
+MAX_SUBSETS = 64
+
+
+def _datetime_format(expr):
+    return f'_v.isoformat() if (_v := {expr}) is not None else None'
+
+
+def _boolean_format(expr):
+    return f'bool({expr})'
+
+
+class Serializer:
+    """Serializador de um modelo; chame com uma instância ou use many()"""
+
+    def __init__(self, model, fields=None, exclude=(), formats=None, computed=None):
+        self.model = model
+        self.formats = dict(formats or {})
+        self.computed = dict(computed or {})
+        self.columns = {column.key: column for column in model.__table__.columns}
+
+        if fields is None:
+            fields = [key for key in self.columns if key not in exclude]
+        unknown = [field for field in fields if field not in self.columns and field not in self.computed]
+        if unknown:
+            raise ValueError(f'Campos desconhecidos para {model.__name__}: {unknown}')
+
+        self.fields = tuple(fields)
+        self._subsets = OrderedDict()
+        self._subsets_lock = threading.Lock()
+        self._fast, self._slow = self._compile()
+
+    def _value_expr(self, field, source):
+        if field in self.computed:
+            function, args = self.computed[field]
+            arguments = ', '.join(source(arg) for arg in args)
+            return f'_computed_{field}({arguments})'
+
+        expr = source(field)
+        if field in self.formats:
+            return self.formats[field].format(v=expr)
+
+        column_type = self.columns[field].type
+        if isinstance(column_type, DateTime):
+            return _datetime_format(expr)
+        if isinstance(column_type, Boolean):
+            return _boolean_format(expr)
+        return expr
+
+    def _compile(self):
+        namespace = {
+            f'_computed_{field}': function for field, (function, _) in self.computed.items()
+        }
+
+        def body(source):
+            return ', '.join(
+                f'{field!r}: {self._value_expr(field, source)}' for field in self.fields
+            )
+
+        source_code = (
+            'def _fast(_d):\n'
+            f'    return {{{body(lambda name: f"_d[{name!r}]")}}}\n'
+            'def _slow(_o):\n'
+            f'    return {{{body(lambda name: f"_o.{name}")}}}\n'
+        )
+        exec(compile(source_code, f'<serializer {self.model.__name__}>', 'exec'), namespace)
+        return namespace['_fast'], namespace['_slow']
+
+    def __call__(self, obj):
+        try:
+            return self._fast(obj.__dict__)
+        except KeyError:
+            return self._slow(obj)
+
+    def many(self, objs):
+        fast, slow = self._fast, self._slow
+        result = []
+        append = result.append
+        for obj in objs:
+            try:
+                append(fast(obj.__dict__))
+            except KeyError:
+                append(slow(obj))
+        return result
+
+    def rows(self, rows):
+        """
+        Serializa linhas de select() sobre a tabela inteira (Row), sem criar
+        instâncias ORM nem passar pela identity map da sessão
+        """
+        fast = self._fast
+        return [fast(row._mapping) for row in rows]
+
+    def only(self, fields):
+        """
+        Serializador com um subconjunto dos campos (mantém a ordem original).
+        Os MAX_SUBSETS subconjuntos usados mais recentemente ficam compilados.
+        """
+        wanted = frozenset(fields)
+        if not wanted:
+            raise ValueError('Nenhum campo informado')
+        with self._subsets_lock:
+            subset = self._subsets.get(wanted)
+            if subset is not None:
+                self._subsets.move_to_end(wanted)
+                return subset
+
+        unknown = wanted - set(self.fields)
+        if unknown:
+            raise ValueError(f'Campos desconhecidos: {sorted(unknown)}')
+        subset = Serializer(
+            self.model,
+            fields=[field for field in self.fields if field in wanted],
+            formats=self.formats,
+            computed=self.computed,
+        )
+        with self._subsets_lock:
+            subset = self._subsets.setdefault(wanted, subset)
+            self._subsets.move_to_end(wanted)
+            while len(self._subsets) > MAX_SUBSETS:
+                self._subsets.popitem(last=False)
+        return subset
@@ -0,0 +1,114 @@
+"""
+Testes de perícia em grupo ("todos rolem Percepção")
+
+Regra do sistema: rola-se tantos d20 quanto o valor do atributo (+ bonus_dice
+da perícia) e fica-se com o maior, somando training + others. Com 0 dados ou
+menos rola-se 2d20 e fica-se com o menor (mesma regra de combat._d20_test).
+
+Cada membro vira uma expressão do motor de dados (ex.: 3d20kh1+5). Membros
+com a mesma expressão compartilham a expressão compilada e a distribuição
+exata em cache, então a chance de sucesso contra a DT sai sem simulação.
+"""
+
+import random
+
+from sqlalchemy import and_, func, select
+
+import dice
+from models import db, Character, Skill, CampaignCharacter, PartyMember
+
+ATTRIBUTE_COLUMNS = {
+    'AGI': 'agilidade',
+    'INT': 'intelecto',
+    'VIG': 'vigor',
+    'PRE': 'presenca',
+    'FOR': 'forca',
+}
+
+
+def check_expression(attribute_value, bonus_dice, bonus):
+    """Notação do teste: N d20 mantendo o maior (ou 2d20 mantendo o menor) + bônus"""
+    count = (attribute_value or 0) + (bonus_dice or 0)
+    notation = f'{count}d20kh1' if count > 0 else '2d20kl1'
+    if bonus:
+        notation += f'{bonus:+d}'
+    return notation
+
+
+def load_members(skill_name, campaign_id, party_id=None, include_inactive=False):
+    """
+    Membros da campanha (ou da equipe) com atributos e a perícia pedida em uma
+    única consulta; quem não tem a perícia vem com as colunas da perícia nulas.
+    """
+    skill_join = and_(Skill.character_id == Character.id,
+                      func.lower(Skill.name) == skill_name.strip().lower())
+    query = select(
+        Character.id, Character.name,
+        *(getattr(Character, column) for column in ATTRIBUTE_COLUMNS.values()),
+        Skill.attribute, Skill.bonus_dice, Skill.training, Skill.others,
+    )
+    if party_id is not None:
+        query = query.join(PartyMember, PartyMember.character_id == Character.id) \
+            .where(PartyMember.party_id == party_id) \
+            .order_by(PartyMember.id, Skill.id)
+    else:
+        query = query.join(CampaignCharacter, CampaignCharacter.character_id == Character.id) \
+            .where(CampaignCharacter.campaign_id == campaign_id) \
+            .order_by(CampaignCharacter.id, Skill.id)
+        if not include_inactive:
+            query = query.where(CampaignCharacter.is_active.is_(True))
+    query = query.outerjoin(Skill, skill_join)
+
+    members = {}
+    for row in db.session.execute(query).mappings():
+        current = members.get(row['id'])
+        # Personagem com a perícia repetida: vale a de maior bônus
+        if current is None or _bonus(row) > _bonus(current):
+            members[row['id']] = row
+    return list(members.values())
+
+
+def _bonus(row):
+    return (row['training'] or 0) + (row['others'] or 0)
+
+
+def resolve_checks(members, attribute=None, dc=None, seed=None):
+    """
+    Resolve o teste para todos os membros.
+
+    attribute força o atributo de quem não tem a perícia (e de quem tem, se
+    informado); sem ele usa o atributo da própria perícia ou, para quem não a
+    possui, o atributo com que ela aparece nos demais membros.
+    Retorna (atributo padrão, resultados). Lança ValueError('attribute_required')
+    se não for possível descobrir o atributo de algum membro.
+    """
+    default_attribute = attribute or next(
+        ((row['attribute'] or '').upper() for row in members if row['attribute']), None
+    )
+    rng = random.Random(seed) if seed is not None else random.SystemRandom()
+
+    results = []
+    for row in members:
+        member_attribute = attribute or (row['attribute'] or '').upper() or default_attribute
+        if member_attribute not in ATTRIBUTE_COLUMNS:
+            raise ValueError('attribute_required')
+
+        notation = check_expression(row[ATTRIBUTE_COLUMNS[member_attribute]], row['bonus_dice'], _bonus(row))
+        compiled = dice.compile_expression(notation)
+        roll = compiled.roll(rng)
+        result = {
+            'character_id': row['id'],
+            'name': row['name'],
+            'attribute': member_attribute,
+            'trained': row['attribute'] is not None,
+            'expression': compiled.notation,
+            'rolls': roll['terms'][0]['rolls'],
+            'natural': roll['terms'][0]['kept'][0],
+            'total': roll['total'],
+        }
+        if dc is not None:
+            result['success'] = roll['total'] >= dc
+            result['success_probability'] = round(dice.success_probability(compiled.notation, dc), 6)
+        results.append(result)
+
+    return default_attribute, results
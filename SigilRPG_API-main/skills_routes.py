@@ -2,9 +2,14 @@
 Rotas para habilidades de personagem
 """
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User, Character, Skill
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, g
+from flask_jwt_extended import jwt_required
+from sqlalchemy import insert, update, delete
+from models import db, Skill
+from ownership import owned_character
+from http_cache import conditional_get, collection_fingerprint
 
 skills_bp = Blueprint('skills', __name__)
 
@@ -26,54 +31,116 @@ def _safe_int(value, default=None):
 
 @skills_bp.route('/<int:character_id>/skills', methods=['GET'])
 @jwt_required()
+@owned_character()
+@conditional_get(lambda character_id: collection_fingerprint(Skill, Skill.character_id == character_id))
 def list_skills(character_id):
     """Lista todas as habilidades de um personagem"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        skills = Skill.query.filter_by(character_id=character_id).all()
         
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
+        return jsonify({
+            'message': 'skills',
+            'data': [skill.to_dict() for skill in skills]
+        }), 200
         
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
+    except Exception as e:
+        return jsonify({'message': 'error_retrieving_skills', 'error': str(e)}), 500
+
+def _skill_row(data):
+    """Normaliza uma habilidade do payload com os mesmos padrões de create_skill"""
+    description = data.get('description')
+    return {
+        'name': data['name'].strip(),
+        'attribute': data.get('attribute') or 'AGI',
+        'bonus_dice': _safe_int(data.get('bonus_dice'), 0),
+        'training': _safe_int(data.get('training'), 0),
+        'others': _safe_int(data.get('others'), 0),
+        'description': description.strip() if description else None,
+    }
+
+@skills_bp.route('/<int:character_id>/skills', methods=['PUT'])
+@jwt_required()
+@owned_character()
+def replace_skills(character_id):
+    """
+    Substitui a lista de habilidades do personagem em uma transação.
+
+    Entradas com id atualizam a habilidade existente, entradas sem id são
+    criadas e habilidades ausentes do payload são removidas. Inserções e
+    atualizações são enviadas como executemany.
+    """
+    try:
+        data = request.get_json()
         
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
+        if not isinstance(data, list):
+            return jsonify({'message': 'invalid_data', 'error': 'Expected a JSON array'}), 400
+        
+        existing_ids = {
+            skill_id for (skill_id,) in
+            db.session.query(Skill.id).filter(Skill.character_id == character_id).all()
+        }
+        
+        errors = {}
+        inserts = []
+        updates = []
+        seen_ids = set()
+        now = datetime.utcnow()
+        
+        for index, entry in enumerate(data):
+            if not isinstance(entry, dict) or not isinstance(entry.get('name'), str) or not entry['name'].strip():
+                errors[str(index)] = ['Nome é obrigatório']
+                continue
+            
+            row = _skill_row(entry)
+            row['updated_at'] = now
+            
+            if entry.get('id') is None:
+                row['character_id'] = character_id
+                row['created_at'] = now
+                inserts.append(row)
+                continue
+            
+            skill_id = _safe_int(entry.get('id'))
+            if skill_id not in existing_ids:
+                errors[str(index)] = ['Habilidade não encontrada para este personagem']
+            elif skill_id in seen_ids:
+                errors[str(index)] = ['Habilidade repetida no payload']
+            else:
+                seen_ids.add(skill_id)
+                row['id'] = skill_id
+                updates.append(row)
+        
+        if errors:
+            return jsonify({'errors': errors}), 400
+        
+        removed_ids = existing_ids - seen_ids
+        if removed_ids:
+            db.session.execute(delete(Skill).where(Skill.id.in_(removed_ids)))
+        if updates:
+            db.session.execute(update(Skill), updates)
+        if inserts:
+            db.session.execute(insert(Skill), inserts)
         
-        skills = Skill.query.filter_by(character_id=character_id).all()
+        db.session.commit()
+        
+        skills = Skill.query.filter_by(character_id=character_id).order_by(Skill.id).all()
         
         return jsonify({
-            'message': 'skills',
+            'message': 'skills_replaced',
             'data': [skill.to_dict() for skill in skills]
         }), 200
         
     except Exception as e:
-        return jsonify({'message': 'error_retrieving_skills', 'error': str(e)}), 500
+        db.session.rollback()
+        return jsonify({'message': 'error_replacing_skills', 'error': str(e)}), 500
 
 @skills_bp.route('/<int:character_id>/skills/<int:skill_id>', methods=['GET'])
 @jwt_required()
+@owned_character(Skill, 'skill_id', 'skill_not_found')
 def show_skill(character_id, skill_id):
     """Mostra uma habilidade específica"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        skill = Skill.query.filter_by(
-            id=skill_id,
-            character_id=character_id
-        ).first()
-        
-        if not skill:
-            return jsonify({'message': 'skill_not_found'}), 404
+        skill = g.child
         
         return jsonify({
             'message': 'skill',
@@ -85,23 +152,10 @@ def show_skill(character_id, skill_id):
 
 @skills_bp.route('/<int:character_id>/skills', methods=['POST'])
 @jwt_required()
+@owned_character()
 def create_skill(character_id):
     """Cria uma nova habilidade"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
         data = request.get_json()
         
         if not data or not data.get('name'):
@@ -131,25 +185,11 @@ def create_skill(character_id):
 
 @skills_bp.route('/<int:character_id>/skills/<int:skill_id>', methods=['PATCH'])
 @jwt_required()
+@owned_character(Skill, 'skill_id', 'skill_not_found')
 def update_skill(character_id, skill_id):
     """Atualiza uma habilidade"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        skill = Skill.query.filter_by(
-            id=skill_id,
-            character_id=character_id
-        ).first()
-        
-        if not skill:
-            return jsonify({'message': 'skill_not_found'}), 404
+        skill = g.child
         
         data = request.get_json()
         
@@ -182,25 +222,11 @@ def update_skill(character_id, skill_id):
 
 @skills_bp.route('/<int:character_id>/skills/<int:skill_id>', methods=['DELETE'])
 @jwt_required()
+@owned_character(Skill, 'skill_id', 'skill_not_found')
 def delete_skill(character_id, skill_id):
     """Deleta uma habilidade"""
     try:
-        user_id = get_jwt_identity()
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({'message': 'character_not_found'}), 404
-        
-        skill = Skill.query.filter_by(
-            id=skill_id,
-            character_id=character_id
-        ).first()
-        
-        if not skill:
-            return jsonify({'message': 'skill_not_found'}), 404
+        skill = g.child
         
         db.session.delete(skill)
         db.session.commit()
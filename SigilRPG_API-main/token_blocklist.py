@@ -0,0 +1,107 @@
+"""
+Revogação de tokens JWT por JTI
+
+Os JTIs revogados ficam na tabela revoked_tokens (sobrevive a reinícios) e,
+em cada processo, em um dict jti -> expiração consultado pelo
+token_in_blocklist_loader do Flask-JWT-Extended: a verificação de cada
+requisição é uma busca em memória.
+
+A cópia em memória é sincronizada de forma incremental (linhas com id maior
+que o último visto menos REFRESH_OVERLAP) no máximo a cada
+TOKEN_BLOCKLIST_REFRESH segundos. A sobreposição existe porque a ordem dos
+commits não é a dos ids: no Postgres uma transação pode pegar o id 10 da
+sequência e fazer commit depois de outra que pegou o 11, e uma leitura entre
+os dois commits já teria passado do 10. Um logout feito em outro worker vale
+aqui em até esse intervalo; no próprio worker vale na hora. Linhas expiradas são removidas da tabela a cada
+revogação (prune) e da memória a cada sincronização.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+
+from models import db, RevokedToken
+
+DEFAULT_REFRESH_INTERVAL = 5
+# Ids abaixo do último visto relidos a cada sincronização (revogações com
+# commit fora de ordem); basta cobrir as transações simultâneas
+REFRESH_OVERLAP = 1000
+# Tokens sem exp: guardados por tempo suficiente para nunca voltarem a valer
+NO_EXPIRY = timedelta(days=3650)
+
+
+class TokenBlocklist:
+    """
+    Configuração (app.config): TOKEN_BLOCKLIST_REFRESH (segundos entre as
+    sincronizações com a tabela).
+    """
+
+    def __init__(self, app=None, jwt=None):
+        self.refresh_interval = DEFAULT_REFRESH_INTERVAL
+        self._revoked = {}
+        self._last_id = 0
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, jwt)
+
+    def init_app(self, app, jwt):
+        self.refresh_interval = float(app.config.get('TOKEN_BLOCKLIST_REFRESH', DEFAULT_REFRESH_INTERVAL))
+        jwt.token_in_blocklist_loader(self._check_payload)
+        app.extensions['token_blocklist'] = self
+
+    def _check_payload(self, jwt_header, jwt_payload):
+        return self.is_revoked(jwt_payload.get('jti'))
+
+    def is_revoked(self, jti):
+        if time.monotonic() >= self._next_refresh:
+            self.refresh()
+        return jti in self._revoked
+
+    def refresh(self):
+        """Traz da tabela as revogações novas e descarta as expiradas da memória"""
+        with self._lock:
+            rows = db.session.execute(
+                select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+                .where(RevokedToken.id > self._last_id - REFRESH_OVERLAP)
+                .order_by(RevokedToken.id)
+            ).all()
+            now = datetime.utcnow()
+            for row in rows:
+                if row.expires_at > now:
+                    self._revoked[row.jti] = row.expires_at
+                self._last_id = max(self._last_id, row.id)
+            for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+            self._next_refresh = time.monotonic() + self.refresh_interval
+
+    def revoke(self, jti, user_id=None, expires=None):
+        """
+        Revoga o token (expires: campo exp do JWT, em segundos desde a época).
+        Grava e faz commit; remove do banco as revogações já expiradas.
+        """
+        expires_at = datetime.utcfromtimestamp(expires) if expires else datetime.utcnow() + NO_EXPIRY
+        self.prune()
+        db.session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        db.session.commit()
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def prune(self):
+        """Apaga as linhas de tokens já expirados (sem commit); retorna quantas"""
+        result = db.session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+        )
+        return result.rowcount
+
+    def clear(self):
+        """Esquece o estado em memória (a próxima consulta relê a tabela)"""
+        with self._lock:
+            self._revoked = {}
+            self._last_id = 0
+            self._next_refresh = 0.0
+
+
+token_blocklist = TokenBlocklist()
@@ -0,0 +1,138 @@
+"""
+Cache por processo dos usuários autenticados
+
+As rotas com @jwt_required() só precisam saber se o usuário do token ainda
+existe; em vez de um SELECT por chave primária a cada requisição, o id fica
+em um LRU com TTL (MemoryBackend do cache de respostas) junto com um registro
+leve (id, name, email).
+
+Alterações e exclusões feitas pelo ORM invalidam a entrada depois do
+commit: os ids alterados em cada flush são guardados na sessão e descartados
+do cache em after_commit (ou esquecidos em um rollback). Invalidar já no
+flush deixaria outra requisição recolocar no cache o registro antigo antes
+do commit. Como cada worker tem o seu cache, em outros processos a entrada
+expira em até USER_CACHE_TTL segundos; exclusões em massa (Query.delete /
+SQL direto) devem chamar invalidate() ou clear().
+
+GET /api/auth/user não usa o cache: devolve o usuário completo (to_dict) e
+precisa da linha de qualquer forma. GET /api/users confere o admin pelo id do
+token e lista a tabela inteira, sem checagem de existência a substituir.
+"""
+
+import os
+import threading
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from models import db, User
+from response_cache import MemoryBackend
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL = 300
+
+
+class UserCache:
+    """
+    Configuração (app.config): USER_CACHE_MAX_ENTRIES e USER_CACHE_TTL
+    (segundos; 0 desativa o cache).
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryBackend(max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        ttl = int(app.config.get('USER_CACHE_TTL', DEFAULT_TTL))
+        max_entries = int(app.config.get('USER_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        self.backend = MemoryBackend(max_entries=max_entries, ttl=ttl) if ttl > 0 else None
+        app.extensions['user_cache'] = self
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, user_id):
+        """Registro leve {'id', 'name', 'email'} do usuário, ou None se não existir"""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        key = str(user_id)
+        if self.backend is not None:
+            record = self.backend.get(key)
+            if record is not None:
+                self._count(True)
+                return record
+            self._count(False)
+
+        row = db.session.execute(
+            select(User.id, User.name, User.email).where(User.id == user_id)
+        ).first()
+        if row is None:
+            # Ausências não ficam em cache: o id pode ser criado em seguida
+            return None
+        record = {'id': row.id, 'name': row.name, 'email': row.email}
+        if self.backend is not None:
+            self.backend.set(key, record)
+        return record
+
+    def exists(self, user_id):
+        return self.get(user_id) is not None
+
+    def invalidate(self, user_id):
+        if self.backend is not None:
+            self.backend.delete(str(int(user_id)))
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        if self.backend is not None:
+            self.backend.delete_prefix('')
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else None,
+            'entries': self.backend.size() if self.backend else 0,
+            'pid': os.getpid(),
+        }
+
+
+user_cache = UserCache()
+
+
+_PENDING_KEY = 'user_cache_invalidate'
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_users(session, flush_context):
+    ids = {
+        target.id for target in list(session.dirty) + list(session.deleted)
+        if isinstance(target, User) and target.id is not None
+    }
+    if ids:
+        session.info.setdefault(_PENDING_KEY, set()).update(ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back_users(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -2,13 +2,62 @@
 Rotas para personagem do usuário
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, User, Character
+from sqlalchemy.orm import joinedload
+from models import db, Character, Skill, Ritual, Item, CampaignCharacter, PartyMember
+from character_validation import validate_character_data, character_fields
+from character_import import import_characters, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE
+from pagination import parse_limit
+from ownership import owned_character
+from user_cache import user_cache
+from http_cache import conditional_get
+from campaigns_routes import invalidate_campaign_cache
+import ritual_catalog
 import re
 
 user_character_bp = Blueprint('user_character', __name__)
 
+_CHARACTER_NOT_OWNED = 'Personagem não encontrado ou não pertence a este usuário'
+
+def _sheet_skills(character_id):
+    skills = Skill.query.filter_by(character_id=character_id).order_by(Skill.id).all()
+    return [skill.to_dict() for skill in skills]
+
+def _sheet_rituals(character_id):
+    rituals = Ritual.query.filter_by(character_id=character_id).order_by(Ritual.id).all()
+    templates = ritual_catalog.get_templates(ritual.template_id for ritual in rituals)
+    return [ritual.to_dict(templates.get(ritual.template_id)) for ritual in rituals]
+
+def _sheet_items(character_id):
+    items = Item.query.filter_by(character_id=character_id).order_by(Item.id).all()
+    return [item.to_dict() for item in items]
+
+def _sheet_campaigns(character_id):
+    memberships = (
+        CampaignCharacter.query.options(joinedload(CampaignCharacter.campaign))
+        .filter_by(character_id=character_id)
+        .all()
+    )
+    return [membership.to_dict(include_campaign=True) for membership in memberships]
+
+def _sheet_parties(character_id):
+    memberships = (
+        PartyMember.query.options(joinedload(PartyMember.party))
+        .filter_by(character_id=character_id)
+        .all()
+    )
+    return [membership.to_dict(include_party=True) for membership in memberships]
+
+# Seções da ficha, na ordem em que aparecem na resposta
+SHEET_SECTIONS = {
+    'skills': _sheet_skills,
+    'rituals': _sheet_rituals,
+    'items': _sheet_items,
+    'campaigns': _sheet_campaigns,
+    'parties': _sheet_parties,
+}
+
 def _safe_int(value, default=None):
     """Converte um valor para int de forma segura, retornando default se falhar"""
     if value is None:
@@ -31,9 +80,7 @@ def create_user_character():
     """Cria um personagem para o usuário autenticado"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
+        if not user_cache.exists(user_id):
             return jsonify({'message': 'user_not_found'}), 404
         
         # Permitir múltiplos personagens - remover restrição
@@ -43,56 +90,11 @@ def create_user_character():
         if not data:
             return jsonify({'message': 'invalid_data'}), 400
         
-        # Validação dos dados
-        name = data.get('name')
-        age = data.get('age')
-        skilled_in = data.get('skilled_in')
-        
-        errors = {}
-        
-        if not name or len(name.strip()) == 0:
-            errors['name'] = ['Nome é obrigatório']
-        elif len(name) > 255:
-            errors['name'] = ['Nome deve ter no máximo 255 caracteres']
-        
-        if not age:
-            errors['age'] = ['Idade é obrigatória']
-        elif not isinstance(age, int) or age < 1 or age > 200:
-            errors['age'] = ['Idade deve ser um número entre 1 e 200']
-        
-        if not skilled_in or len(skilled_in.strip()) == 0:
-            errors['skilled_in'] = ['Habilidade é obrigatória']
-        elif len(skilled_in) > 255:
-            errors['skilled_in'] = ['Habilidade deve ter no máximo 255 caracteres']
-        
+        errors = validate_character_data(data)
         if errors:
             return jsonify({'errors': errors}), 400
         
-        # Criar personagem com todos os campos opcionais
-        character = Character(
-            name=name.strip(),
-            age=age,
-            skilled_in=skilled_in.strip(),
-            user_id=user_id,
-            player_name=data.get('player_name'),
-            origin=data.get('origin'),
-            character_class=data.get('character_class'),
-            nex=_safe_int(data.get('nex'), 5),  # Valor padrão de 5 se não fornecido
-            avatar_url=data.get('avatar_url'),
-            agilidade=_safe_int(data.get('agilidade'), 1),
-            intelecto=_safe_int(data.get('intelecto'), 1),
-            vigor=_safe_int(data.get('vigor'), 1),
-            presenca=_safe_int(data.get('presenca'), 1),
-            forca=_safe_int(data.get('forca'), 1),
-            gender=data.get('gender'),
-            appearance=data.get('appearance'),
-            personality=data.get('personality'),
-            background=data.get('background'),
-            objective=data.get('objective')
-        )
-        
-        # Inicializar valores de combate com os máximos calculados
-        character.initialize_combat_stats()
+        character = Character(**character_fields(data, user_id))
         
         db.session.add(character)
         db.session.commit()
@@ -114,15 +116,44 @@ def create_user_character():
             'error_type': type(e).__name__
         }), 500
 
+@user_character_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_user_characters():
+    """
+    Importa personagens em lote para o usuário autenticado.
+
+    O corpo é NDJSON (um personagem por linha, com skills, rituals e items
+    opcionais), lido em streaming. chunk_size define quantas linhas vão em
+    cada INSERT/commit. Linhas inválidas são reportadas sem abortar as demais.
+    """
+    try:
+        user_id = get_jwt_identity()
+        if not user_cache.exists(user_id):
+            return jsonify({'message': 'user_not_found'}), 404
+        
+        try:
+            chunk_size = parse_limit(request.args.get('chunk_size'), DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE)
+        except ValueError:
+            return jsonify({'message': 'invalid_chunk_size'}), 400
+        
+        report = import_characters(request.stream, int(user_id), chunk_size)
+        
+        return jsonify({
+            'message': 'characters_imported',
+            'data': report
+        }), 200 if report['imported'] or not report['failed'] else 400
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'error_importing_characters', 'error': str(e)}), 500
+
 @user_character_bp.route('/', methods=['GET'])
 @jwt_required()
 def list_user_characters():
     """Lista todos os personagens do usuário autenticado"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
+        if not user_cache.exists(user_id):
             return jsonify({'message': 'user_not_found'}), 404
         
         characters = Character.query.filter_by(user_id=user_id).all()
@@ -144,27 +175,18 @@ def list_user_characters():
             'error_type': type(e).__name__
         }), 500
 
+def _owned_character_fingerprint(character_id):
+    # O personagem já foi carregado por owned_character: nenhuma consulta extra
+    return ('me', character_id, g.character.updated_at), g.character.updated_at
+
 @user_character_bp.route('/<int:character_id>', methods=['GET'])
 @jwt_required()
+@owned_character(error_detail=_CHARACTER_NOT_OWNED)
+@conditional_get(_owned_character_fingerprint)
 def show_user_character(character_id):
     """Mostra um personagem específico do usuário autenticado"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({
-                'message': 'character_not_found',
-                'error_detail': 'Personagem não encontrado ou não pertence a este usuário'
-            }), 404
+        character = g.character
         
         return jsonify({
             'message': 'character',
@@ -174,27 +196,49 @@ def show_user_character(character_id):
     except Exception as e:
         return jsonify({'message': 'error_retrieving_character'}), 500
 
+@user_character_bp.route('/<int:character_id>/sheet', methods=['GET'])
+@jwt_required()
+@owned_character(error_detail=_CHARACTER_NOT_OWNED)
+def show_character_sheet(character_id):
+    """
+    Ficha completa do personagem em uma requisição.
+
+    Cada seção é carregada com uma consulta própria (vínculos já trazem
+    campanha/equipe via JOIN), então o total de consultas não depende do
+    tamanho da ficha. ?sections=skills,items limita as seções retornadas.
+    """
+    try:
+        sections = request.args.get('sections')
+        if sections:
+            sections = {section.strip() for section in sections.split(',') if section.strip()}
+            if not sections <= set(SHEET_SECTIONS):
+                return jsonify({
+                    'message': 'invalid_sections',
+                    'error_detail': f"Seções válidas: {', '.join(SHEET_SECTIONS)}"
+                }), 400
+        else:
+            sections = set(SHEET_SECTIONS)
+
+        data = g.character.to_dict()
+        for section in SHEET_SECTIONS:
+            if section in sections:
+                data[section] = SHEET_SECTIONS[section](character_id)
+
+        return jsonify({
+            'message': 'character_sheet',
+            'data': data
+        }), 200
+
+    except Exception as e:
+        return jsonify({'message': 'error_retrieving_character_sheet', 'error': str(e)}), 500
+
 @user_character_bp.route('/<int:character_id>', methods=['PATCH'])
 @jwt_required()
+@owned_character(error_detail=_CHARACTER_NOT_OWNED)
 def update_user_character(character_id):
     """Atualiza um personagem do usuário autenticado"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({
-                'message': 'character_not_found',
-                'error_detail': 'Personagem não encontrado ou não pertence a este usuário'
-            }), 404
+        character = g.character
         
         data = request.get_json()
         
@@ -268,6 +312,7 @@ def update_user_character(character_id):
                 character.current_ps = min(ps, character.calculate_max_ps())  # Não pode exceder o máximo
         
         db.session.commit()
+        invalidate_campaign_cache()
         
         return jsonify({
             'message': 'character_updated',
@@ -283,28 +328,15 @@ def update_user_character(character_id):
 
 @user_character_bp.route('/<int:character_id>', methods=['DELETE'])
 @jwt_required()
+@owned_character(error_detail=_CHARACTER_NOT_OWNED)
 def delete_user_character(character_id):
     """Deleta um personagem do usuário autenticado"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({'message': 'user_not_found'}), 404
-        
-        character = Character.query.filter_by(
-            id=character_id,
-            user_id=user_id
-        ).first()
-        
-        if not character:
-            return jsonify({
-                'message': 'character_not_found',
-                'error_detail': 'Personagem não encontrado ou não pertence a este usuário'
-            }), 404
+        character = g.character
         
         db.session.delete(character)
         db.session.commit()
+        invalidate_campaign_cache()
         
         return jsonify({
             'message': 'character_deleted'
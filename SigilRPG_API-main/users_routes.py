@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from models import db, User
+from ownership import is_admin
 
 users_bp = Blueprint('users', __name__)
 
@@ -9,9 +10,7 @@ users_bp = Blueprint('users', __name__)
 def list_users():
     """Lista usuários registrados (apenas admin). Regra simples: usuário id=1 é admin."""
     try:
-        user_id = get_jwt_identity()
-        # Regra de admin simples: id == 1
-        if str(user_id) != '1':
+        if not is_admin():
             return jsonify({'message': 'forbidden'}), 403
 
         users = User.query.order_by(User.id.asc()).all()
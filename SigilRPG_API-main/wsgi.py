@@ -0,0 +1,11 @@
+"""
+Ponto de entrada WSGI para servidores de produção (gunicorn wsgi:app)
+
+Usa ProductionConfig, a menos que FLASK_CONFIG indique outra configuração.
+"""
+
+import os
+
+from app import create_app
+
+app = create_app(os.environ.get('FLASK_CONFIG', 'production'))
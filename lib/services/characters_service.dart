@@ -7,8 +7,11 @@ class CharactersService {
 
   /// Lista todos os personagens do sistema (públicos)
   Future<List<Character>> fetchCharacters() async {
-    // A API retorna um array diretamente
-    final data = await _client.getJsonList('/api/characters/');
+    // A API retorna um array por página; o cursor da próxima vem em X-Next-Cursor
+    final data = await _client.getJsonListAllPages(
+      '/api/characters/',
+      query: {'limit': '200'},
+    );
     return data
         .map((e) => Character.fromJson(e as Map<String, dynamic>))
         .toList();
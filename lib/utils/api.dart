@@ -98,6 +98,33 @@ class ApiClient {
     );
   }
 
+  /// Busca todas as páginas de uma listagem paginada por cursor: segue o
+  /// cabeçalho X-Next-Cursor até a última página e junta os arrays
+  Future<List<dynamic>> getJsonListAllPages(
+    String path, {
+    Map<String, dynamic>? query,
+  }) async {
+    final items = <dynamic>[];
+    String? cursor;
+    do {
+      final pageQuery = <String, dynamic>{
+        ...?query,
+        if (cursor != null) 'cursor': cursor,
+      };
+      final res = await _client
+          .get(_uri(path, pageQuery.isEmpty ? null : pageQuery), headers: _headers())
+          .timeout(_timeout);
+      _ensureSuccess(res);
+      final decoded = _decode(res.body);
+      if (decoded is! List) {
+        throw FormatException('Expected array, got: $decoded');
+      }
+      items.addAll(decoded);
+      cursor = res.headers['x-next-cursor'];
+    } while (cursor != null && cursor.isNotEmpty);
+    return items;
+  }
+
   Future<Map<String, dynamic>> postJson(
     String path, {
     Map<String, dynamic>? body,
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do motor de combate (combat.py): lutas resolvidas por segundo
+em um núcleo, com retratos variados e sementes diferentes
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, os.path.abspath(api_path))
+
+from combat import Fighter, resolve
+
+
+def random_fighter(rng):
+    agilidade = rng.randint(0, 5)
+    forca = rng.randint(0, 5)
+    vigor = rng.randint(1, 5)
+    return Fighter(
+        pv=10 + vigor * 5 + forca * 2,
+        pe=rng.randint(0, 20),
+        agilidade=agilidade,
+        attack_dice=max(agilidade, forca) + rng.randint(0, 1),
+        attack_bonus=rng.choice([0, 5, 10]),
+        defense=10 + agilidade,
+        damage_bonus=forca,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fights', type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    pairs = [(random_fighter(rng), random_fighter(rng), rng.getrandbits(31)) for _ in range(args.fights)]
+
+    start = time.perf_counter()
+    results = [resolve(first, second, seed) for first, second, seed in pairs]
+    elapsed = time.perf_counter() - start
+
+    outcomes = {status: 0 for status in ('won', 'lost', 'draw')}
+    for result in results:
+        outcomes[result.status] += 1
+    rounds = sum(result.rounds for result in results) / len(results)
+
+    print(f"⚔️  {args.fights} lutas em {elapsed:.3f}s → {args.fights / elapsed:,.0f} lutas/s")
+    print(f"    média de {rounds:.1f} rodadas; resultados {outcomes}")
+
+    # Determinismo: a mesma semente reproduz o mesmo resultado
+    first, second, seed = pairs[0]
+    assert resolve(first, second, seed) == results[0]
+
+
+if __name__ == "__main__":
+    main()
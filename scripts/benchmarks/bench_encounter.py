@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark do estimador de encontros (encounter.py): simulações vetorizadas
+com NumPy contra um laço Python chamando combat.resolve por luta
+"""
+import argparse
+import os
+import sys
+import time
+
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, os.path.abspath(api_path))
+
+import combat
+import encounter
+
+HERO = combat.Fighter(pv=25, pe=10, agilidade=2, attack_dice=3, attack_bonus=5, defense=12, damage_bonus=2)
+RIVAL = combat.Fighter(pv=30, pe=0, agilidade=1, attack_dice=2, attack_bonus=0, defense=11, damage_bonus=3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--simulations', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    wins = sum(combat.resolve(HERO, RIVAL, seed).status == 'won' for seed in range(args.simulations))
+    loop_s = time.perf_counter() - start
+    print(f"laço Python      {args.simulations / loop_s:>12,.0f} sim/s  vitória {wins / args.simulations:.4f}")
+
+    start = time.perf_counter()
+    result = encounter.estimate([HERO], [RIVAL], args.simulations, seed=1)
+    vector_s = time.perf_counter() - start
+    print(f"NumPy (1 proc.)  {args.simulations / vector_s:>12,.0f} sim/s  vitória {result['win_probability']}")
+
+    if args.workers > 1:
+        start = time.perf_counter()
+        result = encounter.estimate([HERO], [RIVAL], args.simulations, workers=args.workers, seed=1)
+        pool_s = time.perf_counter() - start
+        print(f"NumPy ({result['workers']} proc.)  {args.simulations / pool_s:>12,.0f} sim/s")
+
+    # Encontro em grupo: 4 heróis contra 6 oponentes
+    start = time.perf_counter()
+    encounter.estimate([HERO] * 4, [RIVAL] * 6, args.simulations, seed=1)
+    print(f"4 x 6 (NumPy)    {args.simulations / (time.perf_counter() - start):>12,.0f} sim/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos índices de busca: planos de consulta e latência antes/depois
+de aplicar migrate_add_indexes.py em um banco sintético grande
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, os.path.abspath(api_path))
+
+from sqlalchemy import create_engine
+
+from models import db
+from migrate_add_indexes import INDEXES, apply_indexes
+
+# (descrição, SQL, gerador de parâmetros)
+QUERIES = [
+    ('personagens do usuário', 'SELECT * FROM characters WHERE user_id = ?',
+     lambda n: (random.randint(1, n['users']),)),
+    ('lista de skills', 'SELECT * FROM skills WHERE character_id = ?',
+     lambda n: (random.randint(1, n['characters']),)),
+    ('skill do personagem', 'SELECT * FROM skills WHERE id = ? AND character_id = ?',
+     lambda n: (random.randint(1, n['skills']), random.randint(1, n['characters']))),
+    ('lista de itens', 'SELECT * FROM items WHERE character_id = ?',
+     lambda n: (random.randint(1, n['characters']),)),
+    ('lista de rituais', 'SELECT * FROM rituals WHERE character_id = ?',
+     lambda n: (random.randint(1, n['characters']),)),
+    ('lutas do personagem', 'SELECT * FROM fights WHERE character_id = ?',
+     lambda n: (random.randint(1, n['characters']),)),
+    ('lutas como oponente', 'SELECT * FROM fights WHERE opponent_id = ?',
+     lambda n: (random.randint(1, n['characters']),)),
+    ('campanhas do personagem', 'SELECT * FROM campaign_characters WHERE character_id = ?',
+     lambda n: (random.randint(1, n['characters']),)),
+    ('equipes do personagem', 'SELECT * FROM party_members WHERE character_id = ?',
+     lambda n: (random.randint(1, n['characters']),)),
+    ('equipes da campanha', 'SELECT * FROM parties WHERE campaign_id = ?',
+     lambda n: (random.randint(1, n['campaigns']),)),
+]
+
+
+def build_database(path, characters):
+    """Cria o schema via models.py (sem índices) e popula com dados sintéticos"""
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    for name, _, _ in INDEXES:
+        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+
+    sizes = {
+        'users': max(1, characters // 4),
+        'characters': characters,
+        'skills': characters * 10,
+        'campaigns': max(1, characters // 50),
+    }
+    now = '2024-01-01 00:00:00'
+
+    cursor.executemany(
+        'INSERT INTO users (id, name, email, password_hash, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+        ((i, f'u{i}', f'u{i}@x.com', 'x', now, now) for i in range(1, sizes['users'] + 1)),
+    )
+    cursor.executemany(
+        'INSERT INTO characters (id, name, age, skilled_in, nex, user_id, created_at, updated_at) '
+        'VALUES (?, ?, 20, ?, 5, ?, ?, ?)',
+        ((i, f'c{i}', 'Luta', random.randint(1, sizes['users']), now, now) for i in range(1, characters + 1)),
+    )
+    cursor.executemany(
+        'INSERT INTO skills (character_id, name, attribute, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+        ((random.randint(1, characters), f's{i}', 'AGI', now, now) for i in range(sizes['skills'])),
+    )
+    cursor.executemany(
+        'INSERT INTO items (character_id, name, category, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+        ((random.randint(1, characters), f'i{i}', 'arma', now, now) for i in range(characters * 5)),
+    )
+    cursor.executemany(
+        'INSERT INTO rituals (character_id, name, circle, cost, created_at, updated_at) VALUES (?, ?, 1, 1, ?, ?)',
+        ((random.randint(1, characters), f'r{i}', now, now) for i in range(characters * 3)),
+    )
+    cursor.executemany(
+        'INSERT INTO fights (character_id, opponent_id, status, experience, created_at, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        ((random.randint(1, characters), random.randint(1, characters), 'won', 50, now, now)
+         for _ in range(characters * 5)),
+    )
+    cursor.executemany(
+        'INSERT INTO campaigns (id, name, master_name, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+        ((i, f'camp{i}', 'Mestre', now, now) for i in range(1, sizes['campaigns'] + 1)),
+    )
+    cursor.executemany(
+        'INSERT INTO campaign_characters (campaign_id, character_id, joined_at) VALUES (?, ?, ?)',
+        (((i % sizes['campaigns']) + 1, i, now) for i in range(1, characters + 1)),
+    )
+    cursor.executemany(
+        'INSERT INTO parties (id, campaign_id, name, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+        ((i, (i % sizes['campaigns']) + 1, f'p{i}', now, now) for i in range(1, sizes['campaigns'] * 3 + 1)),
+    )
+    cursor.executemany(
+        'INSERT INTO party_members (party_id, character_id, joined_at) VALUES (?, ?, ?)',
+        (((i % (sizes['campaigns'] * 3)) + 1, i, now) for i in range(1, characters + 1)),
+    )
+    conn.commit()
+    return conn, sizes
+
+
+def measure(conn, sizes, repeat):
+    """Retorna {descrição: (plano, latência média em ms)}"""
+    results = {}
+    cursor = conn.cursor()
+    for label, sql, params in QUERIES:
+        plan = cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params(sizes)).fetchall()
+        plan_text = '; '.join(row[-1] for row in plan)
+
+        random.seed(42)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            cursor.execute(sql, params(sizes)).fetchall()
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        results[label] = (plan_text, elapsed)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--characters', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        print(f"📦 Gerando banco sintético com {args.characters} personagens...")
+        conn, sizes = build_database(path, args.characters)
+
+        before = measure(conn, sizes, args.repeat)
+        apply_indexes(conn)
+        after = measure(conn, sizes, args.repeat)
+        conn.close()
+
+    print()
+    print(f"{'consulta':<26} {'antes (ms)':>11} {'depois (ms)':>12} {'ganho':>8}")
+    for label, _, _ in QUERIES:
+        plan_before, ms_before = before[label]
+        plan_after, ms_after = after[label]
+        speedup = ms_before / ms_after if ms_after else float('inf')
+        print(f"{label:<26} {ms_before:>11.3f} {ms_after:>12.3f} {speedup:>7.1f}x")
+        print(f"    antes:  {plan_before}")
+        print(f"    depois: {plan_after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark de login (POST /api/auth/login) por política de hash de senha:
+logins por segundo por núcleo (requisições em série) e vazão de uma rajada
+concorrente passando pelo pool limitado de verificação
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, os.path.abspath(api_path))
+
+from app import create_app
+from models import db, User
+from passwords import password_hasher, canonical_method
+
+# Banco em memória; a política de hash é trocada por medição
+app = create_app('testing')
+
+POLICIES = [
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:210000',
+    'pbkdf2:sha256:100000',
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+]
+PASSWORD = 'senha-de-teste'
+
+
+def timed_logins(client, email, seconds):
+    """Logins em série por `seconds` segundos; retorna (quantidade, tempo)"""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        response = client.post('/api/auth/login', json={'email': email, 'password': PASSWORD})
+        assert response.status_code == 200, response.get_json()
+        count += 1
+    return count, time.perf_counter() - start
+
+
+def burst(email, threads, per_thread):
+    """Rajada: `threads` clientes fazendo `per_thread` logins cada; retorna (ok, 503, tempo)"""
+    statuses = []
+    lock = threading.Lock()
+
+    def worker():
+        client = app.test_client()
+        for _ in range(per_thread):
+            with app.app_context():
+                status = client.post('/api/auth/login', json={'email': email, 'password': PASSWORD}).status_code
+            with lock:
+                statuses.append(status)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return statuses.count(200), statuses.count(503), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--policies', nargs='+', default=POLICIES)
+    parser.add_argument('--seconds', type=float, default=2.0, help='duração da medição em série por política')
+    parser.add_argument('--threads', type=int, default=8, help='clientes simultâneos na rajada')
+    parser.add_argument('--burst', type=int, default=4, help='logins por cliente na rajada')
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    pool_cores = min(password_hasher.workers, cores)
+    print(f"🔐 {cores} núcleo(s); pool de verificação com {password_hasher.workers} threads, "
+          f"fila de {password_hasher.max_pending}")
+
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+
+        for index, policy in enumerate(args.policies):
+            password_hasher.method = canonical_method(policy)
+            email = f'bench{index}@example.com'
+            user = User(name='Bench', email=email)
+            user.set_password(PASSWORD)
+            db.session.add(user)
+            db.session.commit()
+
+            count, elapsed = timed_logins(client, email, args.seconds)
+            ok, busy, burst_elapsed = burst(email, args.threads, args.burst)
+            print(f"  {policy:<24} {count / elapsed:8.1f} logins/s/núcleo em série | "
+                  f"rajada: {ok / burst_elapsed:8.1f} logins/s "
+                  f"({ok / burst_elapsed / pool_cores:.1f}/núcleo do pool), {busy} recusados (503)")
+
+
+if __name__ == "__main__":
+    main()
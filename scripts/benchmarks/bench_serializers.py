@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos serializadores compilados contra os to_dict escritos à mão
+(versão antiga copiada abaixo) em personagens, habilidades e itens
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, os.path.abspath(api_path))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from models import db, SERIALIZERS, Character, Skill, Item
+
+
+def legacy_character(self):
+    return {
+        'id': self.id,
+        'name': self.name,
+        'player_name': self.player_name,
+        'age': self.age,
+        'skilled_in': self.skilled_in,
+        'character_class': self.character_class,
+        'nex': self.nex,
+        'avatar_url': self.avatar_url,
+        'agilidade': self.agilidade,
+        'intelecto': self.intelecto,
+        'vigor': self.vigor,
+        'presenca': self.presenca,
+        'forca': self.forca,
+        'gender': self.gender,
+        'appearance': self.appearance,
+        'personality': self.personality,
+        'background': self.background,
+        'objective': self.objective,
+        'origin': self.origin,
+        'user_id': self.user_id,
+        'current_pv': self.current_pv,
+        'current_pe': self.current_pe,
+        'current_ps': self.current_ps,
+        'max_pv': self.calculate_max_pv(),
+        'max_pe': self.calculate_max_pe(),
+        'max_ps': self.calculate_max_ps(),
+        'created_at': self.created_at.isoformat() if self.created_at else None,
+        'updated_at': self.updated_at.isoformat() if self.updated_at else None
+    }
+
+
+def legacy_skill(self):
+    return {
+        'id': self.id,
+        'character_id': self.character_id,
+        'name': self.name,
+        'attribute': self.attribute,
+        'bonus_dice': self.bonus_dice,
+        'training': self.training,
+        'others': self.others,
+        'description': self.description,
+        'created_at': self.created_at.isoformat() if self.created_at else None,
+        'updated_at': self.updated_at.isoformat() if self.updated_at else None
+    }
+
+
+def legacy_item(self):
+    return {
+        'id': self.id,
+        'character_id': self.character_id,
+        'name': self.name,
+        'category': self.category,
+        'weight': self.weight,
+        'description': self.description,
+        'quantity': self.quantity,
+        'created_at': self.created_at.isoformat() if self.created_at else None,
+        'updated_at': self.updated_at.isoformat() if self.updated_at else None
+    }
+
+
+def build_session(rows):
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine)
+    session = Session(engine)
+    session.execute(insert(Character), [
+        {'id': i, 'name': f'c{i}', 'age': 20, 'skilled_in': 'Luta', 'nex': 5, 'agilidade': 2,
+         'intelecto': 1, 'vigor': 3, 'presenca': 2, 'forca': 1, 'current_pv': 20}
+        for i in range(1, rows + 1)
+    ])
+    session.execute(insert(Skill), [
+        {'character_id': i, 'name': f's{i}', 'attribute': 'AGI', 'training': 5}
+        for i in range(1, rows + 1)
+    ])
+    session.execute(insert(Item), [
+        {'character_id': i, 'name': f'i{i}', 'category': 'arma', 'weight': 1.5}
+        for i in range(1, rows + 1)
+    ])
+    session.commit()
+    return session
+
+
+def timed(function, objs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(objs)
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    session = build_session(args.rows)
+    cases = [
+        ('Character', Character, legacy_character),
+        ('Skill', Skill, legacy_skill),
+        ('Item', Item, legacy_item),
+    ]
+
+    print(f"{'modelo':<10} {'to_dict (ms)':>13} {'compilado (ms)':>15} {'ganho':>7}  saída idêntica")
+    for label, model, legacy in cases:
+        objs = session.scalars(select(model)).all()
+        expected, legacy_ms = timed(lambda rows: [legacy(obj) for obj in rows], objs, args.repeat)
+        result, compiled_ms = timed(SERIALIZERS[model].many, objs, args.repeat)
+        identical = json.dumps(expected) == json.dumps(result)
+        print(f"{label:<10} {legacy_ms:>13.2f} {compiled_ms:>15.2f} {legacy_ms / compiled_ms:>6.1f}x  {identical}")
+
+    subset = SERIALIZERS[Character].only(['id', 'name', 'nex'])
+    objs = session.scalars(select(Character)).all()
+    _, subset_ms = timed(subset.many, objs, args.repeat)
+    print(f"{'Character (id, name, nex)':<26} compilado {subset_ms:.2f} ms")
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
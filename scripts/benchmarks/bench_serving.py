@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do servidor de produção (gunicorn.conf.py + wsgi.py): sobe o
+gunicorn com 1, 2, 4... processos e mede requisições por segundo e latência
+com clientes em processos separados usando conexões keep-alive
+
+A rota padrão (POST /api/dice/roll com 100 rolagens) é CPU em Python, então a
+vazão deve crescer com os processos até o número de núcleos; os clientes
+rodam na mesma máquina e disputam os núcleos com o servidor. Usa um banco e um
+cache temporários, sem tocar no rpg.db.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+api_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main'))
+
+ROLL_BODY = json.dumps({'expression': '4d6kh3+2', 'times': 100})
+
+
+def request(connection, method, path, body):
+    headers = {'Content-Type': 'application/json'} if body else {}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    response.read()
+    return response.status
+
+
+def client(port, method, path, body, connections, duration):
+    """Processo cliente: `connections` threads com uma conexão keep-alive cada"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = request(connection, method, path, body)
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                status = None
+            if status == 200:
+                local.append(time.perf_counter() - start)
+            else:
+                failed += 1
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def start_server(port, workers, threads, workdir):
+    env = dict(
+        os.environ,
+        FLASK_CONFIG='production',
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        RESPONSE_CACHE_PATH=os.path.join(workdir, 'response_cache.db'),
+        SERVER_BIND=f'127.0.0.1:{port}',
+        SERVER_WORKERS=str(workers),
+        SERVER_THREADS=str(threads),
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=api_path, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            if request(connection, 'GET', '/health', None) == 200:
+                connection.close()
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError('o gunicorn não respondeu em 30 s')
+
+
+def stop_server(server):
+    server.terminate()  # SIGTERM: desligamento gracioso
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def run(port, workers, args, workdir):
+    server = start_server(port, workers, args.threads, workdir)
+    try:
+        body = ROLL_BODY if args.method == 'POST' else None
+        task = (port, args.method, args.path, body, args.connections, args.duration)
+        with multiprocessing.Pool(args.clients) as pool:
+            # Aquecimento: todos os processos do servidor importam e compilam as rotas
+            pool.starmap(client, [(port, args.method, args.path, body, args.connections, 1.0)] * args.clients)
+            start = time.perf_counter()
+            results = pool.starmap(client, [task] * args.clients)
+            elapsed = time.perf_counter() - start
+    finally:
+        stop_server(server)
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(failed for _, failed in results)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    return len(latencies) / elapsed, statistics.median(latencies) if latencies else 0.0, p99, errors
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1))) or [1]
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers, help='processos do servidor a medir')
+    parser.add_argument('--threads', type=int, default=4, help='threads por processo do servidor')
+    parser.add_argument('--clients', type=int, default=max(2, cores), help='processos clientes')
+    parser.add_argument('--connections', type=int, default=4, help='conexões keep-alive por cliente')
+    parser.add_argument('--duration', type=float, default=5.0, help='segundos de medição por configuração')
+    parser.add_argument('--method', default='POST')
+    parser.add_argument('--path', default='/api/dice/roll')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("❌ gunicorn não está instalado: pip install -r SigilRPG_API-main/requirements.txt", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"🌐 {cores} núcleo(s); {args.method} {args.path}, {args.clients} clientes x "
+          f"{args.connections} conexões, {args.threads} threads por processo, {args.duration:.0f} s")
+    baseline = None
+    with tempfile.TemporaryDirectory() as workdir:
+        for workers in args.workers:
+            throughput, p50, p99, errors = run(args.port, workers, args, workdir)
+            baseline = baseline or throughput
+            print(f"  {workers:>3} processo(s) {throughput:9.1f} req/s | {throughput / baseline:5.2f}x | "
+                  f"p50 {p50 * 1000:7.1f} ms | p99 {p99 * 1000:7.1f} ms | {errors} erros")
+
+
+if __name__ == "__main__":
+    main()
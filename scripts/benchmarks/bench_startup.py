@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização da API: import a frio do módulo app,
+create_app por configuração e latência da primeira requisição (cada medição
+em um processo Python novo), além do custo de uma app de teste nova com
+tabelas criadas, como a fixture `app` do conftest faz a cada teste
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+api_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main'))
+
+# Executado em um processo novo; imprime os tempos em JSON
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+flask_app = app_module.create_app(sys.argv[1])
+created = time.perf_counter()
+if sys.argv[2] == 'tables':
+    from models import db
+    with flask_app.app_context():
+        db.create_all()
+ready = time.perf_counter()
+response = flask_app.test_client().get('/health')
+assert response.status_code == 200
+first_request = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'create_app': created - imported,
+    'first_request': first_request - ready,
+    'modules': len(sys.modules),
+}))
+"""
+
+
+def probe(config_name, runs, tables):
+    samples = []
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE, config_name, 'tables' if tables else 'no-tables'],
+            cwd=api_path, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+
+def fresh_test_apps(runs):
+    """Tempo médio de create_app('testing') + create_all no mesmo processo"""
+    sys.path.insert(0, api_path)
+    from app import create_app
+    from models import db
+
+    create_app('testing')  # aquece imports
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        flask_app = create_app('testing')
+        with flask_app.app_context():
+            db.create_all()
+            db.session.remove()
+            db.drop_all()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5, help='processos novos por configuração')
+    parser.add_argument('--apps', type=int, default=50, help='apps de teste criadas em processo')
+    parser.add_argument('--configs', nargs='+', default=['testing', 'production', 'development'])
+    args = parser.parse_args()
+
+    print(f"🚀 Inicialização ({args.runs} processos por configuração, mediana em ms)")
+    for config_name in args.configs:
+        samples = probe(config_name, args.runs, tables=config_name == 'testing')
+        median = {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+        print(f"  {config_name:<12} import {median['import'] * 1000:7.1f} | "
+              f"create_app {median['create_app'] * 1000:7.1f} | "
+              f"1ª requisição {median['first_request'] * 1000:6.1f} | "
+              f"{int(median['modules'])} módulos")
+
+    timings = fresh_test_apps(args.apps)
+    print(f"🧪 App de teste nova + create_all: mediana {statistics.median(timings) * 1000:.1f} ms, "
+          f"máx {max(timings) * 1000:.1f} ms ({args.apps} apps)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Fixtures compartilhadas para os testes em processo da API (sem servidor rodando)
+"""
+import os
+import sys
+
+import pytest
+
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, os.path.abspath(api_path))
+
+
+@pytest.fixture
+def app():
+    """App nova (TestingConfig, banco em memória) com tabelas recém-criadas para cada teste"""
+    from app import create_app
+    from models import db
+    from response_cache import response_cache
+    from token_blocklist import token_blocklist
+    from user_cache import user_cache
+    import ritual_catalog
+
+    flask_app = create_app('testing')
+    response_cache.clear()
+    user_cache.clear()
+    token_blocklist.clear()
+    ritual_catalog.invalidate()
+    with flask_app.app_context():
+        db.create_all()
+        # Lista de revogados já sincronizada, como em um worker aquecido
+        token_blocklist.refresh()
+        db.session.commit()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def query_counter(app):
+    """Conta as instruções SQL emitidas enquanto o contexto estiver ativo"""
+    from sqlalchemy import event
+    from models import db
+
+    class Counter:
+        def __init__(self):
+            self.count = 0
+
+        def _on_execute(self, *args, **kwargs):
+            self.count += 1
+
+        def __enter__(self):
+            self.count = 0
+            event.listen(db.engine, 'before_cursor_execute', self._on_execute)
+            return self
+
+        def __exit__(self, *exc):
+            event.remove(db.engine, 'before_cursor_execute', self._on_execute)
+
+    return Counter()
+
+
+@pytest.fixture
+def make_user(app):
+    """Cria e grava um usuário (senha padrão 123456); o primeiro criado tem id 1, o admin"""
+    from models import db, User
+
+    def make(name='Dono', email='dono@example.com', password='123456'):
+        user = User(name=name, email=email)
+        user.set_password(password)
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def headers_for(app):
+    """Cabeçalho Authorization com um token de acesso para um usuário (ou id)"""
+    from flask_jwt_extended import create_access_token
+
+    def headers(user):
+        identity = user if isinstance(user, (int, str)) else user.id
+        return {'Authorization': f'Bearer {create_access_token(identity=str(identity))}'}
+
+    return headers
+
+
+@pytest.fixture
+def user(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def auth_headers(user, headers_for):
+    return headers_for(user)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Testes do endpoint de substituição em lote PUT /api/me/<id>/skills
+"""
+from models import db, Character, Skill
+
+
+def _setup(user):
+    character = Character(name='Herói', age=20, skilled_in='Luta', user_id=user.id)
+    db.session.add(character)
+    db.session.flush()
+    kept = Skill(character_id=character.id, name='Luta', attribute='FOR')
+    dropped = Skill(character_id=character.id, name='Furtividade', attribute='AGI')
+    db.session.add_all([kept, dropped])
+    db.session.commit()
+    return character.id, kept.id, dropped.id
+
+
+def test_replace_inserts_updates_and_deletes(client, user, auth_headers):
+    character_id, kept_id, _ = _setup(user)
+
+    response = client.put(f'/api/me/{character_id}/skills', headers=auth_headers, json=[
+        {'id': kept_id, 'name': 'Luta', 'attribute': 'FOR', 'training': 5},
+        {'name': 'Percepção', 'attribute': 'PRE', 'others': 2},
+        {'name': 'Ocultismo', 'attribute': 'INT'},
+    ])
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert [skill['name'] for skill in data] == ['Luta', 'Percepção', 'Ocultismo']
+    assert data[0]['id'] == kept_id and data[0]['training'] == 5
+    assert data[1]['others'] == 2 and data[1]['created_at']
+    assert Skill.query.filter_by(character_id=character_id, name='Furtividade').count() == 0
+
+
+def test_replace_rejects_foreign_ids_without_changes(client, user, auth_headers):
+    character_id, kept_id, _ = _setup(user)
+
+    response = client.put(f'/api/me/{character_id}/skills', headers=auth_headers, json=[
+        {'id': 999, 'name': 'Luta'},
+        {'name': ''},
+    ])
+
+    assert response.status_code == 400
+    assert set(response.get_json()['errors']) == {'0', '1'}
+    assert Skill.query.filter_by(character_id=character_id).count() == 2
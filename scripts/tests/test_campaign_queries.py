@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Garante que o detalhe da campanha usa um número fixo de consultas (sem N+1)
+"""
+from models import db, Campaign, Character, CampaignCharacter, Party, PartyMember
+
+
+def _create_campaign(members, parties):
+    campaign = Campaign(name='Campanha', master_name='Mestre')
+    db.session.add(campaign)
+    db.session.flush()
+
+    characters = []
+    for index in range(members):
+        character = Character(name=f'Personagem {index}', age=20, skilled_in='Luta')
+        db.session.add(character)
+        characters.append(character)
+    db.session.flush()
+
+    for character in characters:
+        db.session.add(CampaignCharacter(campaign_id=campaign.id, character_id=character.id))
+
+    for index in range(parties):
+        party = Party(campaign_id=campaign.id, name=f'Equipe {index}')
+        db.session.add(party)
+        db.session.flush()
+        for character in characters:
+            db.session.add(PartyMember(party_id=party.id, character_id=character.id))
+
+    db.session.commit()
+    campaign_id = campaign.id
+    db.session.expunge_all()
+    return campaign_id
+
+
+def _count_detail_queries(client, query_counter, campaign_id):
+    with query_counter as counter:
+        response = client.get(f'/api/v1/campaigns/{campaign_id}')
+    assert response.status_code == 200
+    return counter.count, response.get_json()
+
+
+def test_campaign_detail_query_count_is_constant(client, query_counter):
+    small_id = _create_campaign(members=1, parties=1)
+    large_id = _create_campaign(members=12, parties=4)
+
+    small_count, small = _count_detail_queries(client, query_counter, small_id)
+    large_count, large = _count_detail_queries(client, query_counter, large_id)
+
+    assert len(large['members']) == 12
+    assert len(large['parties']) == 4
+    assert all(len(party['members']) == 12 for party in large['parties'])
+    assert all('character' in member for member in large['members'])
+    assert len(small['members']) == 1
+    assert large_count == small_count
+
+
+def test_campaign_update_query_count_is_constant(client, query_counter):
+    small_id = _create_campaign(members=1, parties=1)
+    large_id = _create_campaign(members=10, parties=3)
+
+    counts = []
+    for campaign_id in (small_id, large_id):
+        with query_counter as counter:
+            response = client.patch(f'/api/v1/campaigns/{campaign_id}', json={'notes': 'x'})
+        assert response.status_code == 200
+        counts.append(counter.count)
+
+    assert counts[0] == counts[1]
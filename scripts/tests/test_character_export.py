@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Testes da exportação NDJSON de personagens
+"""
+import json
+
+from models import db, Character, Skill, Ritual, RitualTemplate, Item
+
+
+def _setup(admin, characters=5):
+    template = RitualTemplate(name='Chama', circle=1, cost=2, effect='queima')
+    db.session.add(template)
+    db.session.flush()
+
+    for index in range(characters):
+        character = Character(name=f'Herói {index}', age=20, skilled_in='Luta', user_id=admin.id)
+        db.session.add(character)
+        db.session.flush()
+        db.session.add_all([
+            Skill(character_id=character.id, name='Luta', attribute='FOR'),
+            Item(character_id=character.id, name='Faca', category='arma'),
+            Ritual(character_id=character.id, template_id=template.id, name='Chama', circle=1, cost=2),
+        ])
+    db.session.commit()
+
+
+def _records(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_export_streams_characters_with_children(client, query_counter, user, auth_headers):
+    _setup(user)
+
+    with query_counter as counter:
+        response = client.get('/api/characters/export?batch_size=2', headers=auth_headers)
+        records = _records(response)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert [record['name'] for record in records] == [f'Herói {index}' for index in range(5)]
+    assert records[0]['skills'][0]['name'] == 'Luta'
+    assert records[0]['items'][0]['name'] == 'Faca'
+    assert records[0]['rituals'][0]['effect'] == 'queima'
+    # 3 lotes x 3 tabelas filhas + personagens + catálogo (em cache após o 1º lote)
+    assert counter.count <= 12
+
+
+def test_export_resumes_after_id_and_is_admin_only(client, user, auth_headers, make_user, headers_for):
+    _setup(user)
+    other_headers = headers_for(make_user('Outro', 'outro@example.com'))
+
+    first = _records(client.get('/api/characters/export', headers=auth_headers))
+    resumed = _records(client.get(
+        f"/api/characters/export?after_id={first[2]['id']}", headers=auth_headers
+    ))
+    assert resumed == first[3:]
+
+    assert client.get('/api/characters/export', headers=other_headers).status_code == 403
+    assert client.get('/api/characters/export?after_id=x', headers=auth_headers).status_code == 400
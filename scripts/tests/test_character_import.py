@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Testes da importação em lote de personagens (NDJSON)
+"""
+import json
+
+import character_import
+from models import db, Character, Skill, Ritual, RitualTemplate, Item
+
+
+def _template():
+    template = RitualTemplate(name='Chama', circle=2, cost=3, effect='queima')
+    db.session.add(template)
+    db.session.commit()
+    return template.id
+
+
+def _ndjson(*records):
+    return '\n'.join(record if isinstance(record, str) else json.dumps(record) for record in records)
+
+
+def test_import_inserts_valid_rows_and_reports_errors(client, query_counter, user, auth_headers):
+    template_id = _template()
+    body = _ndjson(
+        {'name': 'Herói', 'age': 20, 'skilled_in': 'Luta', 'vigor': 2,
+         'skills': [{'name': 'Luta', 'attribute': 'FOR'}],
+         'rituals': [{'template_id': template_id}],
+         'items': [{'name': 'Faca', 'category': 'arma', 'quantity': 2}]},
+        {'name': '', 'age': 20, 'skilled_in': 'Luta'},
+        '{quebrado',
+        {'name': 'Vilã', 'age': 300, 'skilled_in': 'Magia'},
+        {'name': 'Sem nome na skill', 'age': 30, 'skilled_in': 'x', 'skills': [{'attribute': 'AGI'}]},
+        {'name': 'Coadjuvante', 'age': 30, 'skilled_in': 'Fuga'},
+    )
+
+    with query_counter as counter:
+        response = client.post('/api/me/import?chunk_size=10', headers=auth_headers, data=body,
+                               content_type='application/x-ndjson')
+    report = response.get_json()['data']
+
+    assert response.status_code == 200
+    assert report['imported'] == 2
+    assert {error['line']: set(error['errors']) for error in report['errors']} == {
+        2: {'name'}, 3: {'json'}, 4: {'age'}, 5: {'skills.0.name'},
+    }
+    # Usuário + catálogo + um INSERT por tabela no bloco
+    assert counter.count <= 8
+
+    hero = Character.query.filter_by(name='Herói').one()
+    assert hero.user_id == user.id
+    assert hero.current_pv == hero.calculate_max_pv() == 22
+    assert Skill.query.filter_by(character_id=hero.id).one().attribute == 'FOR'
+    assert Item.query.filter_by(character_id=hero.id).one().quantity == 2
+    ritual = Ritual.query.filter_by(character_id=hero.id).one()
+    assert (ritual.name, ritual.circle, ritual.template_id) == ('Chama', 2, template_id)
+
+
+def test_import_accepts_export_output(client, auth_headers):
+    client.post('/api/me/import', headers=auth_headers, data=_ndjson(*[
+        {'name': f'Herói {index}', 'age': 20, 'skilled_in': 'Luta', 'skills': [{'name': 'Luta'}]}
+        for index in range(5)
+    ]))
+
+    exported = client.get('/api/characters/export', headers=auth_headers).get_data(as_text=True)
+    response = client.post('/api/me/import?chunk_size=2', headers=auth_headers, data=exported)
+
+    assert response.get_json()['data']['imported'] == 5
+    assert Character.query.count() == 10
+    assert Skill.query.count() == 10
+
+
+def test_malformed_rows_do_not_abort_import(client, monkeypatch, auth_headers):
+    validate = character_import.validate_character_data
+
+    def explode(data):
+        if data.get('name') == 'Bomba':
+            raise RuntimeError('inesperado')
+        return validate(data)
+
+    monkeypatch.setattr(character_import, 'validate_character_data', explode)
+    body = '\n'.join([
+        _ndjson({'name': 'Herói', 'age': 20, 'skilled_in': 'Luta', 'items': [{'name': 'Faca', 'category': 3}]}),
+        _ndjson({'name': 'Herói', 'age': 20, 'skilled_in': 'Luta', 'skills': [{'name': 'Luta', 'attribute': ['FOR']}]}),
+        _ndjson({'name': 'Bomba', 'age': 20, 'skilled_in': 'Luta'}),
+    ]).encode('utf-8') + b'\n{"name": "\xff"}\n' + _ndjson(
+        {'name': 'Coadjuvante', 'age': 30, 'skilled_in': 'Fuga', 'items': [{'name': 'Corda'}]},
+    ).encode('utf-8')
+
+    response = client.post('/api/me/import', headers=auth_headers, data=body,
+                           content_type='application/x-ndjson')
+    report = response.get_json()['data']
+
+    assert response.status_code == 200
+    assert report['imported'] == 1
+    assert {error['line']: set(error['errors']) for error in report['errors']} == {
+        1: {'items.0.category'}, 2: {'skills.0.attribute'}, 3: {'data'}, 4: {'encoding'},
+    }
+    assert Item.query.one().category == 'equipamento'
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Testes da listagem paginada por cursor de GET /api/characters
+"""
+from models import db, Character, User
+from pagination import MAX_PAGE_SIZE
+
+
+def _characters(count, **fields):
+    characters = [
+        Character(name=f'Personagem {index}', age=20, skilled_in='Luta', **fields)
+        for index in range(count)
+    ]
+    db.session.add_all(characters)
+    db.session.commit()
+    return [character.id for character in characters]
+
+
+def test_cursor_walks_every_page_once(client):
+    ids = _characters(5)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        url = '/api/characters/?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200
+        seen += [character['id'] for character in response.get_json()]
+        pages += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            break
+
+    assert seen == ids
+    assert pages == 3
+
+    # Página exata: sem cabeçalho quando não há próxima
+    last = client.get('/api/characters/?limit=5')
+    assert len(last.get_json()) == 5
+    assert 'X-Next-Cursor' not in last.headers
+
+
+def test_filters_and_limit_cap(client):
+    user = User(name='Dona', email='dona@example.com')
+    user.set_password('123456')
+    db.session.add(user)
+    db.session.commit()
+    low = _characters(2, nex=5, character_class='Combatente', user_id=user.id)
+    high = _characters(2, nex=50, character_class='Ocultista', origin='Acadêmico')
+
+    def ids(query):
+        response = client.get(f'/api/characters/?{query}')
+        assert response.status_code == 200
+        return [character['id'] for character in response.get_json()]
+
+    assert ids(f'user_id={user.id}') == low
+    assert ids('nex_min=10') == high
+    assert ids('nex_max=10&character_class=Combatente') == low
+    assert ids('origin=Acadêmico&nex_min=50&nex_max=50') == high
+    assert ids('character_class=Especialista') == []
+
+    _characters(MAX_PAGE_SIZE)
+    response = client.get(f'/api/characters/?limit={MAX_PAGE_SIZE * 10}')
+    assert len(response.get_json()) == MAX_PAGE_SIZE
+    assert 'X-Next-Cursor' in response.headers
+
+
+def test_invalid_pagination_and_filters(client):
+    _characters(1)
+    for query in ('limit=0', 'limit=abc', 'cursor=%25%25', 'cursor=WzFd'):
+        response = client.get(f'/api/characters/?{query}')
+        assert response.status_code == 400, query
+        assert response.get_json()['message'] == 'invalid_pagination'
+
+    for key in ('user_id', 'nex_min', 'nex_max'):
+        response = client.get(f'/api/characters/?{key}=x')
+        assert response.status_code == 400, key
+        assert response.get_json() == {'message': 'invalid_filters', 'error': key}
+
+    # Parâmetros vazios são ignorados, como ausentes
+    assert len(client.get('/api/characters/?user_id=&nex_min=').get_json()) == 1
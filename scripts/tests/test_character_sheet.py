@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Testes da ficha agregada GET /api/me/<id>/sheet
+"""
+from models import (
+    db, Character, Skill, Ritual, Item,
+    Campaign, CampaignCharacter, Party, PartyMember,
+)
+
+
+def _create_character(user, size):
+    character = Character(name='Herói', age=20, skilled_in='Luta', user_id=user.id)
+    db.session.add(character)
+    db.session.flush()
+
+    for index in range(size):
+        db.session.add(Skill(character_id=character.id, name=f'Skill {index}', attribute='AGI'))
+        db.session.add(Ritual(character_id=character.id, name=f'Ritual {index}', circle=1, cost=1))
+        db.session.add(Item(character_id=character.id, name=f'Item {index}', category='arma'))
+
+        campaign = Campaign(name=f'Campanha {index}', master_name='Mestre')
+        db.session.add(campaign)
+        db.session.flush()
+        party = Party(campaign_id=campaign.id, name=f'Equipe {index}')
+        db.session.add(party)
+        db.session.flush()
+        db.session.add(CampaignCharacter(campaign_id=campaign.id, character_id=character.id))
+        db.session.add(PartyMember(party_id=party.id, character_id=character.id))
+
+    db.session.commit()
+    return character.id
+
+
+def test_sheet_query_count_is_constant(client, query_counter, user, auth_headers):
+    small_id = _create_character(user, 1)
+    large_id = _create_character(user, 8)
+    db.session.expunge_all()
+
+    counts = []
+    for character_id, size in ((small_id, 1), (large_id, 8)):
+        with query_counter as counter:
+            response = client.get(f'/api/me/{character_id}/sheet', headers=auth_headers)
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        for section in ('skills', 'rituals', 'items', 'campaigns', 'parties'):
+            assert len(data[section]) == size
+        assert data['campaigns'][0]['campaign']['name'].startswith('Campanha')
+        assert data['parties'][0]['party']['name'].startswith('Equipe')
+        counts.append(counter.count)
+
+    assert counts[0] == counts[1]
+
+
+def test_sheet_section_selection(client, user, auth_headers):
+    character_id = _create_character(user, 2)
+
+    response = client.get(f'/api/me/{character_id}/sheet?sections=skills,items', headers=auth_headers)
+    data = response.get_json()['data']
+    assert len(data['skills']) == 2
+    assert 'rituals' not in data and 'campaigns' not in data
+
+    response = client.get(f'/api/me/{character_id}/sheet?sections=spells', headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Testes do motor de combate e do replay de lutas
+"""
+import combat
+from models import db, Character, Skill, Fight
+
+
+def test_resolve_is_deterministic_and_stat_driven():
+    strong = combat.Fighter(pv=40, pe=10, agilidade=4, attack_dice=4, attack_bonus=10,
+                            defense=14, damage_bonus=4)
+    weak = combat.Fighter(pv=15, pe=0, agilidade=0, attack_dice=0, attack_bonus=0,
+                          defense=10, damage_bonus=0)
+
+    assert combat.resolve(strong, weak, 123) == combat.resolve(strong, weak, 123)
+
+    results = [combat.resolve(strong, weak, seed) for seed in range(200)]
+    assert sum(result.status == 'won' for result in results) > 190
+    for result in results:
+        assert result.log and len(result.log[0]) == 6
+        assert result.rounds == result.log[-1][0]
+
+
+def test_create_fight_stores_seed_and_replays(client, user, auth_headers):
+    character = Character(name='Herói', age=20, skilled_in='Luta', user_id=user.id, forca=3)
+    opponent = Character(name='Rival', age=20, skilled_in='Luta')
+    db.session.add_all([character, opponent])
+    db.session.flush()
+    db.session.add(Skill(character_id=character.id, name='Luta', attribute='FOR', training=5))
+    db.session.commit()
+
+    response = client.post('/api/me/fights/', headers=auth_headers, json={'opponent_id': opponent.id})
+    assert response.status_code == 201
+    data = response.get_json()['data']
+    assert data['seed'] is not None and data['rounds'] >= 1
+    assert 'combat_log' not in data
+
+    fight = db.session.get(Fight, data['id'])
+    first, second = combat.replay(fight.seed, fight.combat_log)[1]
+    assert (first.attack_dice, first.attack_bonus) == (3, 5)
+
+    replay = client.get(f"/api/me/fights/{data['id']}/replay", headers=auth_headers).get_json()['data']
+    assert replay['matches'] is True
+    assert replay['status'] == data['status']
+    assert replay['log'][-1][0] == data['rounds']
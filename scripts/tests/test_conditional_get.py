@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Testes de GET condicional (ETag / Last-Modified)
+"""
+from models import db, Character, Campaign, CampaignCharacter
+
+
+def _setup(user):
+    character = Character(name='Herói', age=20, skilled_in='Luta', user_id=user.id)
+    campaign = Campaign(name='Campanha', master_name='Mestre')
+    db.session.add_all([character, campaign])
+    db.session.flush()
+    db.session.add(CampaignCharacter(campaign_id=campaign.id, character_id=character.id))
+    db.session.commit()
+    return character.id, campaign.id
+
+
+def _revalidate(client, url, response, headers=None):
+    return client.get(url, headers={**(headers or {}), 'If-None-Match': response.headers['ETag']})
+
+
+def test_character_reads_return_304_when_unchanged(client, query_counter, user, auth_headers):
+    character_id, _ = _setup(user)
+
+    for url, auth in ((f'/api/characters/{character_id}', None), (f'/api/me/{character_id}', auth_headers)):
+        first = client.get(url, headers=auth)
+        assert first.status_code == 200
+        assert first.headers['ETag'] and first.headers['Last-Modified']
+
+        with query_counter as counter:
+            second = _revalidate(client, url, first, auth)
+        assert second.status_code == 304
+        assert second.data == b''
+        assert counter.count == 1
+
+    client.patch(f'/api/me/{character_id}', headers=auth_headers, json={'name': 'Outro'})
+    third = _revalidate(client, f'/api/characters/{character_id}', first)
+    assert third.status_code == 200
+
+
+def test_child_lists_change_etag_on_write(client, user, auth_headers):
+    character_id, _ = _setup(user)
+    url = f'/api/me/{character_id}/skills'
+
+    first = client.get(url, headers=auth_headers)
+    assert _revalidate(client, url, first, auth_headers).status_code == 304
+
+    client.post(url, headers=auth_headers, json={'name': 'Luta'})
+    second = _revalidate(client, url, first, auth_headers)
+    assert second.status_code == 200
+    assert len(second.get_json()['data']) == 1
+
+    # Coleções só são validadas pelo ETag: apagar a linha mais recente não
+    # avança nenhum updated_at, então If-Modified-Since daria 304 obsoleto
+    assert 'Last-Modified' not in second.headers
+    client.post(url, headers=auth_headers, json={'name': 'Fuga'})
+    third = client.get(url, headers=auth_headers)
+    newest = third.get_json()['data'][-1]['id']
+    assert client.delete(f'{url}/{newest}', headers=auth_headers).status_code == 200
+    stale = client.get(url, headers={**auth_headers, 'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert stale.status_code == 200
+    assert _revalidate(client, url, third, auth_headers).status_code == 200
+
+
+def test_campaign_detail_changes_etag_on_membership_update(client, user):
+    character_id, campaign_id = _setup(user)
+    url = f'/api/v1/campaigns/{campaign_id}'
+
+    first = client.get(url)
+    assert _revalidate(client, url, first).status_code == 304
+
+    client.patch(f'{url}/characters/{character_id}', json={'role': 'Tanque'})
+    second = _revalidate(client, url, first)
+    assert second.status_code == 200
+    assert second.get_json()['members'][0]['role'] == 'Tanque'
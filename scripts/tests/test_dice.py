@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Testes do motor de dados e das rotas /api/dice
+"""
+import random
+from collections import Counter
+from itertools import product
+
+import pytest
+
+import dice
+import dice_routes
+
+
+def test_compile_normalizes_and_caches():
+    expression = dice.compile_expression(' d20 + 2D6 - 1 ')
+    assert expression.notation == '1d20+2d6-1'
+    assert dice.compile_expression(' d20 + 2D6 - 1 ') is expression
+    assert dice.compile_expression('4d6kh4').notation == '4d6'
+    assert expression.bounds == (2, 31)
+
+    for invalid in ['', '3d', '2d6 3', 'd1', '3d6kh4', '1000d6', 'abc']:
+        with pytest.raises(dice.DiceError):
+            dice.compile_expression(invalid)
+
+
+@pytest.mark.parametrize('notation', ['3d20kh1+5', '2d6+1d4-1', '4d6kh3', '3d6kl2', '5-1d4'])
+def test_distribution_matches_enumeration(notation):
+    terms = dice.compile_expression(notation).terms
+    spaces = []
+    for term in terms:
+        if term.count == 0:
+            spaces.append([term.sign * term.sides])
+        else:
+            spaces.append([
+                term.sign * sum(dice._kept(list(rolls), term))
+                for rolls in product(range(1, term.sides + 1), repeat=term.count)
+            ])
+    counts = Counter(sum(combo) for combo in product(*spaces))
+    outcomes = sum(counts.values())
+
+    result = dice.distribution(notation)
+    assert dict(result['outcomes']) == pytest.approx({total: ways / outcomes for total, ways in counts.items()})
+    assert (result['min'], result['max']) == (min(counts), max(counts))
+
+
+def test_roll_respects_seed_and_keep():
+    expression = dice.compile_expression('3d20kh1+5')
+    first = expression.roll(random.Random(7))
+    assert first == expression.roll(random.Random(7))
+    rolls = first['terms'][0]
+    assert rolls['kept'] == [max(rolls['rolls'])]
+    assert first['total'] == rolls['kept'][0] + 5
+
+
+def test_dice_routes(client):
+    response = client.post('/api/dice/roll', json={'expressions': ['2d6+1', 'd20'], 'times': 3, 'seed': 1})
+    assert response.status_code == 200
+    results = response.get_json()['data']['results']
+    assert [result['expression'] for result in results] == ['2d6+1', '1d20']
+    assert all(len(result['rolls']) == 3 for result in results)
+    again = client.post('/api/dice/roll', json={'expressions': ['2d6+1', 'd20'], 'times': 3, 'seed': 1})
+    assert again.get_json()['data']['results'] == results
+
+    assert client.post('/api/dice/roll', json={'expression': '2x6'}).status_code == 400
+    assert client.post('/api/dice/roll', json={'expression': 'd6', 'times': 0}).status_code == 400
+
+    # Limite de dados por requisição: expressões x termos x times
+    heavy = '+'.join(['100d1000'] * 20)
+    response = client.post('/api/dice/roll', json={'expressions': [heavy] * 50, 'times': 100})
+    assert response.status_code == 400
+    assert response.get_json() == {'message': 'too_many_dice', 'max': dice_routes.MAX_TOTAL_DICE}
+    assert client.post('/api/dice/roll', json={'expressions': ['100d6'] * 10, 'times': 10}).status_code == 200
+    assert client.post('/api/dice/roll', json={'expressions': ['100d6'] * 10, 'times': 11}).status_code == 400
+
+    data = client.get('/api/dice/distribution?expression=2d6&dc=7').get_json()['data']
+    assert data['mean'] == pytest.approx(7)
+    assert data['success_probability'] == pytest.approx(21 / 36)
+    assert client.get('/api/dice/distribution?expression=100d1000').status_code == 400
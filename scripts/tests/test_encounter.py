@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Testes do estimador de Monte Carlo de encontros
+"""
+import pytest
+
+pytest.importorskip('numpy')
+
+import combat
+import encounter
+from models import db, Campaign, Character, Party, PartyMember
+from process_pool import process_pool, ProcessPoolBusy
+
+HERO = combat.Fighter(pv=25, pe=10, agilidade=2, attack_dice=3, attack_bonus=5,
+                      defense=12, damage_bonus=2)
+RIVAL = combat.Fighter(pv=30, pe=0, agilidade=1, attack_dice=2, attack_bonus=0,
+                       defense=11, damage_bonus=3)
+
+
+def test_estimate_agrees_with_combat_engine():
+    hero, rival = HERO, RIVAL
+    result = encounter.estimate([hero], [rival], simulations=20000, seed=7)
+    scalar = sum(combat.resolve(hero, rival, seed).status == 'won' for seed in range(4000)) / 4000
+
+    low, high = result['win_probability']['ci95']
+    assert low - 0.03 <= scalar <= high + 0.03
+    assert result == encounter.estimate([hero], [rival], simulations=20000, seed=7)
+    total = sum(result[key]['value'] for key in ('win_probability', 'loss_probability', 'draw_probability'))
+    assert total == pytest.approx(1.0, abs=1e-3)
+
+
+def test_simulate_endpoint(client, auth_headers):
+    campaign = Campaign(name='Campanha', master_name='Mestre')
+    db.session.add(campaign)
+    db.session.flush()
+    party = Party(campaign_id=campaign.id, name='Equipe')
+    heroes = [Character(name=f'Herói {index}', age=20, skilled_in='Luta', forca=3, vigor=3)
+              for index in range(2)]
+    goblin = Character(name='Goblin', age=5, skilled_in='Fuga', forca=0, vigor=0, agilidade=1)
+    db.session.add_all([party, goblin, *heroes])
+    db.session.flush()
+    db.session.add_all([PartyMember(party_id=party.id, character_id=hero.id) for hero in heroes])
+    db.session.commit()
+
+    url = f'/api/v1/campaigns/{campaign.id}/parties/{party.id}/simulate'
+    body = {'opponent_ids': [goblin.id, goblin.id], 'simulations': 5000, 'seed': 1}
+    assert client.post(url, json=body).status_code == 401
+    response = client.post(url, json=body, headers=auth_headers)
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data['simulations'] == 5000
+    assert data['win_probability']['value'] > 0.9
+    assert [member['name'] for member in data['party']] == ['Herói 0', 'Herói 1']
+    assert all(len(member['expected_hp_loss']['ci95']) == 2 for member in data['party'])
+
+    assert client.post(url, json={'opponent_ids': [999]}, headers=auth_headers).status_code == 404
+    assert client.post(url, json={'opponent_ids': []}, headers=auth_headers).status_code == 400
+    crowd = client.post(url, json={'opponent_ids': [goblin.id] * (encounter.MAX_OPPONENTS + 1)}, headers=auth_headers)
+    assert crowd.status_code == 400
+    assert crowd.get_json() == {'message': 'too_many_opponents', 'max': encounter.MAX_OPPONENTS}
+    assert client.post(url, json={'opponent_ids': [goblin.id], 'simulations': 10 ** 7},
+                       headers=auth_headers).status_code == 400
+
+    # Pool ocupado por outra requisição: 503 imediato em vez de esperar na fila
+    process_pool._slots.acquire()
+    try:
+        response = client.post(url, json={**body, 'simulations': encounter.PARALLEL_THRESHOLD, 'workers': 2},
+                               headers=auth_headers)
+    finally:
+        process_pool._slots.release()
+    assert response.status_code == 503
+    assert response.get_json()['message'] == 'simulation_busy'
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_large_runs_use_the_shared_pool(monkeypatch):
+    monkeypatch.setattr(encounter, 'PARALLEL_THRESHOLD', 1000)
+    parallel = encounter.estimate([HERO], [RIVAL], simulations=2000, workers=2, seed=3)
+    assert parallel['simulations'] == 2000
+    assert parallel['workers'] == min(2, process_pool.workers)
+    assert parallel == encounter.estimate([HERO], [RIVAL], simulations=2000, workers=2, seed=3)
+
+    process_pool._slots.acquire()
+    try:
+        with pytest.raises(ProcessPoolBusy):
+            encounter.estimate([HERO], [RIVAL], simulations=2000, workers=2, seed=3)
+    finally:
+        process_pool._slots.release()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Testes do histórico paginado de lutas e das estatísticas por personagem
+"""
+from datetime import datetime, timedelta
+
+from models import db, Character, Fight
+
+
+def _fights(user):
+    first = Character(name='Primeiro', age=20, skilled_in='Luta', user_id=user.id)
+    second = Character(name='Segundo', age=20, skilled_in='Luta', user_id=user.id)
+    idle = Character(name='Parado', age=20, skilled_in='Luta', user_id=user.id)
+    rival = Character(name='Rival', age=20, skilled_in='Luta')
+    db.session.add_all([first, second, idle, rival])
+    db.session.flush()
+
+    start = datetime(2024, 1, 1)
+    statuses = ['won', 'lost', 'draw', 'won', 'won']
+    for index, status in enumerate(statuses):
+        db.session.add(Fight(character_id=first.id, opponent_id=rival.id, status=status,
+                             experience=10 * (index + 1), created_at=start + timedelta(days=index)))
+    db.session.add(Fight(character_id=second.id, opponent_id=rival.id, status='lost',
+                         experience=7, created_at=start + timedelta(days=10)))
+    db.session.add(Fight(character_id=rival.id, opponent_id=first.id, status='won', experience=99))
+    db.session.commit()
+    return first.id, second.id
+
+
+def test_history_pages_across_characters(client, user, auth_headers):
+    first_id, second_id = _fights(user)
+
+    seen = []
+    url = '/api/me/fights/?limit=4'
+    while True:
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        seen.extend(response.get_json()['data'])
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        url = f'/api/me/fights/?limit=4&cursor={cursor}'
+
+    assert len(seen) == 6
+    assert [fight['id'] for fight in seen] == sorted((fight['id'] for fight in seen), reverse=True)
+    assert {fight['character_id'] for fight in seen} == {first_id, second_id}
+
+    ranged = client.get('/api/me/fights/?since=2024-01-02&until=2024-01-05&status=won',
+                        headers=auth_headers).get_json()['data']
+    assert [fight['experience'] for fight in ranged] == [40]
+    assert client.get('/api/me/fights/?since=ontem', headers=auth_headers).status_code == 400
+    assert client.get('/api/me/fights/?status=fled', headers=auth_headers).status_code == 400
+
+
+def test_stats_group_by_character(client, query_counter, user, auth_headers):
+    first_id, second_id = _fights(user)
+
+    with query_counter as counter:
+        response = client.get('/api/me/fights/stats', headers=auth_headers)
+    assert counter.count == 1
+    data = response.get_json()['data']
+
+    first, second, idle = data['characters']
+    assert (first['character_id'], first['won'], first['lost'], first['draw']) == (first_id, 3, 1, 1)
+    assert (first['total_experience'], first['average_experience']) == (150, 30.0)
+    assert (second['character_id'], second['fights'], second['lost']) == (second_id, 1, 1)
+    assert (idle['fights'], idle['average_experience']) == (0, None)
+    assert data['totals']['fights'] == 6 and data['totals']['total_experience'] == 157
+
+    january = client.get('/api/me/fights/stats?until=2024-01-03', headers=auth_headers).get_json()['data']
+    assert january['characters'][0]['fights'] == 2
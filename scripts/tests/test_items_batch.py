@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Testes das operações de inventário em lote POST /api/me/<id>/items/batch
+"""
+from models import db, Character, Item, Campaign, CampaignCharacter
+
+
+def _setup(user, same_campaign=True):
+    hero = Character(name='Herói', age=20, skilled_in='Luta', user_id=user.id)
+    ally = Character(name='Aliado', age=25, skilled_in='Tiro')
+    campaign = Campaign(name='Campanha', master_name='Mestre')
+    db.session.add_all([hero, ally, campaign])
+    db.session.flush()
+
+    db.session.add(CampaignCharacter(campaign_id=campaign.id, character_id=hero.id))
+    if same_campaign:
+        db.session.add(CampaignCharacter(campaign_id=campaign.id, character_id=ally.id))
+
+    potion = Item(character_id=hero.id, name='Poção', category='consumível', quantity=5)
+    ammo = Item(character_id=ally.id, name='Munição', category='consumível', quantity=10)
+    db.session.add_all([potion, ammo])
+    db.session.commit()
+    return hero.id, ally.id, potion.id
+
+
+def test_batch_applies_all_operations(client, user, auth_headers):
+    hero_id, ally_id, potion_id = _setup(user)
+
+    response = client.post(f'/api/me/{hero_id}/items/batch', headers=auth_headers, json={'operations': [
+        {'op': 'add', 'name': 'Corda', 'category': 'equipamento'},
+        {'op': 'adjust', 'item_id': potion_id, 'delta': -1},
+        {'op': 'transfer', 'item_id': potion_id, 'quantity': 2, 'to_character_id': ally_id},
+        {'op': 'transfer', 'item_id': potion_id, 'quantity': 1, 'to_character_id': ally_id},
+    ]})
+
+    assert response.status_code == 200, response.get_json()
+    items = {item['name']: item for item in response.get_json()['data']}
+    assert items['Poção']['quantity'] == 1
+    assert items['Corda']['quantity'] == 1
+
+    ally_potions = Item.query.filter_by(character_id=ally_id, name='Poção').all()
+    assert len(ally_potions) == 1 and ally_potions[0].quantity == 3
+
+
+def test_batch_is_all_or_nothing(client, user, auth_headers):
+    hero_id, ally_id, potion_id = _setup(user)
+
+    response = client.post(f'/api/me/{hero_id}/items/batch', headers=auth_headers, json={'operations': [
+        {'op': 'adjust', 'item_id': potion_id, 'delta': -2},
+        {'op': 'adjust', 'item_id': potion_id, 'delta': -10},
+    ]})
+
+    assert response.status_code == 409
+    assert response.get_json()['operation_index'] == 1
+    assert db.session.get(Item, potion_id).quantity == 5
+
+
+def test_transfer_requires_shared_campaign(client, user, auth_headers):
+    hero_id, ally_id, potion_id = _setup(user, same_campaign=False)
+
+    response = client.post(f'/api/me/{hero_id}/items/batch', headers=auth_headers, json={'operations': [
+        {'op': 'transfer', 'item_id': potion_id, 'quantity': 1, 'to_character_id': ally_id},
+    ]})
+
+    assert response.status_code == 409
+    assert response.get_json()['message'] == 'character_not_in_same_campaign'
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Testes do ranking de experiência materializado (character_experience)
+"""
+import leaderboard
+from models import db, Campaign, CampaignCharacter, Character, CharacterExperience, Fight
+
+
+def _totals():
+    return {
+        row.character_id: (row.total_experience, row.fights)
+        for row in CharacterExperience.query.all()
+    }
+
+
+def _arena(count):
+    campaign = Campaign(name='Arena', master_name='Mestre')
+    characters = [
+        Character(name=f'Lutador {index}', age=20, skilled_in='Luta', forca=index % 4, agilidade=1)
+        for index in range(count)
+    ]
+    db.session.add_all([campaign, *characters])
+    db.session.flush()
+    db.session.add_all([
+        CampaignCharacter(campaign_id=campaign.id, character_id=character.id)
+        for character in characters
+    ])
+    db.session.commit()
+    return campaign.id, [character.id for character in characters]
+
+
+def test_fight_writes_update_totals_in_same_transaction(client, user, auth_headers):
+    campaign_id, _ = _arena(4)
+    hero = Character(name='Herói', age=20, skilled_in='Luta', user_id=user.id)
+    db.session.add(hero)
+    db.session.commit()
+
+    response = client.post(f'/api/v1/campaigns/{campaign_id}/tournament', json={'seed': 5}, headers=auth_headers)
+    assert response.status_code == 201
+    opponent_id = Character.query.filter(Character.id != hero.id).first().id
+    for _ in range(2):
+        assert client.post('/api/me/fights/', headers=auth_headers, json={'opponent_id': opponent_id}).status_code == 201
+
+    incremental = _totals()
+    expected = {}
+    for fight in Fight.query.all():
+        total, fights = expected.get(fight.character_id, (0, 0))
+        expected[fight.character_id] = (total + fight.experience, fights + 1)
+    assert incremental == expected
+
+    assert leaderboard.rebuild() == len(expected)
+    db.session.commit()
+    assert _totals() == expected
+
+
+def test_leaderboard_pages_by_total(client, query_counter, monkeypatch):
+    campaign_id, ids = _arena(5)
+    outsider = Character(name='Fora', age=20, skilled_in='Luta')
+    db.session.add(outsider)
+    db.session.flush()
+    # Caminho genérico (sem ON CONFLICT), o mesmo usado em outros bancos
+    monkeypatch.setattr(leaderboard, '_UPSERT_DIALECTS', {})
+    leaderboard.record_fights([(ids[0], 30), (ids[1], 50), (ids[2], 30), (outsider.id, 100)])
+    leaderboard.record_fights([(ids[3], 10), (ids[0], 5)])
+    db.session.commit()
+
+    seen = []
+    url = '/api/leaderboard/?limit=2'
+    while url:
+        with query_counter as counter:
+            response = client.get(url)
+        assert counter.count == 1
+        seen.extend(response.get_json()['data'])
+        cursor = response.headers.get('X-Next-Cursor')
+        url = f'/api/leaderboard/?limit=2&cursor={cursor}' if cursor else None
+
+    assert [(row['character_id'], row['total_experience']) for row in seen] == [
+        (outsider.id, 100), (ids[1], 50), (ids[0], 35), (ids[2], 30), (ids[3], 10),
+    ]
+    assert [row['rank'] for row in seen] == [1, 2, 3, 4, 5]
+
+    campaign = client.get(f'/api/v1/campaigns/{campaign_id}/leaderboard?limit=3').get_json()
+    assert [row['character_id'] for row in campaign['entries']] == [ids[1], ids[0], ids[2]]
+    assert client.get('/api/leaderboard/?cursor=xyz').status_code == 400
+    assert client.get('/api/v1/campaigns/999/leaderboard').status_code == 404
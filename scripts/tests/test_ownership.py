@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Testes da resolução de posse em uma consulta para as rotas /api/me
+"""
+import pytest
+
+from models import db, Character, Skill
+
+
+@pytest.fixture
+def ctx(user, auth_headers, make_user, headers_for):
+    other = make_user('Outro', 'outro@example.com')
+
+    character = Character(name='Herói', age=20, skilled_in='Luta', user_id=user.id)
+    db.session.add(character)
+    db.session.flush()
+
+    skill = Skill(character_id=character.id, name='Luta', attribute='FOR')
+    db.session.add(skill)
+    db.session.commit()
+
+    return {
+        'owner': auth_headers,
+        'other': headers_for(other),
+        'ghost': headers_for(999),
+        'character_id': character.id,
+        'skill_id': skill.id,
+    }
+
+
+def test_owner_resolves_child_in_one_query(client, query_counter, ctx):
+    url = f"/api/me/{ctx['character_id']}/skills/{ctx['skill_id']}"
+
+    with query_counter as counter:
+        response = client.get(url, headers=ctx['owner'])
+
+    assert response.status_code == 200
+    assert response.get_json()['data']['id'] == ctx['skill_id']
+    assert counter.count == 1
+
+
+def test_ownership_errors(client, ctx):
+    base = f"/api/me/{ctx['character_id']}"
+
+    response = client.get(f'{base}/skills', headers=ctx['other'])
+    assert response.status_code == 404
+    assert response.get_json()['message'] == 'character_not_found'
+
+    response = client.get(f'{base}/skills', headers=ctx['ghost'])
+    assert response.get_json()['message'] == 'user_not_found'
+
+    response = client.get(f'{base}/skills/999', headers=ctx['owner'])
+    assert response.get_json()['message'] == 'skill_not_found'
+
+    response = client.get(base, headers=ctx['other'])
+    assert response.get_json()['error_detail']
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Testes da política de hash de senhas (rehash no login e pool limitado)
+"""
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+import passwords
+from models import db, User
+from passwords import password_hasher
+
+
+def _user(make_user, password='segredo123'):
+    return make_user('Usuária', 'usuaria@example.com', password)
+
+
+def _login(client, password='segredo123'):
+    return client.post('/api/auth/login', json={'email': 'usuaria@example.com', 'password': password})
+
+
+def test_canonical_method():
+    assert passwords.canonical_method('pbkdf2') == passwords.DEFAULT_METHOD
+    assert passwords.canonical_method('pbkdf2:sha512:1000') == 'pbkdf2:sha512:1000'
+    assert passwords.canonical_method('scrypt:16384') == 'scrypt:16384:8:1'
+    with pytest.raises(ValueError):
+        passwords.canonical_method('md5')
+
+
+@pytest.mark.parametrize('old_method', ['pbkdf2:sha256:2000', 'pbkdf2:sha256:500'])
+def test_login_rehashes_to_current_policy(client, monkeypatch, make_user, old_method):
+    current = password_hasher.method
+    with monkeypatch.context() as patch:
+        patch.setattr(password_hasher, 'method', old_method)
+        user = _user(make_user)
+    assert user.password_hash.startswith(old_method + '$')
+
+    assert _login(client, 'errada').status_code == 401
+    assert db.session.get(User, user.id).password_hash.startswith(old_method + '$')
+
+    assert _login(client).status_code == 200
+    db.session.expire_all()
+    upgraded = db.session.get(User, user.id).password_hash
+    assert upgraded.startswith(current + '$')
+
+    assert _login(client).status_code == 200
+    db.session.expire_all()
+    assert db.session.get(User, user.id).password_hash == upgraded
+
+
+def test_full_queue_returns_503(client, monkeypatch, make_user):
+    _user(make_user)
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(password_hasher, '_slots', slots)
+
+    response = _login(client)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+    slots.release()
+    assert _login(client).status_code == 200
+
+
+def test_queue_limit_stays_below_request_threads():
+    app = Flask(__name__)
+    app.config.update(PASSWORD_HASH_MAX_PENDING=32, SERVER_THREADS=4)
+    assert passwords.PasswordHasher(app).max_pending == 3
+    app.config.update(SERVER_THREADS=1)
+    assert passwords.PasswordHasher(app).max_pending == 1
+    assert passwords.PasswordHasher(Flask(__name__)).max_pending == passwords.DEFAULT_MAX_PENDING
+
+
+def test_other_routes_served_while_queue_is_full(app, client, monkeypatch, make_user, headers_for):
+    headers = headers_for(_user(make_user))
+    db.session.commit()
+
+    # Verificações presas até o fim do teste, ocupando todas as vagas da fila
+    release = threading.Event()
+    check_password_hash = passwords.check_password_hash
+
+    def slow_check(*args):
+        release.wait(10)
+        return check_password_hash(*args)
+
+    monkeypatch.setattr(passwords, 'check_password_hash', slow_check)
+    monkeypatch.setattr(password_hasher, '_slots', threading.BoundedSemaphore(2))
+    statuses = []
+
+    def login():
+        statuses.append(_login(app.test_client()).status_code)
+
+    threads = [threading.Thread(target=login) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while password_hasher._slots._value and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert password_hasher._slots._value == 0
+
+        assert _login(client).status_code == 503
+        assert client.get('/api/me/', headers=headers).status_code == 200
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+    assert statuses == [200, 200]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Testes do cache de respostas das leituras de campanhas
+"""
+from response_cache import MemoryBackend, SQLiteBackend
+
+
+def test_campaign_list_is_cached_and_invalidated(client):
+    client.post('/api/v1/campaigns/', json={'name': 'Primeira', 'master_name': 'Mestre'})
+
+    assert len(client.get('/api/v1/campaigns/').get_json()) == 1
+    assert len(client.get('/api/v1/campaigns/').get_json()) == 1
+    stats = client.get('/health/cache').get_json()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+    client.post('/api/v1/campaigns/', json={'name': 'Segunda', 'master_name': 'Mestre'})
+    assert len(client.get('/api/v1/campaigns/').get_json()) == 2
+    assert client.get('/health/cache').get_json()['misses'] == 2
+
+
+def test_campaign_detail_expires_when_member_character_changes(client):
+    campaign_id = client.post(
+        '/api/v1/campaigns/', json={'name': 'Campanha', 'master_name': 'Mestre'}
+    ).get_json()['id']
+    character_id = client.post('/api/characters/', json={'name': 'Herói'}).get_json()['id']
+    client.post(f'/api/v1/campaigns/{campaign_id}/characters', json={'character_id': character_id})
+
+    url = f'/api/v1/campaigns/{campaign_id}'
+    assert client.get(url).get_json()['members'][0]['character']['name'] == 'Herói'
+
+    client.patch(f'/api/characters/{character_id}', json={'name': 'Renomeado'})
+    assert client.get(url).get_json()['members'][0]['character']['name'] == 'Renomeado'
+
+
+def test_memory_backend_is_bounded():
+    backend = MemoryBackend(max_entries=2, ttl=60)
+    backend.set('a', b'1')
+    backend.set('b', b'2')
+    backend.get('a')
+    backend.set('c', b'3')
+    assert backend.get('b') is None
+    assert backend.get('a') == b'1' and backend.get('c') == b'3'
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    worker_a = SQLiteBackend(path, max_entries=2, ttl=60)
+    worker_b = SQLiteBackend(path, max_entries=2, ttl=60)
+
+    worker_a.set('campaigns:/x', b'[]')
+    assert worker_b.get('campaigns:/x') == b'[]'
+
+    worker_b.delete_prefix('campaigns:')
+    assert worker_a.get('campaigns:/x') is None
+
+    for key in ('k1', 'k2', 'k3'):
+        worker_a.set(key, b'v')
+    assert worker_b.size() == 2
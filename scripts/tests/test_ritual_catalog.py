@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Testes do catálogo compartilhado de rituais
+"""
+from datetime import timedelta
+
+from models import db, Character, Ritual, RitualTemplate
+import ritual_catalog
+
+
+def _setup(admin):
+    ritual_catalog.invalidate()
+    character = Character(name='Ocultista', age=30, skilled_in='Ocultismo', user_id=admin.id)
+    db.session.add(character)
+    db.session.commit()
+    return character.id
+
+
+def test_character_ritual_references_catalog(client, user, auth_headers):
+    # O usuário das fixtures tem id 1: é o admin que edita o catálogo
+    character_id = _setup(user)
+
+    response = client.post('/api/rituals/', headers=auth_headers, json={
+        'name': 'Cicatrização', 'circle': 1, 'cost': 1,
+        'execution_time': 'padrão', 'effect': 'Cura 3d8+3 PV',
+    })
+    assert response.status_code == 201
+    template_id = response.get_json()['data']['id']
+
+    response = client.post(f'/api/me/{character_id}/rituals', headers=auth_headers, json={
+        'template_id': template_id, 'execution_time': 'completa',
+    })
+    assert response.status_code == 201
+    ritual = response.get_json()['data']
+    assert ritual['name'] == 'Cicatrização'
+    assert ritual['effect'] == 'Cura 3d8+3 PV'
+    assert ritual['execution_time'] == 'completa'
+
+    stored = db.session.get(Ritual, ritual['id'])
+    assert stored.effect is None and stored.template_id == template_id
+
+    client.patch(f'/api/rituals/{template_id}', headers=auth_headers, json={'effect': 'Cura 4d8+4 PV'})
+    data = client.get(f'/api/me/{character_id}/rituals', headers=auth_headers).get_json()['data']
+    assert data[0]['effect'] == 'Cura 4d8+4 PV'
+    assert data[0]['execution_time'] == 'completa'
+
+
+def test_unknown_template_is_rejected(client, user, auth_headers):
+    character_id = _setup(user)
+
+    response = client.post(f'/api/me/{character_id}/rituals', headers=auth_headers, json={'template_id': 42})
+    assert response.status_code == 404
+
+
+def test_list_refetches_templates_edited_by_another_worker(client, user, auth_headers):
+    character_id = _setup(user)
+    template = RitualTemplate(name='Chama', circle=1, cost=1, effect='queima')
+    db.session.add(template)
+    db.session.commit()
+    client.post(f'/api/me/{character_id}/rituals', headers=auth_headers, json={'template_id': template.id})
+    url = f'/api/me/{character_id}/rituals'
+    first = client.get(url, headers=auth_headers)
+    assert first.get_json()['data'][0]['effect'] == 'queima'
+
+    # Outro processo edita o catálogo: o cache deste continua com a versão antiga
+    template.effect = 'incinera'
+    template.updated_at = template.updated_at + timedelta(seconds=1)
+    db.session.commit()
+
+    second = client.get(url, headers={**auth_headers, 'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.get_json()['data'][0]['effect'] == 'incinera'
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Testes dos serializadores compilados (mesma saída dos to_dict escritos à mão)
+"""
+from datetime import datetime
+
+import pytest
+
+import serializers
+from models import db, SERIALIZERS, Character, Campaign, Ritual, RitualTemplate, User
+from serializers import Serializer
+
+
+def _legacy_character(character):
+    """Saída do antigo Character.to_dict, mantida aqui como referência"""
+    return {
+        'id': character.id,
+        'name': character.name,
+        'player_name': character.player_name,
+        'age': character.age,
+        'skilled_in': character.skilled_in,
+        'character_class': character.character_class,
+        'nex': character.nex,
+        'avatar_url': character.avatar_url,
+        'agilidade': character.agilidade,
+        'intelecto': character.intelecto,
+        'vigor': character.vigor,
+        'presenca': character.presenca,
+        'forca': character.forca,
+        'gender': character.gender,
+        'appearance': character.appearance,
+        'personality': character.personality,
+        'background': character.background,
+        'objective': character.objective,
+        'origin': character.origin,
+        'user_id': character.user_id,
+        'current_pv': character.current_pv,
+        'current_pe': character.current_pe,
+        'current_ps': character.current_ps,
+        'max_pv': 10 + (character.vigor * 5) + (character.forca * 2),
+        'max_pe': 6 + (character.intelecto * 4) + (character.presenca * 2),
+        'max_ps': 8 + (character.intelecto * 3) + (character.presenca * 3),
+        'created_at': character.created_at.isoformat() if character.created_at else None,
+        'updated_at': character.updated_at.isoformat() if character.updated_at else None
+    }
+
+
+def test_character_output_matches_legacy_to_dict(app):
+    character = Character(name='Herói', age=20, skilled_in='Luta', vigor=3, forca=2, presenca=4)
+    db.session.add(character)
+    db.session.commit()
+
+    # Depois do commit a instância está expirada: usa o caminho com atributos
+    data = character.to_dict()
+    assert data == _legacy_character(character)
+    assert list(data) == list(_legacy_character(character))
+
+    # Já carregada: caminho rápido via __dict__
+    assert SERIALIZERS[Character](character) == data
+
+    # Instância transitória com datetimes nulos
+    transient = Character(name='Novo', age=1, skilled_in='x', agilidade=1, intelecto=1,
+                          vigor=1, presenca=1, forca=1)
+    assert transient.to_dict() == _legacy_character(transient)
+
+
+def test_defaults_exclusions_and_template_merge(app):
+    campaign = Campaign(name='Campanha', master_name='Mestre', description=None,
+                        system=None, is_public=None, created_at=datetime(2024, 1, 2, 3, 4, 5))
+    data = campaign.to_dict()
+    assert data['description'] == '' and data['system'] == 'Sigil RPG'
+    assert data['is_public'] is False
+    assert data['created_at'] == '2024-01-02T03:04:05'
+
+    user = User(name='Ana', email='ana@example.com')
+    user.set_password('123456')
+    assert set(user.to_dict()) == {'id', 'name', 'email', 'created_at', 'updated_at'}
+
+    template = RitualTemplate(name='Chama', circle=1, cost=2, range='curto', effect='queima')
+    db.session.add(template)
+    db.session.flush()
+    ritual = Ritual(character_id=1, template_id=template.id, name='Chama', circle=1, cost=2,
+                    effect='local')
+    data = ritual.to_dict(template=template.to_dict())
+    assert data['range'] == 'curto' and data['effect'] == 'local'
+
+
+def test_field_subsets(client):
+    db.session.add(Character(name='Herói', age=20, skilled_in='Luta', vigor=2, forca=1))
+    db.session.commit()
+
+    response = client.get('/api/characters/?fields=name,max_pv')
+    assert response.status_code == 200
+    assert response.get_json() == [{'name': 'Herói', 'max_pv': 22}]
+
+    serializer = SERIALIZERS[Character]
+    assert serializer.only(['max_pv', 'name']) is serializer.only(['name', 'max_pv'])
+    with pytest.raises(ValueError):
+        serializer.only(['password_hash'])
+
+    assert client.get('/api/characters/?fields=nope').status_code == 400
+
+
+def test_field_subsets_are_bounded(monkeypatch):
+    monkeypatch.setattr(serializers, 'MAX_SUBSETS', 3)
+    serializer = Serializer(Character)
+    first = serializer.only(['id'])
+    for field in ('name', 'age', 'nex'):
+        serializer.only(['id', field])
+    assert len(serializer._subsets) == 3
+    assert frozenset(['id']) not in serializer._subsets
+
+    # Usado recentemente continua compilado
+    recent = serializer.only(['id', 'age'])
+    serializer.only(['id', 'vigor'])
+    assert serializer.only(['id', 'age']) is recent
+    assert serializer.only(['id']) is not first
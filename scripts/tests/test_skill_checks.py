@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Testes dos testes de perícia em grupo das campanhas e equipes
+"""
+import pytest
+
+import dice
+from models import db, Campaign, CampaignCharacter, Character, Party, PartyMember, Skill
+
+
+def _setup():
+    campaign = Campaign(name='Mesa', master_name='Mestre')
+    characters = [
+        Character(name='Atenta', age=20, skilled_in='Investigação', presenca=3),
+        Character(name='Distraído', age=20, skilled_in='Luta', presenca=0),
+        Character(name='Ausente', age=20, skilled_in='Luta', presenca=2),
+    ]
+    db.session.add_all([campaign, *characters])
+    db.session.flush()
+    party = Party(campaign_id=campaign.id, name='Grupo')
+    db.session.add(party)
+    db.session.flush()
+    db.session.add_all([
+        CampaignCharacter(campaign_id=campaign.id, character_id=characters[0].id),
+        CampaignCharacter(campaign_id=campaign.id, character_id=characters[1].id),
+        CampaignCharacter(campaign_id=campaign.id, character_id=characters[2].id, is_active=False),
+        PartyMember(party_id=party.id, character_id=characters[0].id),
+        Skill(character_id=characters[0].id, name='Percepção', attribute='PRE', training=5, others=1),
+    ])
+    db.session.commit()
+    return campaign.id, party.id
+
+
+def test_campaign_check_resolves_all_members(client, query_counter):
+    campaign_id, _ = _setup()
+    body = {'skill': 'percepção', 'dc': 15, 'seed': 3}
+
+    with query_counter as counter:
+        response = client.post(f'/api/v1/campaigns/{campaign_id}/checks', json=body)
+    data = response.get_json()
+
+    assert response.status_code == 200
+    # campanha + membros com atributos e perícia
+    assert counter.count <= 2
+    assert data['attribute'] == 'PRE'
+    trained, untrained = data['results']
+    assert (trained['name'], trained['expression'], trained['trained']) == ('Atenta', '3d20kh1+6', True)
+    assert (untrained['expression'], untrained['trained']) == ('2d20kl1', False)
+    assert trained['total'] == max(trained['rolls']) + 6
+    assert trained['success_probability'] == pytest.approx(1 - (8 / 20) ** 3)
+    assert untrained['success_probability'] == pytest.approx(dice.success_probability('2d20kl1', 15))
+    assert data['successes'] == sum(result['success'] for result in data['results'])
+
+    assert client.post(f'/api/v1/campaigns/{campaign_id}/checks', json=body).get_json() == data
+    everyone = client.post(f'/api/v1/campaigns/{campaign_id}/checks',
+                           json={**body, 'include_inactive': True}).get_json()
+    assert len(everyone['results']) == 3
+
+
+def test_party_check_and_validation(client):
+    campaign_id, party_id = _setup()
+
+    data = client.post(f'/api/v1/campaigns/{campaign_id}/parties/{party_id}/checks',
+                       json={'skill': 'Percepção'}).get_json()
+    assert [result['name'] for result in data['results']] == ['Atenta']
+    assert 'success_probability' not in data['results'][0]
+
+    url = f'/api/v1/campaigns/{campaign_id}/checks'
+    assert client.post(url, json={}).status_code == 400
+    assert client.post(url, json={'skill': 'Ocultismo'}).get_json()['message'] == 'attribute_required'
+    forced = client.post(url, json={'skill': 'Ocultismo', 'attribute': 'int'}).get_json()
+    assert all(result['attribute'] == 'INT' for result in forced['results'])
+    assert client.post(url, json={'skill': 'Percepção', 'attribute': 'XYZ'}).status_code == 400
+    assert client.post('/api/v1/campaigns/999/checks', json={'skill': 'Percepção'}).status_code == 404
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Testes da revogação de tokens por JTI (logout)
+"""
+import time
+from datetime import datetime, timedelta
+
+from flask_jwt_extended import create_access_token, decode_token
+
+from models import db, RevokedToken
+from token_blocklist import TokenBlocklist, token_blocklist
+
+
+def _headers(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_logout_revokes_only_that_token(client, query_counter, user):
+    user_id = user.id
+    token, other = create_access_token(identity=str(user_id)), create_access_token(identity=str(user_id))
+    db.session.commit()
+
+    assert client.get('/api/me/', headers=_headers(token)).status_code == 200
+    assert client.delete('/api/auth/', headers=_headers(token)).status_code == 200
+    assert client.get('/api/me/', headers=_headers(token)).status_code == 401
+    assert client.get('/api/me/', headers=_headers(other)).status_code == 200
+
+    # Caminho quente: a verificação de revogação não consulta o banco
+    with query_counter as counter:
+        client.get('/api/me/', headers=_headers(other))
+    assert counter.count == 1
+
+    # "Reinício": memória vazia, a revogação é relida da tabela
+    token_blocklist.clear()
+    assert client.get('/api/me/', headers=_headers(token)).status_code == 401
+
+
+def test_sync_from_other_workers_and_pruning(client, user):
+    user_id = user.id
+    token = create_access_token(identity=str(user_id))
+    claims = decode_token(token)
+    client.get('/api/me/', headers=_headers(token))
+
+    # Revogado por outro worker: vale após a próxima sincronização
+    db.session.add_all([
+        RevokedToken(jti=claims['jti'], user_id=user_id,
+                     expires_at=datetime.utcfromtimestamp(claims['exp'])),
+        RevokedToken(jti='antigo', expires_at=datetime.utcnow() - timedelta(hours=1)),
+    ])
+    db.session.commit()
+    assert client.get('/api/me/', headers=_headers(token)).status_code == 200
+    token_blocklist.refresh()
+    assert client.get('/api/me/', headers=_headers(token)).status_code == 401
+    assert 'antigo' not in token_blocklist._revoked
+
+    token_blocklist.revoke('novo', user_id, claims['exp'])
+    assert {row.jti for row in RevokedToken.query.all()} == {claims['jti'], 'novo'}
+
+
+def test_ids_are_not_reused_after_pruning(app):
+    # Outro worker, que já sincronizou uma revogação agora expirada
+    other_worker = TokenBlocklist()
+    db.session.add(RevokedToken(jti='expirado', expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.session.commit()
+    other_worker.refresh()
+
+    # A limpeza apaga a linha expirada antes de gravar a nova revogação
+    token_blocklist.revoke('novo', None, time.time() + 3600)
+    assert RevokedToken.query.filter_by(jti='expirado').count() == 0
+
+    other_worker.refresh()
+    assert other_worker.is_revoked('novo')
+
+
+def test_refresh_sees_rows_committed_out_of_id_order(app):
+    # Postgres: a transação com o id menor pode fazer commit depois
+    worker = TokenBlocklist()
+    expires_at = datetime.utcnow() + timedelta(hours=1)
+    db.session.add(RevokedToken(id=11, jti='depois', expires_at=expires_at))
+    db.session.commit()
+    worker.refresh()
+    assert worker.is_revoked('depois')
+
+    db.session.add(RevokedToken(id=10, jti='atrasado', expires_at=expires_at))
+    db.session.commit()
+    worker.refresh()
+    assert worker.is_revoked('atrasado')
+    assert worker._last_id == 11
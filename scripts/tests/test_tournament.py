@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Testes do torneio todos-contra-todos das campanhas
+"""
+import combat
+from models import db, Campaign, CampaignCharacter, Character, Fight
+from process_pool import process_pool
+
+
+def _campaign_with_characters(count):
+    campaign = Campaign(name='Arena', master_name='Mestre')
+    characters = [
+        Character(name=f'Lutador {index}', age=20, skilled_in='Luta', forca=index % 4, agilidade=1)
+        for index in range(count)
+    ]
+    db.session.add_all([campaign, *characters])
+    db.session.flush()
+    db.session.add_all([
+        CampaignCharacter(campaign_id=campaign.id, character_id=character.id)
+        for character in characters
+    ])
+    db.session.commit()
+    return campaign.id
+
+
+def test_tournament_inserts_all_pairings_in_one_batch(client, query_counter, auth_headers):
+    campaign_id = _campaign_with_characters(5)
+
+    with query_counter as counter:
+        response = client.post(f'/api/v1/campaigns/{campaign_id}/tournament', json={'seed': 42},
+                               headers=auth_headers)
+    data = response.get_json()
+
+    assert response.status_code == 201
+    assert data['fights'] == 10
+    assert Fight.query.count() == 10
+    # campanha + membros + personagens + perícias + INSERT em lote + commit
+    assert counter.count <= 8
+
+    standings = data['standings']
+    assert all(row['fights'] == 4 for row in standings)
+    assert sum(row['won'] for row in standings) == sum(row['lost'] for row in standings)
+    assert [row['points'] for row in standings] == sorted((row['points'] for row in standings), reverse=True)
+
+    again = client.post(f'/api/v1/campaigns/{campaign_id}/tournament', json={'seed': 42},
+                        headers=auth_headers).get_json()
+    assert again['standings'] == standings
+
+
+def test_tournament_validation_and_parallel_resolution(client, monkeypatch, auth_headers):
+    campaign_id = _campaign_with_characters(1)
+    assert client.post(f'/api/v1/campaigns/{campaign_id}/tournament').status_code == 401
+    assert client.post(f'/api/v1/campaigns/{campaign_id}/tournament', headers=auth_headers).status_code == 400
+    assert client.post('/api/v1/campaigns/999/tournament', headers=auth_headers).status_code == 404
+
+    fighter = combat.Fighter(pv=20, pe=4, agilidade=2, attack_dice=2, attack_bonus=5,
+                             defense=12, damage_bonus=1)
+    matches = [(fighter, fighter, seed) for seed in range(12)]
+    monkeypatch.setattr(combat, 'PARALLEL_CHUNK_SIZE', 5)
+    assert combat.resolve_many(matches, workers=2) == combat.resolve_many(matches)
+
+
+def test_tournament_rejects_when_pool_is_busy(client, monkeypatch, auth_headers):
+    campaign_id = _campaign_with_characters(4)
+    monkeypatch.setattr('campaigns_routes.TOURNAMENT_PARALLEL_MIN_FIGHTS', 1)
+    monkeypatch.setattr(combat, 'PARALLEL_CHUNK_SIZE', 2)
+    monkeypatch.setattr(process_pool, 'workers', 2)
+
+    process_pool._slots.acquire()
+    try:
+        response = client.post(f'/api/v1/campaigns/{campaign_id}/tournament',
+                               json={'workers': 2}, headers=auth_headers)
+    finally:
+        process_pool._slots.release()
+    assert response.status_code == 503
+    assert Fight.query.count() == 0
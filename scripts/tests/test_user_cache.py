@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Testes do cache de usuários autenticados (existência sem consulta ao banco)
+"""
+from models import db, User
+from response_cache import MemoryBackend
+from user_cache import user_cache
+
+
+def test_existence_check_is_served_from_memory(client, query_counter, auth_headers, headers_for):
+    # Fecha a transação aberta ao ler user.id, para o contador ver todas as consultas
+    db.session.commit()
+
+    with query_counter as counter:
+        assert client.get('/api/me/', headers=auth_headers).status_code == 200
+    cold = counter.count
+    with query_counter as counter:
+        assert client.get('/api/me/', headers=auth_headers).status_code == 200
+    assert counter.count == cold - 1
+    assert user_cache.stats()['hits'] == 1
+
+    assert client.get('/api/me/fights/', headers=headers_for(999)).status_code == 404
+    assert user_cache.stats()['entries'] == 1
+
+
+def test_changes_and_deletes_invalidate(client, user, auth_headers):
+    assert user_cache.get(user.id)['name'] == 'Dono'
+
+    user.name = 'Renomeada'
+    db.session.commit()
+    assert user_cache.get(user.id)['name'] == 'Renomeada'
+
+    db.session.delete(user)
+    db.session.commit()
+    assert client.get('/api/me/', headers=auth_headers).status_code == 404
+
+
+def test_invalidation_waits_for_commit(app, user):
+    user_id = user.id
+    user_cache.get(user_id)
+
+    # Depois do flush e antes do commit, o cache ainda vale para as outras requisições
+    user.name = 'Renomeada'
+    db.session.flush()
+    assert user_cache.backend.get(str(user_id))['name'] == 'Dono'
+
+    # Rollback: nada mudou, a entrada continua
+    db.session.rollback()
+    assert user_cache.backend.get(str(user_id))['name'] == 'Dono'
+
+    db.session.delete(db.session.get(User, user_id))
+    db.session.flush()
+    assert user_cache.backend.get(str(user_id)) is not None
+    db.session.commit()
+    assert user_cache.backend.get(str(user_id)) is None
+    assert user_cache.get(user_id) is None
+
+
+def test_ttl_and_lru_bounds(app, monkeypatch, make_user):
+    first = make_user('Primeira', 'a@example.com')
+    second = make_user('Segunda', 'b@example.com')
+    monkeypatch.setattr(user_cache, 'backend', MemoryBackend(max_entries=1, ttl=60))
+
+    user_cache.get(first.id)
+    user_cache.get(second.id)
+    assert user_cache.backend.size() == 1
+    assert user_cache.backend.get(str(second.id)) is not None
+
+    user_cache.backend.ttl = -1
+    user_cache.get(first.id)
+    assert user_cache.backend.get(str(first.id)) is None
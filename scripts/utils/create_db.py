@@ -10,12 +10,13 @@ api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-mai
 sys.path.insert(0, api_path)
 os.chdir(api_path)
 
-from app import app
+from app import create_app
 from models import db
 
 def create_tables():
     """Create all database tables"""
     print("📦 Criando tabelas do banco de dados...")
+    app = create_app()
     with app.app_context():
         db.create_all()
     print("✅ Tabelas criadas com sucesso!")
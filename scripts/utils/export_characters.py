@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Exporta os personagens (com habilidades, rituais e itens) para um arquivo NDJSON
+
+Com --resume, lê o id da última linha completa do arquivo e continua a
+exportação a partir dele, anexando ao final.
+"""
+import argparse
+import json
+import os
+import sys
+
+# Caminhos relativos são do diretório de onde o script foi chamado
+original_cwd = os.getcwd()
+
+# Add the API directory to the Python path
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, api_path)
+os.chdir(api_path)
+
+from app import create_app
+from character_export import iter_ndjson, DEFAULT_BATCH_SIZE
+
+
+def prepare_resume(path, block_size=65536):
+    """
+    Remove uma última linha incompleta (exportação interrompida) e retorna o
+    id do último registro do arquivo, lendo apenas o final dele
+    """
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b''
+        position = end
+        while position > 0 and tail.count(b'\n') < 2:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+
+        complete = tail[:tail.rfind(b'\n') + 1]
+        f.truncate(position + len(complete))
+
+    lines = complete.splitlines()
+    return json.loads(lines[-1])['id'] if lines else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('output', help='arquivo .ndjson de saída (- para stdout)')
+    parser.add_argument('--after-id', type=int, default=None)
+    parser.add_argument('--resume', action='store_true')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    after_id = args.after_id
+    mode = 'w'
+    path = os.path.join(original_cwd, args.output)
+    if args.resume and args.output != '-' and os.path.exists(path):
+        after_id = prepare_resume(path)
+        mode = 'a'
+        print(f"↪️  Retomando depois do personagem {after_id}", file=sys.stderr)
+
+    output = sys.stdout if args.output == '-' else open(path, mode, encoding='utf-8')
+    count = 0
+    app = create_app()
+    try:
+        with app.app_context():
+            for line in iter_ndjson(after_id, args.batch_size):
+                output.write(line)
+                count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"✅ {count} personagens exportados", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Importa personagens (com habilidades, rituais e itens) de um arquivo NDJSON
+para um usuário, em blocos; as linhas inválidas são listadas no final
+"""
+import argparse
+import os
+import sys
+
+# Caminhos relativos são do diretório de onde o script foi chamado
+original_cwd = os.getcwd()
+
+# Add the API directory to the Python path
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, api_path)
+os.chdir(api_path)
+
+from app import create_app
+from models import db, User
+from character_import import import_characters, DEFAULT_CHUNK_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', help='arquivo .ndjson de entrada (- para stdin)')
+    parser.add_argument('--user-id', type=int, required=True)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if db.session.get(User, args.user_id) is None:
+            print(f"❌ Usuário {args.user_id} não encontrado", file=sys.stderr)
+            sys.exit(1)
+
+        if args.input == '-':
+            report = import_characters(sys.stdin, args.user_id, args.chunk_size)
+        else:
+            with open(os.path.join(original_cwd, args.input), encoding='utf-8') as f:
+                report = import_characters(f, args.user_id, args.chunk_size)
+
+    for error in report['errors']:
+        print(f"⚠️  linha {error['line']}: {error['errors']}", file=sys.stderr)
+    print(f"✅ {report['imported']} personagens importados, {report['failed']} linhas com erro")
+    sys.exit(0 if not report['failed'] else 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Recalcula a tabela materializada do ranking (character_experience) a partir
+de todas as lutas, em uma única transação
+"""
+import os
+import sys
+
+# Add the API directory to the Python path
+api_path = os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main')
+sys.path.insert(0, api_path)
+os.chdir(api_path)
+
+from app import create_app
+from models import db
+import leaderboard
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        try:
+            count = leaderboard.rebuild()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Erro ao recalcular o ranking: {e}", file=sys.stderr)
+            sys.exit(1)
+    print(f"✅ Ranking recalculado: {count} personagens")
+
+
+if __name__ == "__main__":
+    main()
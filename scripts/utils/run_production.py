@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script para executar a API em produção com o gunicorn (ProductionConfig e
+SigilRPG_API-main/gunicorn.conf.py); as opções sobrescrevem as variáveis
+SERVER_* do ambiente
+"""
+import argparse
+import os
+import sys
+
+# Add the API directory to the Python path
+api_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'SigilRPG_API-main'))
+
+OPTIONS = ('bind', 'workers', 'threads', 'keepalive', 'backlog', 'max_connections')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bind', help='endereço:porta (padrão 0.0.0.0:8000)')
+    parser.add_argument('--workers', type=int, help='processos (padrão: um por núcleo)')
+    parser.add_argument('--threads', type=int, help='threads por processo (padrão 4)')
+    parser.add_argument('--keepalive', type=int, help='segundos de keep-alive (padrão 5)')
+    parser.add_argument('--backlog', type=int, help='fila de conexões do socket (padrão 256)')
+    parser.add_argument('--max-connections', type=int, help='conexões simultâneas por processo (padrão 100)')
+    args = parser.parse_args()
+
+    for option in OPTIONS:
+        value = getattr(args, option)
+        if value is not None:
+            os.environ[f'SERVER_{option.upper()}'] = str(value)
+    os.environ.setdefault('FLASK_CONFIG', 'production')
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("❌ gunicorn não está instalado: pip install -r SigilRPG_API-main/requirements.txt", file=sys.stderr)
+        sys.exit(1)
+
+    os.chdir(api_path)
+    print("🚀 Iniciando servidor de produção (gunicorn)...")
+    print(f"📁 Diretório: {api_path}")
+    print(f"🔁 Recarregar sem derrubar conexões: kill -HUP {os.getpid()}")
+    # exec: o gunicorn assume este processo e recebe os sinais diretamente
+    os.execv(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'])
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,10 @@ sys.path.insert(0, api_path)
 os.chdir(api_path)  # Change to API directory
 
 # Import and run Flask app
-from app import app
+from app import create_app
 
 if __name__ == "__main__":
+    app = create_app('development')
     print("🚀 Iniciando servidor Flask na porta 8000...")
     print(f"📁 Diretório: {api_path}")
     app.run(debug=True, host='0.0.0.0', port=8000)